@@ -0,0 +1,56 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Asset registry. Every image is loaded from disk, converted and colour-keyed only once, and then the same surface
+#  is shared with everything that asks for it by name. Sounds are loaded here too.
+
+import os
+
+import pygame
+
+FOLDER = os.path.dirname(os.path.abspath(__file__))  # The game folder, where the images and sounds are
+images = {}  # Logical name -> loaded surface
+
+
+def full_path(path):
+    """ (str) -> str
+        Returns where the file at path in the game folder is. Most of the game's paths are written with backslashes
+        between the folders, which only works on Windows, so they are split up and joined again the way this computer
+        does it. The file is found no matter which folder the game was started from.
+    """
+    return os.path.join(FOLDER, *path.replace("\\", "/").split("/"))
+
+
+def load_image(name, path, colorkey=None, alpha=False):
+    """ (str, str, tuple, bool) -> pygame.Surface
+        Loads the image at path and stores it under name. If something with that name was already loaded, the stored
+        surface is returned instead, so the file is never read twice. Images loaded with alpha keep their transparency
+        (convert_alpha), otherwise they are converted to the display format and given the colorkey, if there is one.
+        The display has to be created before this is called.
+    """
+    if name not in images:
+        if alpha:
+            image = pygame.image.load(full_path(path)).convert_alpha()
+        else:
+            image = pygame.image.load(full_path(path)).convert()
+            if colorkey is not None:
+                image.set_colorkey(colorkey)  # Color of image background to remove
+        images[name] = image
+
+    return images[name]
+
+
+def load_sound(path):
+    """ (str) -> pygame.mixer.Sound
+        Loads the sound at path. Not every copy of the game has every sound (the game music isn't kept with the code),
+        so a missing sound is silent instead of stopping the game from starting.
+    """
+    try:
+        return pygame.mixer.Sound(full_path(path))
+    except FileNotFoundError:
+        return pygame.mixer.Sound(buffer=bytes(4))
+
+
+def get_image(name):
+    """ (str) -> pygame.Surface
+        Returns the image that was loaded under name. Raises KeyError if it was never loaded.
+    """
+    return images[name]
@@ -0,0 +1,263 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Benchmarks for Survival. Each scenario sets up the same busy situation every time, runs it for a number of frames
+#  with no window, and measures how fast it ran, how long each part of game_engine took, and how much memory it used.
+#  Save the results of one run, and compare later runs against them to see whether a change made the game faster:
+#      python benchmark.py --json before.json
+#      python benchmark.py --compare before.json
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# These have to be set before pygame starts up, which happens when the game is imported
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+
+import controls
+import main as game
+import profiling
+
+SEED = 1950  # Every scenario starts from this seed, so every run sets up the same game
+FRAMES = 600  # Frames each scenario is timed for
+WARM_UP = 60  # Frames run before timing starts, so images that are cached the first time they're drawn are ready
+REPEATS = 3  # Times each scenario is timed. The fastest is kept, since anything else running only ever slows it down
+MEMORY_FRAMES = 120  # Frames run again while tracing memory, which is too slow to do while timing
+TOLERANCE = 10  # Percent slower a scenario can get than the baseline before --compare says it got slower
+
+SCENARIOS = {}  # Name: (description, setup function)
+
+
+def scenario(name, description):
+    """ (str, str) -> function
+        Adds the function it decorates to SCENARIOS. The function sets up the scenario after a new game has been set
+        up, and can return a function to call before every frame.
+    """
+    def add(setup):
+        SCENARIOS[name] = (description, setup)
+        return setup
+    return add
+
+
+def ring(count, near, far):
+    """ (int, int, int) -> list
+        Returns count points spread evenly around the player, between near and far pixels away
+    """
+    spawn = game.randomness.spawning
+    points = []
+    for i in range(count):
+        angle = 2 * math.pi * i / count
+        distance = spawn.randrange(near, far)
+        points.append((game.player.x + math.cos(angle) * distance, game.player.y + math.sin(angle) * distance))
+    return points
+
+
+@scenario("wave11", "every enemy survival() sends in on wave 11")
+def wave_eleven(pilot):
+    game.spawn_wave(11)
+
+
+@scenario("americans", "100 Americans with M3s coming from every side")
+def americans(pilot):
+    for x, y in ring(100, 400, 1500):
+        game.enemies.append(game.American(x, y, game.m3, game.m1911, 100))
+
+
+@scenario("grenadiers", "50 Grenadiers around the player, all firing rockets")
+def grenadiers(pilot):
+    for x, y in ring(50, 300, 900):
+        game.enemies.append(game.Grenadier(x, y, game.bazooka, game.m1911, 100))
+
+
+@scenario("bullets", "200 DP-27 bullets from the player in the air at once")
+def bullets(pilot):
+    game.player.primary_weapon = game.dp27
+    shots = 0
+
+    def top_up():
+        nonlocal shots
+        while len(game.player_bullets) < 200:
+            angle = shots * 0.61  # Not a simple fraction of a turn, so the bullets spread out all the way around
+            shots += 1
+            aim_x = game.player.x + math.cos(angle) * 500
+            aim_y = game.player.y + math.sin(angle) * 500
+            game.player_bullets.append(game.Bullet(game.player.x, game.player.y + 22, aim_x, aim_y, game.dp27,
+                                                   game.dp27.damage))
+    return top_up
+
+
+@scenario("armory", "the player standing at the weapon armory, with the buy menu open")
+def armory(pilot):
+    armory = game.weapon_armory
+    game.player.move_to(armory.x + 20, armory.y + armory.height + 10)
+    pilot.press(pygame.K_f)
+
+
+def run(name, frames=FRAMES, draw=True, repeats=REPEATS):
+    """ (str, int, bool, int) -> dict
+        Runs the scenario called name for frames frames, drawing them if draw is True, and returns the results of the
+        fastest of repeats runs
+    """
+    if frames < 1 or repeats < 1:
+        raise ValueError("a scenario has to be timed at least once for at least a frame, not {} times for {} frames"
+                         .format(repeats, frames))
+    description, setup = SCENARIOS[name]
+
+    def start():
+        # setup_survival starts from reset_game, so nothing from the last run (or anything run before the benchmark)
+        # carries over into this one
+        game.music = False
+        game.sound_fx = False
+        pilot = controls.VirtualControls()
+        game.player_input = pilot
+        objects = game.setup_survival(SEED)
+        each_frame = setup(pilot)
+        game.dirty.reset()
+        return objects, each_frame
+
+    def play(objects, each_frame, count):
+        for i in range(count):
+            game.player.health = 100  # The player can't die, so the scenario keeps going
+            game.player.armour = 200
+            if each_frame is not None:
+                each_frame()
+            game.game_engine(objects, "Survival", 11, draw=draw)
+            if draw:
+                game.dirty.present()
+
+    # Time the scenario
+    took = math.inf
+    simulated = None
+    for i in range(repeats):
+        objects, each_frame = start()
+        play(objects, each_frame, WARM_UP)
+        game.profiler = profiling.FrameProfiler(history=frames)
+        game.profiler.enabled = True
+        collected = sum(generation["collections"] for generation in gc.get_stats())
+        started = time.perf_counter()
+        play(objects, each_frame, frames)
+        elapsed = time.perf_counter() - started
+
+        # Every run has to play the same game, or the fastest one might just have had less to do
+        happened = {"kills": game.player.kills, "enemies": len(game.enemies), "frames": game.ai_lod.frame}
+        if simulated is not None and happened != simulated:
+            raise RuntimeError("{} played differently on run {}: {} instead of {}".format(name, i + 1, happened,
+                                                                                          simulated))
+        simulated = happened
+        if elapsed < took:
+            took = elapsed
+            game.profiler.end_frame()
+            stats = game.profiler.stats()
+            collections = sum(generation["collections"] for generation in gc.get_stats()) - collected
+    game.profiler = profiling.FrameProfiler()
+
+    # Set it up again, and see how much memory it uses
+    objects, each_frame = start()
+    play(objects, each_frame, WARM_UP)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    play(objects, each_frame, min(frames, MEMORY_FRAMES))
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "description": description,
+        "fps": round(frames / took, 1),
+        "frame_ms": {key: round(value, 3) for key, value in stats.pop("total").items()},
+        "phases_ms": {phase: {key: round(value, 3) for key, value in times.items()} for phase, times in stats.items()},
+        "gc_collections": collections,
+        "memory_peak_kib": round((peak - before) / 1024, 1),
+        "memory_growth_kib": round((after - before) / 1024, 1),
+        "enemies": simulated["enemies"],
+        "kills": simulated["kills"],
+    }
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """ (dict, dict, float) -> bool
+        Prints how each scenario in results changed since baseline. Returns False if any of them got more than tolerance
+        percent slower.
+    """
+    if (results["frames"], results["draw"]) != (baseline["frames"], baseline["draw"]):
+        print("Warning: the baseline ran {} frames with draw={}, so the times may not compare".format(
+            baseline["frames"], baseline["draw"]))
+
+    fine = True
+    for name, result in results["scenarios"].items():
+        if name not in baseline["scenarios"]:
+            print("{:<12} not in the baseline".format(name))
+            continue
+        old = baseline["scenarios"][name]
+        change = (result["fps"] - old["fps"]) / old["fps"] * 100
+        verdict = ""
+        if change < -tolerance:
+            verdict = "SLOWER"
+            fine = False
+        elif change > tolerance:
+            verdict = "faster"
+        print("{:<12} {:>8} -> {:>8} fps ({:+.1f}%) {}".format(name, old["fps"], result["fps"], change, verdict))
+
+        # Show the parts of the frame that changed the most
+        changes = []
+        for phase, times in result["phases_ms"].items():
+            if phase in old["phases_ms"]:
+                changes.append((times["mean"] - old["phases_ms"][phase]["mean"], phase))
+        for difference, phase in sorted(changes, key=lambda change: -abs(change[0]))[:3]:
+            if abs(difference) >= 0.01:
+                print("    {:<15} {:+.2f} ms".format(phase, difference))
+    return fine
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Times Survival in busy situations, with no window")
+    parser.add_argument("scenarios", nargs="*", help="scenarios to run, all of them if none are given")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="frames to time each scenario for")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="times to time each scenario, keeping the fastest")
+    parser.add_argument("--no-draw", action="store_true", help="skip drawing, to time only the game itself")
+    parser.add_argument("--json", help="save the results to this file, to compare against later")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare the results to ones saved with --json")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="percent slower a scenario can get before --compare fails")
+    parser.add_argument("--list", action="store_true", help="list the scenarios and stop")
+    arguments = parser.parse_args()
+
+    if arguments.list:
+        for name, (description, setup) in SCENARIOS.items():
+            print("{:<12} {}".format(name, description))
+        sys.exit()
+    if arguments.frames < 1 or arguments.repeats < 1:
+        parser.error("--frames and --repeats have to be at least 1")
+    for name in arguments.scenarios:
+        if name not in SCENARIOS:
+            parser.error("there is no scenario called {}, the scenarios are {}".format(name, ", ".join(SCENARIOS)))
+
+    results = {
+        "frames": arguments.frames,
+        "draw": not arguments.no_draw,
+        "seed": SEED,
+        "repeats": arguments.repeats,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "scenarios": {},
+    }
+    for name in arguments.scenarios or SCENARIOS:
+        result = run(name, arguments.frames, not arguments.no_draw, arguments.repeats)
+        results["scenarios"][name] = result
+        print("{:<12} {:>8} fps, {:.2f} ms a frame ({:.2f} ms at worst), {} KiB of memory at most".format(
+            name, result["fps"], result["frame_ms"]["mean"], result["frame_ms"]["max"], result["memory_peak_kib"]))
+
+    if arguments.json:
+        with open(arguments.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            if not compare(results, json.load(file), arguments.tolerance):
+                sys.exit(1)
@@ -0,0 +1,110 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Where the player's input comes from. The game asks these objects for the keyboard, mouse and events instead of asking
+#  pygame directly, so the game can also be played by a script, without anyone at the keyboard.
+
+import pygame
+
+
+class Controls:
+    def __init__(self):
+        """ (Controls) -> None
+            Input from the real keyboard and mouse
+        """
+
+    def events(self):
+        """ (Controls) -> list
+            Returns the events that happened since the last time this was called
+        """
+        return pygame.event.get()
+
+    def keys(self):
+        """ (Controls) -> object
+            Returns which keys are held down, indexed by pygame key constants like pygame.K_w
+        """
+        return pygame.key.get_pressed()
+
+    def mouse_position(self):
+        """ (Controls) -> tuple
+            Returns where the mouse is on the screen
+        """
+        return pygame.mouse.get_pos()
+
+    def mouse_buttons(self):
+        """ (Controls) -> tuple
+            Returns whether the left, middle and right mouse buttons are held down
+        """
+        return pygame.mouse.get_pressed()
+
+    def new_game(self, mode, seed):
+        """ (Controls, str, int) -> None
+            Called when a new game of mode starts, with the seed its random numbers started from
+        """
+
+    def end_game(self):
+        """ (Controls) -> None
+            Called when the game ends
+        """
+
+
+class HeldKeys:
+    def __init__(self, held):
+        """ (HeldKeys, set) -> None
+            Works like the list pygame.key.get_pressed returns, for a set of held keys
+        """
+        self.held = held
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class VirtualControls(Controls):
+    def __init__(self):
+        """ (VirtualControls) -> None
+            Input that is made up by code instead of a person. Whatever drives it sets held, position and buttons, and
+            queues events with press and click, before each frame.
+        """
+        super().__init__()
+        self.held = set()  # Keys held down
+        self.position = (0, 0)  # Where the mouse is on the screen
+        self.buttons = (False, False, False)
+        self.queued = []  # Events for the next frame
+        self.finished = False  # Set once there is no more input to give
+
+    def think(self):
+        """ (VirtualControls) -> None
+            Decides what to press for the next frame. Does nothing here, for input that doesn't need to plan ahead.
+        """
+
+    def events(self):
+        """ (VirtualControls) -> list
+            Returns the queued events and empties the queue. Events that really happened, like closing the window, are
+            thrown away, so they don't pile up.
+        """
+        pygame.event.clear()
+        events = self.queued
+        self.queued = []
+        return events
+
+    def keys(self):
+        return HeldKeys(self.held)
+
+    def mouse_position(self):
+        return self.position
+
+    def mouse_buttons(self):
+        return self.buttons
+
+    def press(self, key):
+        """ (VirtualControls, int) -> None
+            Presses key once during the next frame. Only keys that do something once per press (like G for a grenade)
+            need this, keys that are held down just go in held.
+        """
+        self.held.add(key)
+        self.queued.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+    def click(self, button=1):
+        """ (VirtualControls, int) -> None
+            Clicks a mouse button where the mouse is, during the next frame
+        """
+        self.queued.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button, pos=self.position))
+        self.queued.append(pygame.event.Event(pygame.MOUSEBUTTONUP, button=button, pos=self.position))
@@ -0,0 +1,220 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Plays Survival with no window, no sound and no frame limit, with the player controlled by a simple bot. It runs as
+#  fast as the computer can, and prints how each wave went, so the difficulty of later waves can be checked without
+#  having to play up to them. Run it with: python headless.py --waves 15
+#  It can also play back a game recorded with --record, with: python headless.py --replay recording.rec
+
+import argparse
+import json
+import math
+import os
+import time
+
+# These have to be set before pygame starts up, which happens when the game is imported
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+
+import controls
+import main as game
+import replay
+
+WAVE_TIME_LIMIT = 10  # Minutes of game time a wave can last before it is called off, in case an enemy gets stuck
+DANGER_DISTANCE = 200  # The bot backs away from any enemy closer than this
+GRENADE_CROWD = 3  # The bot throws a grenade when this many enemies are within DANGER_DISTANCE
+
+
+class AutoPilot(controls.VirtualControls):
+    def __init__(self, fire_interval=8):
+        """ (AutoPilot, int) -> None
+            Input for a bot that plays as the player. It aims at the closest live enemy (dogs first) and shoots once
+            it is in range, backs away from enemies that get too close, and throws grenades into crowds. When both guns are out
+            of ammo, it goes back to the weapon armory to refill them. Guns that aren't automatic are clicked every
+            fire_interval frames.
+        """
+        super().__init__()
+        self.fire_interval = fire_interval
+        self.frame = 0
+
+    def think(self):
+        """ (AutoPilot) -> None
+            Decides what to press for the next frame
+        """
+        self.frame += 1
+        self.held = set()
+        self.buttons = (False, False, False)
+
+        player = game.player
+        guns = (player.primary_weapon, player.secondary_weapon)
+        if all(gun.magazine_ammo == 0 and gun.reserve_ammo == 0 for gun in guns) and player.money >= 750:
+            self.restock()
+            return
+
+        live_enemies = [enemy for enemy in game.enemies if not enemy.dead]
+        if not live_enemies:
+            return
+
+        def distance(enemy):
+            return math.hypot(enemy.x - player.x, enemy.y - player.y)
+
+        def danger(enemy):  # Dogs kill on contact, so they count as twice as close
+            return distance(enemy) / 2 if enemy.type == "Dog" else distance(enemy)
+
+        target = min(live_enemies, key=danger)
+        self.position = game.camera.to_screen(target.hitbox.centerx, target.hitbox.centery)
+
+        # Shoot at the closest enemy
+        gun = player.primary_weapon
+        if gun.magazine_ammo == 0 and gun.reserve_ammo == 0:
+            self.press(pygame.K_1)  # Out of ammo, so try the other gun
+        elif distance(target) > gun.range * gun.bullet_speed:
+            pass  # Too far away to hit
+        elif gun.fire_mode == "automatic":
+            self.buttons = (True, False, False)
+        elif self.frame % self.fire_interval == 0:
+            self.click()
+
+        # Back away from anything too close
+        close = [enemy for enemy in live_enemies if distance(enemy) < DANGER_DISTANCE]
+        if close:
+            if target.x > player.x:
+                self.held.add(pygame.K_a)
+            else:
+                self.held.add(pygame.K_d)
+            if target.y > player.y:
+                self.held.add(pygame.K_w)
+            else:
+                self.held.add(pygame.K_s)
+
+        if len(close) >= GRENADE_CROWD and player.grenades > 0 and player.grenade_cooldown == 0:
+            self.press(pygame.K_g)
+
+    def restock(self):
+        """ (AutoPilot) -> None
+            Walks to the weapon armory, opens it, and buys the ammo refill
+        """
+        armory = game.weapon_armory
+        if armory.accessing_weapon_armory:
+            self.position = (610, 250)  # Where the refill option is in the armory menu
+            self.click()
+        elif armory.access_rect.colliderect(game.player.hitbox):
+            self.held.add(pygame.K_f)
+        else:
+            x, y = armory.hitbox.center
+            if abs(x - game.player.x) > 5:
+                self.held.add(pygame.K_d if x > game.player.x else pygame.K_a)
+            if abs(y - game.player.y) > 5:
+                self.held.add(pygame.K_s if y > game.player.y else pygame.K_w)
+
+
+def play_wave(objects, wave, pilot, frame_limit, draw=False):
+    """ (list, int, VirtualControls, float, bool) -> tuple
+        Plays one wave of Survival, until it is cleared, the player dies, frame_limit frames have gone by, or pilot has
+        no more input. The screen is only drawn if draw is True. Returns what game_engine returned last, and a dictionary
+        saying how the wave went.
+    """
+    frames = 0
+    start = time.perf_counter()
+    health = game.player.health + game.player.armour
+    kills = game.player.kills
+    status = None
+    while status is None and frames < frame_limit and not pilot.finished:
+        pilot.think()
+        status = game.game_engine(objects, "Survival", wave, draw=draw)
+        if draw:
+            game.dirty.present()
+        frames += 1
+
+    report = {
+        "wave": wave,
+        "outcome": {"Next Wave": "cleared", "Dead": "died", None: "ended" if pilot.finished else "timed out"}[status],
+        "game_seconds": round(frames / game.FPS, 1),
+        "real_seconds": round(time.perf_counter() - start, 2),
+        "kills": game.player.kills - kills,
+        "health_lost": max(health - game.player.health - game.player.armour, 0),  # Health and armour
+        "money": game.player.money,
+        "enemies_left": sum(1 for enemy in game.enemies if not enemy.dead),
+    }
+    return status, report
+
+
+def play(waves, weapon=None, seed=None, pilot=None, draw=False, record=None):
+    """ (int, str, int, VirtualControls, bool, str) -> list
+        Plays Survival until the player dies or the given number of waves are cleared, starting with weapon if it
+        isn't None. The player is controlled by pilot, or by an AutoPilot if it is None. The random numbers start from
+        seed, so the same seed plays the same game. If record isn't None, the game is recorded to that folder. Returns a
+        dictionary for every wave that was played, saying how it went.
+    """
+    game.music = False
+    game.sound_fx = False
+    if pilot is None:
+        pilot = AutoPilot()
+    game.player_input = replay.Recorder(pilot, record) if record else pilot
+
+    objects = game.setup_survival(seed)
+    if weapon is not None:
+        game.player.primary_weapon = getattr(game, weapon)
+        game.player.primary_weapon.magazine_ammo = game.player.primary_weapon.magazine_capacity
+        game.player.primary_weapon.reserve_ammo = game.player.primary_weapon.reserve_capacity
+    game.dirty.reset()
+
+    reports = []
+    wave = 0
+    # A recording is played for as long as it lasts, since a person can take as long as they like on a wave
+    frame_limit = math.inf if isinstance(pilot, replay.Playback) else WAVE_TIME_LIMIT * 60 * game.FPS
+    while wave <= waves:
+        status, report = play_wave(objects, wave, pilot, frame_limit, draw)
+        # Wave 0 has no enemies, it only starts the first wave. A recording can also end right as a wave starts
+        if wave > 0 and not (report["outcome"] == "ended" and report["game_seconds"] == 0):
+            reports.append(report)
+        if status != "Next Wave":
+            break
+
+        wave += 1
+        game.spawn_wave(wave)
+
+    game.player_input.end_game()
+    return reports
+
+
+def play_recording(path, draw=False):
+    """ (str, bool) -> list
+        Plays back a game of Survival recorded with --record. Returns a dictionary for every wave, like play.
+    """
+    playback = replay.Playback(path)
+    if playback.mode != "Survival":
+        raise ValueError("only Survival recordings can be played back, {} is {}".format(path, playback.mode))
+    return play(math.inf, seed=playback.seed, pilot=playback, draw=draw)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Plays Survival with no window, as fast as possible")
+    parser.add_argument("--waves", type=int, default=15, help="how many waves to play")
+    parser.add_argument("--weapon", help="gun to start with, like m3 or dp27")
+    parser.add_argument("--seed", type=int, help="seed for the random numbers, to play the same game again")
+    parser.add_argument("--json", help="also save the reports to this file")
+    parser.add_argument("--record", metavar="FOLDER", help="record the game to this folder")
+    parser.add_argument("--replay", metavar="FILE", help="play back a recorded game instead of using the bot")
+    parser.add_argument("--draw", action="store_true", help="draw every frame, to include drawing in the timing")
+    arguments = parser.parse_args()
+    if arguments.record and arguments.weapon:
+        parser.error("--weapon can't be used with --record, since recordings always start with the usual guns")
+
+    started = time.perf_counter()
+    if arguments.replay:
+        wave_reports = play_recording(arguments.replay, arguments.draw)
+    else:
+        wave_reports = play(arguments.waves, arguments.weapon, arguments.seed, draw=arguments.draw,
+                            record=arguments.record)
+    took = time.perf_counter() - started
+
+    for report in wave_reports:
+        print("Wave {wave:>3}: {outcome:<9} {game_seconds:>7}s of play in {real_seconds:>6}s, {kills} kills, "
+              "{health_lost} health lost, ${money}".format(**report))
+    game_minutes = sum(report["game_seconds"] for report in wave_reports) / 60
+    print("{:.1f} minutes of play in {:.1f} seconds, seed {}".format(game_minutes, took, game.randomness.seed))
+
+    if arguments.json:
+        with open(arguments.json, "w") as file:
+            json.dump(wave_reports, file, indent=2)
@@ -4,8 +4,25 @@
 #  Import modules needed
 import pygame
 from sys import exit
-from random import randrange, choice, randint
+from random import choice
 import math
+import argparse
+
+import assets
+import controls
+import movement
+import navigation
+import numpy
+import profiling
+import projectiles
+import render
+import replay
+import rng
+import scheduling
+import spatial
+import sprites
+import telemetry
+import terrain
 
 # Start-up stuff
 # Start up Pygame
@@ -18,10 +35,14 @@ pygame.mixer.init()
 SCREEN_WIDTH = 1920
 SCREEN_HEIGHT = 1080
 FPS = 60  # Frames per second
+ROTATION_STEP = 2  # Rotated images (guns, rockets, grenades) are rounded to this many degrees
+PLAYER_SCREEN_POSITION = (720, 450)  # The player is always drawn here, and the camera moves around them
 
 # Game constants
 HEALTH_REGEN_TIME = FPS * 1.5
 GRENADE_COOLDOWN = FPS * 2
+ESCAPE_TIME = FPS  # How long a stuck enemy walks off to the side before heading for the player again
+PLAYER_START = (820, 550)  # Where the player starts every game, in the game world
 
 # Colours
 BLACK = (0, 0, 0)
@@ -36,43 +57,80 @@ pygame.display.set_caption("Korean War")
 clock = pygame.time.Clock()
 
 # Load images
+# Everything is loaded through the asset registry, so each file is only read from disk once and the surfaces are shared
 # Player images aren't in the right dimensions, so I scale them into the right size
-player_walk_images = [pygame.transform.scale(pygame.image.load(r"animations\player\player_walk_0.png"), (32, 42)),
-                      pygame.transform.scale(pygame.image.load(r"animations\player\player_walk_1.png"), (32, 42)),
-                      pygame.transform.scale(pygame.image.load(r"animations\player\player_walk_2.png"), (32, 42)),
-                      pygame.transform.scale(pygame.image.load(r"animations\player\player_walk_3.png"), (32, 42))]
-
-american_walk_images = [pygame.image.load(r"animations\enemy\enemy_animation_0.png"),
-                        pygame.image.load(r"animations\enemy\enemy_animation_1.png"),
-                        pygame.image.load(r"animations\enemy\enemy_animation_2.png"),
-                        pygame.image.load(r"animations\enemy\enemy_animation_3.png")]
-
-dog_images = [pygame.image.load(r"animations\enemy\dog\dog1.png"),
-              pygame.image.load(r"animations\enemy\dog\dog2.png"),
-              pygame.image.load(r"animations\enemy\dog\dog3.png"),
-              pygame.image.load(r"animations\enemy\dog\dog4.png")]
-
-tank_images = [pygame.image.load(r"animations\enemy\tank\tank.png")]
-
-sniper_images = [pygame.image.load(r"animations\enemy\sniper\enemy_animation_0.png"),
-                 pygame.image.load(r"animations\enemy\sniper\enemy_animation_1.png"),
-                 pygame.image.load(r"animations\enemy\sniper\enemy_animation_2.png"),
-                 pygame.image.load(r"animations\enemy\sniper\enemy_animation_3.png")]
-
-rocket = pygame.image.load(r"objects\rocket.png").convert()
-rocket.set_colorkey(GLITCH_COLOR)  # Remove this color from the image
-grenade = pygame.image.load(r"weapons\grenade.png").convert()
-grenade.set_colorkey(GLITCH_COLOR)
-explosion = pygame.image.load(r"objects\explosion.png").convert()
-explosion.set_colorkey(GLITCH_COLOR)
-hitmarker = pygame.image.load(r"objects/hitmarker.png").convert()
-hitmarker.set_colorkey(WHITE)
-hitmarker.set_colorkey(BLACK)
-main_menu_image = pygame.image.load(r"menus\main_menu.png").convert()
-settings_on_on = pygame.image.load(r"menus\settings_on_on.png").convert()
-settings_on_off = pygame.image.load(r"menus\settings_on_off.png").convert()
-settings_off_on = pygame.image.load(r"menus\settings_off_on.png").convert()
-settings_off_off = pygame.image.load(r"menus\settings_off_off.png").convert()
+player_walk_images = [
+    pygame.transform.scale(assets.load_image("player_walk_0", r"animations\player\player_walk_0.png", alpha=True),
+                           (32, 42)),
+    pygame.transform.scale(assets.load_image("player_walk_1", r"animations\player\player_walk_1.png", alpha=True),
+                           (32, 42)),
+    pygame.transform.scale(assets.load_image("player_walk_2", r"animations\player\player_walk_2.png", alpha=True),
+                           (32, 42)),
+    pygame.transform.scale(assets.load_image("player_walk_3", r"animations\player\player_walk_3.png", alpha=True),
+                           (32, 42))]
+
+american_walk_images = [assets.load_image("american_walk_0", r"animations\enemy\enemy_animation_0.png", alpha=True),
+                        assets.load_image("american_walk_1", r"animations\enemy\enemy_animation_1.png", alpha=True),
+                        assets.load_image("american_walk_2", r"animations\enemy\enemy_animation_2.png", alpha=True),
+                        assets.load_image("american_walk_3", r"animations\enemy\enemy_animation_3.png", alpha=True)]
+
+dog_images = [assets.load_image("dog_0", r"animations\enemy\dog\dog1.png", alpha=True),
+              assets.load_image("dog_1", r"animations\enemy\dog\dog2.png", alpha=True),
+              assets.load_image("dog_2", r"animations\enemy\dog\dog3.png", alpha=True),
+              assets.load_image("dog_3", r"animations\enemy\dog\dog4.png", alpha=True)]
+
+tank_images = [assets.load_image("tank", r"animations\enemy\tank\tank.PNG", alpha=True)]
+
+sniper_images = [assets.load_image("sniper_walk_0", r"animations\enemy\sniper\enemy_animation_0.png", alpha=True),
+                 assets.load_image("sniper_walk_1", r"animations\enemy\sniper\enemy_animation_1.png", alpha=True),
+                 assets.load_image("sniper_walk_2", r"animations\enemy\sniper\enemy_animation_2.png", alpha=True),
+                 assets.load_image("sniper_walk_3", r"animations\enemy\sniper\enemy_animation_3.png", alpha=True)]
+
+rocket = assets.load_image("rocket", r"objects\rocket.png", GLITCH_COLOR)  # Remove this color from the image
+grenade = assets.load_image("grenade", r"weapons\grenade.png", GLITCH_COLOR)
+explosion = assets.load_image("explosion", r"objects\explosion.png", GLITCH_COLOR)
+hitmarker = assets.load_image("hitmarker", r"objects/hitmarker.png", BLACK)
+c4_image = assets.load_image("c4", r"weapons\c4.png", alpha=True)
+main_menu_image = assets.load_image("main_menu", r"menus\main_menu.png")
+settings_on_on = assets.load_image("settings_on_on", r"menus\settings_on_on.png")
+settings_on_off = assets.load_image("settings_on_off", r"menus\settings_on_off.png")
+settings_off_on = assets.load_image("settings_off_on", r"menus\settings_off_on.png")
+settings_off_off = assets.load_image("settings_off_off", r"menus\settings_off_off.png")
+
+# The weapon armoury menu options. Each one is stored as "options/<name>"
+armory_options = ["weapon_armory_title", "refill", "refill_cant_afford", "pistols", "shotguns", "snipers",
+                  "submachineguns", "assaultrifles", "lightmachineguns", "launchers", "grenade_refill",
+                  "grenade_refill_cant_afford", "c4", "c4_cant_afford", "armour", "armour_cant_afford", "back",
+                  "pistols_title", "mauserc96", "mauserc96_cant_afford", "colt", "colt_cant_afford", "shotguns_title",
+                  "ithaca37", "ithaca37_cant_afford", "snipers_title", "springfield", "springfield_cant_afford",
+                  "mosin_nagant", "mosin_nagant_cant_afford", "submachineguns_title", "m3", "m3_cant_afford",
+                  "type50", "type50_cant_afford", "assaultrifles_title", "m1carbine", "m1carbine_cant_afford", "sks",
+                  "sks_cant_afford", "lightmachineguns_title", "bren", "bren_cant_afford", "dp27",
+                  "dp27_cant_afford", "launchers_title", "bazooka", "bazooka_cant_afford", "rpg7",
+                  "rpg7_cant_afford"]
+for option in armory_options:
+    assets.load_image("options/" + option, "options/" + option + ".png")
+
+# Every animation frame of each character, already scaled, mirrored and rotated, so nothing is transformed when drawing
+player_sprites = sprites.SpriteVariants(player_walk_images)
+american_sprites = sprites.SpriteVariants(american_walk_images, (32, 42))
+sniper_sprites = sprites.SpriteVariants(sniper_images, (32, 42))
+dog_sprites = sprites.SpriteVariants(dog_images)
+tank_sprites = sprites.SpriteVariants(tank_images)
+rotation_cache = sprites.RotationCache(ROTATION_STEP)  # Shared by everything that gets drawn at an angle
+
+# Decides what is on screen. Off-screen enemies, bullets and explosions still move, but aren't drawn
+culler = render.Culler(SCREEN_WIDTH, SCREEN_HEIGHT)
+# Decides how often each enemy's AI runs, so enemies far off screen don't cost much
+ai_lod = scheduling.LevelOfDetail(SCREEN_WIDTH, SCREEN_HEIGHT)
+thinker = scheduling.ThinkScheduler()  # Spreads the enemies' decisions out over a few frames
+randomness = rng.RandomStreams()  # Every random number in a game comes from here, so a game can be played again
+player_input = controls.Controls()  # Where the keyboard and mouse input comes from
+timestep = scheduling.FixedTimestep(FPS)  # The game runs FPS frames every second, even if drawing them is slower
+profiler = profiling.FrameProfiler()  # Times each part of game_engine. Press F3 during a game to see the times
+frame_times = telemetry.SessionTelemetry()  # How long each frame took to show, saved at the end of a game
+# Everything drawn during a game goes through dirty, so only the parts of the screen that changed are updated
+dirty = render.DirtyRects(display)
 
 # Font types
 hud_font = pygame.font.Font("freesansbold.ttf", 16)
@@ -80,14 +138,14 @@ small_hud_font = pygame.font.Font("freesansbold.ttf", 10)
 bigger_hud_font = pygame.font.Font("freesansbold.ttf", 24)
 
 # Sound
-gunfire = pygame.mixer.Sound(r"sound\gunfire.wav")
-hitmarker_sound = pygame.mixer.Sound(r"sound\hitmarker.wav")
-enemy_gunfire = pygame.mixer.Sound(r"sound\enemy_gunfire.wav")
-rocket_launch = pygame.mixer.Sound(r"sound\launch.wav")
-explosion_sound = pygame.mixer.Sound(r"sound\explosion.wav")
-game_music = pygame.mixer.Sound(r"sound\game_music.wav")
-defeat_music = pygame.mixer.Sound(r"sound\defeat_music.mp3")
-menu_music = pygame.mixer.Sound(r"sound\menu_music.mp3")
+gunfire = assets.load_sound(r"sound\gunfire.wav")
+hitmarker_sound = assets.load_sound(r"sound\hitmarker.wav")
+enemy_gunfire = assets.load_sound(r"sound\enemy_gunfire.wav")
+rocket_launch = assets.load_sound(r"sound\launch.wav")
+explosion_sound = assets.load_sound(r"sound\explosion.wav")
+game_music = assets.load_sound(r"sound\game_music.wav")
+defeat_music = assets.load_sound(r"sound\defeat_music.mp3")
+menu_music = assets.load_sound(r"sound\menu_music.mp3")
 
 # Each time the player dies, a quote is displayed
 death_quotes = [
@@ -150,11 +208,33 @@ class Player:
 
         self.in_tutorial = False  # Health regeneration is different in the tutorial
 
+    def reset(self):
+        """ (Player) -> None
+            Puts the player back how they start a game, with the starting guns, equipment and money, at PLAYER_START
+        """
+        self.primary_weapon = mauserc96
+        self.secondary_weapon = m1911
+        self.animation_count = 0
+        self.moving_right = False
+        self.moving_left = False
+        self.health = 100
+        self.health_regen_timer = 90
+        self.money = 0
+        self.grenades = 4
+        self.c4_inventory = 10
+        self.armour = 200
+        self.grenade_cooldown = FPS * 2
+        self.c4_cooldown = FPS * 2
+        self.hitmarker_chain = 0
+        self.kills = 0
+        self.in_tutorial = False
+        self.move_to(*PLAYER_START)
+
     def handle_weapons(self):
         """ (Player) -> None
             Draws the weapon onto the player using complex geometry
         """
-        mouse_x, mouse_y = pygame.mouse.get_pos()  # Get mouse position
+        mouse_x, mouse_y = camera.to_world(*player_input.mouse_position())  # Get mouse position in the game world
 
         # Determine the angle to rotate the gun to
         rel_x, rel_y = mouse_x - self.x, mouse_y - self.y  # The coordinates of the mouse location, if we treat the
@@ -169,7 +249,16 @@ class Player:
         gun_x = self.x + self.primary_weapon.x_offset - int(self.primary_weapon.image.get_width() / 2)
         gun_y = self.y + self.primary_weapon.y_offset - int(self.primary_weapon.image.get_height() / 2)
 
-        display.blit(pygame.transform.rotate(self.primary_weapon.image, angle), (gun_x, gun_y))  # Display the gun
+        dirty.blit(rotation_cache.rotate(self.primary_weapon.image, angle), camera.to_screen(gun_x, gun_y))
+
+    def move_to(self, x, y):
+        """ (Player, int, int) -> None
+            Puts the player at (x, y) in the game world, and points the camera at them
+        """
+        self.x = x
+        self.y = y
+        self.hitbox = pygame.Rect(self.x, self.y, 32, 42)
+        camera.look_at(self.x, self.y, *PLAYER_SCREEN_POSITION)
 
     def swap_weapon(self):
         """ (Player) -> None
@@ -189,13 +278,13 @@ class Player:
         self.animation_count += 1
 
         # 2. Draw the image of the player on the screen
+        screen_position = camera.to_screen(self.x, self.y)
         if self.moving_right:
-            display.blit(player_walk_images[self.animation_count // 4], (self.x, self.y))
+            dirty.blit(player_sprites.frames[self.animation_count // 4], screen_position)
         elif self.moving_left:  # Image will be flipped if the player is moving left
-            display.blit(pygame.transform.flip(player_walk_images[self.animation_count // 4], True, False), (self.x,
-                                                                                                             self.y))
+            dirty.blit(player_sprites.flipped[self.animation_count // 4], screen_position)
         else:  # Image will use the default frame if the player is not moving
-            display.blit(pygame.transform.scale(player_walk_images[0], (32, 42)), (self.x, self.y))
+            dirty.blit(player_sprites.frames[0], screen_position)
 
         # 3. Now that the player has moved, update its hitbox
         self.hitbox = pygame.Rect(self.x, self.y, 32, 42)
@@ -254,7 +343,7 @@ class Player:
             Throw a grenade
         """
 
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = camera.to_world(*player_input.mouse_position())
         grenades.append(Grenade(self.x, self.y, mouse_x, mouse_y, sks, 0))  # Throw a grenade in direction of mouse
 
         self.grenade_cooldown = FPS * 2  # Set the cooldown
@@ -266,8 +355,8 @@ class Gun:
             Create a Gun object. I'm using **kwargs because there's a lot of arguments, so having the argument name
             makes it easier to edit the object. Should be self-explanatory what is for what
         """
-        self.image = pygame.image.load(kwargs["image_string"]).convert()
-        self.image.set_colorkey(kwargs["colorkey"])  # Color of image background to remove
+        # Color of image background to remove is the colorkey
+        self.image = assets.load_image(kwargs["image_string"], kwargs["image_string"], kwargs["colorkey"])
         self.damage = kwargs["damage"]
         self.magazine_capacity = kwargs["magazine_capacity"]
         self.reserve_capacity = kwargs["reserve_capacity"]
@@ -298,6 +387,17 @@ class Gun:
 
         self.reloading = True
 
+    def reset(self):
+        """ (Gun) -> None
+            Fills the gun up with ammo and stops any reload, for a new game. Every gun is shared by everyone holding
+            one, so without this a game would start with the ammo left over from the last one.
+        """
+        self.magazine_ammo = self.magazine_capacity
+        self.reserve_ammo = self.reserve_capacity
+        self.fire_delay_ticker = self.fire_delay
+        self.reloading = False
+        self.frames_remaining = 0
+
     def main(self):
         """ (Gun) -> None
             Handles its responsibilities (drawing the gun is handled by the Player class). That means that if it is
@@ -373,6 +473,8 @@ test_weapon = Gun(image_string=r"weapons\dp27.png", colorkey=(71, 112, 76), dama
                   magazine_capacity=99999999999999999, reserve_capacity=999999999999999999999, name="Test Weapon",
                   chambered_reload_time=1, empty_reload_time=1, x_offset=28, y_offset=12, range=45, bullet_speed=8,
                   fire_delay=4, fire_mode="automatic")
+guns = [sks, ak47, mauserc96, m1carbine, m1911, ithaca37, springfield, mosin_nagant, m3, type50, bren, dp27, bazooka,
+        rpg7, tank_turret, test_weapon]
 
 
 class Bullet:
@@ -380,33 +482,110 @@ class Bullet:
         """ (Bullet, int, int, int, int, Gun, int) -> None
             Create the Bullet object. This is w
         """
-        self.x = x
-        self.y = y
         self.mouse_x = mouse_x  # In the case of enemy fired bullets, this is the target coordinate
         self.mouse_y = mouse_y
         self.speed = gun.bullet_speed
         self.angle = math.atan2(y - mouse_y, x - mouse_x)  # Used to rotate rockets
         self.x_vel = math.cos(self.angle) * self.speed
         self.y_vel = math.sin(self.angle) * self.speed
-        self.range = gun.range
-        self.damage = damage
 
-        self.hitbox = pygame.Rect(self.x, self.y, 8, 8)
+        # The position, speed and range live in projectile_pool, which moves every bullet at once each frame. The
+        # properties below read and write this bullet's slot, so the bullet can be used like it always has been
+        self.slot = projectile_pool.add(x, y, int(self.x_vel), int(self.y_vel), gun.range, damage, self.kind)
+
         self.type = "Bullet"
+        self.removed = False  # True once the bullet hit something, so it is taken out of its list at the end of the frame
+
+    kind = projectiles.BULLET
+
+    @property
+    def x(self):
+        return int(projectile_pool.x[self.slot])
+
+    @x.setter
+    def x(self, value):
+        projectile_pool.x[self.slot] = value
+
+    @property
+    def y(self):
+        return int(projectile_pool.y[self.slot])
+
+    @y.setter
+    def y(self, value):
+        projectile_pool.y[self.slot] = value
+
+    @property
+    def last_x(self):  # Where the bullet was at the start of this frame
+        return int(projectile_pool.last_x[self.slot])
+
+    @property
+    def last_y(self):
+        return int(projectile_pool.last_y[self.slot])
+
+    @property
+    def range(self):
+        return int(projectile_pool.range[self.slot])
+
+    @range.setter
+    def range(self, value):
+        projectile_pool.range[self.slot] = value
+
+    @property
+    def damage(self):
+        return int(projectile_pool.damage[self.slot])
+
+    @property
+    def hitbox(self):
+        return pygame.Rect(self.x, self.y, 8, 8)
 
     def main(self):
         """ (Bullet) -> None
-            If the bullet has not reached its maximum range, then keep going, otherwise, do nothing
+            Draws the bullet if it has not reached its maximum range. It was already moved by projectile_pool.update.
         """
-        self.range -= 1
-
         if not self.range < 0:
-            self.x -= int(self.x_vel)
-            self.y -= int(self.y_vel)
+            screen_x, screen_y = camera.to_screen(self.x, self.y)
+            if culler.visible(screen_x - 4, screen_y - 4, 8, 8):
+                dirty.add(pygame.draw.circle(display, BLACK, (screen_x, screen_y), 4))
+
+    def release(self):
+        """ (Bullet) -> None
+            Gives the bullet's slot back to projectile_pool. Call this once the bullet is taken out of its list.
+        """
+        projectile_pool.release(self.slot)
 
-            pygame.draw.circle(display, BLACK, (self.x, self.y), 4)
+    def path(self):
+        """ (Bullet) -> pygame.Rect
+            Returns a rectangle around everywhere the bullet went this frame
+        """
+        return self.hitbox.union(pygame.Rect(self.last_x, self.last_y, 8, 8))
 
-            self.hitbox = pygame.Rect(self.x, self.y, 8, 8)
+    def distance_to(self, rect, size):
+        """ (Bullet, pygame.Rect, int) -> int
+            Checks the whole line the bullet travelled along this frame, not just where it ended up, so fast bullets
+            can't skip over thin things. Returns how far along the line a size by size square at the bullet's position
+            first touches rect, or None if it never does. A size of 1 treats the bullet as a point.
+        """
+        # The square touches rect whenever its top-left corner is inside rect stretched up and left by size - 1
+        grown = pygame.Rect(rect[0] - size + 1, rect[1] - size + 1, rect[2] + size - 1, rect[3] + size - 1)
+        crossing = grown.clipline(self.last_x, self.last_y, self.x, self.y)
+        if not crossing:
+            return None
+
+        # The first point of crossing is where the line goes into rect. Bullets travel in straight lines, so x + y
+        # distance is enough to tell which thing the bullet reached first
+        return abs(crossing[0][0] - self.last_x) + abs(crossing[0][1] - self.last_y)
+
+    def distance_to_obstacle(self):
+        """ (Bullet) -> int
+            Returns how far along its path this frame the bullet ran into the first solid object, or None if it didn't
+        """
+        nearest = None
+        for object in obstacles.query(self.path()):
+            distance = self.distance_to(object.hitbox, 1)
+            if distance is not None and (nearest is None or distance < nearest):
+                nearest = distance
+
+        return nearest
 
 
 class Rocket(Bullet):
@@ -419,28 +598,36 @@ class Rocket(Bullet):
         self.damage_radius = pygame.Rect(self.x - 100, self.y - 100, 200, 200)  # Damages all enemies in here
         self.type = "Rocket"
 
-        self.exploding = False
         self.exploding_timer = FPS  # An explosion stays visible for one second
+        self.detonated = False  # True once the explosion's damage was handed to resolve_explosions
+
+    kind = projectiles.ROCKET
+
+    @property
+    def exploding(self):  # Rockets stop moving once they explode
+        return bool(projectile_pool.exploding[self.slot])
+
+    @exploding.setter
+    def exploding(self, value):
+        projectile_pool.exploding[self.slot] = value
 
     def main(self):
         """ (Rocket) -> None
-            Same as Bullet main, it will draw an explosion after it explodes for one second. This explosion will still
-            damage enemies inside the area while
+            Same as Bullet main, it will draw an explosion after it explodes for one second. The damage was already
+            done when it exploded.
         """
-        self.range -= 1
-
         if self.range > 0:
             if not self.exploding:
-                self.x -= int(self.x_vel)
-                self.y -= int(self.y_vel)
-
                 rel_x, rel_y = self.x - int(self.x_vel) - self.x, self.y - int(self.y_vel) - self.y
                 angle = -((180 / math.pi) * math.atan2(rel_y, rel_x))
 
-                display.blit(pygame.transform.rotate(rocket, angle), (self.x, self.y))
-                self.hitbox = pygame.Rect(self.x, self.y, 8, 8)
+                screen_x, screen_y = camera.to_screen(self.x, self.y)
+                if culler.visible(screen_x, screen_y, 50, 19):
+                    dirty.blit(rotation_cache.rotate(rocket, angle), (screen_x, screen_y))
         if self.exploding:
-            display.blit(explosion, (self.x, self.y))
+            screen_x, screen_y = camera.to_screen(self.x, self.y)
+            if culler.visible(screen_x, screen_y, 100, 100):
+                dirty.blit(explosion, (screen_x, screen_y))
             self.exploding_timer -= 1
 
             if self.exploding_timer <= 0:
@@ -451,65 +638,16 @@ class Rocket(Bullet):
 
     def explode(self, mode):
         """ (Rocket, str) -> None
-            Kill/damage all enemies/players in the respective radius. Enemy rockets will not kill other enemies (mode
-            is either "Enemy" or "Player", and is which character fired the rocket. However, the player can still be
-            damaged by their own rocket.
+            Blow up the rocket, killing/damaging everything in the respective radius. Enemy rockets will not kill
+            other enemies (mode is either "Enemy" or "Player", and is which character fired the rocket. However, the
+            player can still be damaged by their own rocket. The damage is done once, by resolve_explosions at the
+            end of the frame, no matter how many times this is called while the explosion is showing.
         """
-        # 1. Damage enemies
-        for enemy in enemies:
-            if mode != "Enemy":
-                if pygame.Rect.colliderect(enemy.hitbox, self.death_radius):
-                    if enemy.health != 0:
-                        enemy.health = 0
-                        try:  # Will result in error for dogs
-                            if enemy.primary_weapon == ithaca37:  # Different weapons mean harder enemies, so the player
-                                player.money += 100  # gets more money
-                            elif enemy.primary_weapon == m3:
-                                player.money += 125
-                            elif enemy.primary_weapon == springfield:
-                                player.money += 150
-                            elif enemy.primary_weapon == bazooka:
-                                player.money += 200
-                            elif enemy.primary_weapon == m1carbine:
-                                player.money += 275
-                            elif enemy.primary_weapon == tank_turret:
-                                player.money += 500
-                        except AttributeError:
-                            player.money += 150
-                        player.hitmarker_chain = FPS
-                        player.kills += 1
+        if not self.detonated:
+            explosions.append((self.death_radius, self.damage_radius, mode))
+            self.detonated = True
 
-                elif pygame.Rect.colliderect(enemy.hitbox, self.damage_radius):
-                    if enemy.health != 0:
-                        enemy.health -= 95
-                        player.hitmarker_chain = FPS
-
-                        if enemy.health <= 0 and not enemy.dead:
-                            try:  # Will result in error for dogs
-                                if enemy.primary_weapon == ithaca37:
-                                    player.money += 100
-                                elif enemy.primary_weapon == m3:
-                                    player.money += 125
-                                elif enemy.primary_weapon == springfield:
-                                    player.money += 150
-                                elif enemy.primary_weapon == bazooka:
-                                    player.money += 200
-                                elif enemy.primary_weapon == m1carbine:
-                                    player.money += 275
-                                elif enemy.primary_weapon == tank_turret:
-                                    player.money += 500
-                            except AttributeError:
-                                player.money += 150
-                            player.kills += 1
-
-        # 2. Damage the player
-        if pygame.Rect.colliderect(player.hitbox, self.death_radius):
-            player.health = 0
-        elif pygame.Rect.colliderect(player.hitbox, self.damage_radius):
-            player.health -= 95
-
-        if sound_fx:
-            if not self.exploding:
+            if sound_fx:
                 pygame.mixer.Channel(4).play(explosion_sound)
 
         self.exploding = True
@@ -526,13 +664,17 @@ class Grenade(Rocket):
         self.type = "Grenade"
         self.range = 5 * FPS
 
-        self.hitbox = pygame.Rect(self.x - display_scroll[0], self.y - display_scroll[1], 50, 50)
-
         self.x_vel = math.cos(self.angle) * 4
         self.y_vel = math.sin(self.angle) * 4
 
         self.speed_modifier = 2
 
+    kind = projectiles.GRENADE  # Grenades bounce, so they move themselves instead of being moved by projectile_pool
+
+    @property
+    def hitbox(self):
+        return pygame.Rect(self.x, self.y, 50, 50)
+
     def main(self):
         """ (Grenade) -> None
             Main function of the grenade. It calculates if the grenade would bounce if it moved, and if it would, then
@@ -545,15 +687,14 @@ class Grenade(Rocket):
         self.range -= 1
         if self.range == 0:
             self.explode("Player")
+            self.removed = True
         elif self.range > 0:
             # Check if there would be a collision if it moved on its current path
             tentative_hitbox = pygame.Rect(self.x - int(self.x_vel), self.y - int(self.y_vel), 50, 50)
-            for object in objects:
-                if pygame.Rect.colliderect(tentative_hitbox, object.hitbox):
-                    if not object.pass_through:
-                        self.x_vel = -self.x_vel  # Reverse the directions of the grenade
-                        self.y_vel = -self.y_vel
-                        bounce = True
+            for object in obstacles.query(tentative_hitbox):
+                self.x_vel = -self.x_vel  # Reverse the directions of the grenade
+                self.y_vel = -self.y_vel
+                bounce = True
 
             if not bounce:
                 self.x -= int(self.x_vel * self.speed_modifier)
@@ -564,13 +705,13 @@ class Grenade(Rocket):
             rel_x, rel_y = self.x - int(self.x_vel) - self.x, self.y - int(self.y_vel) - self.y
             angle = -((180 / math.pi) * math.atan2(rel_y, rel_x))
 
-            display.blit(pygame.transform.rotate(grenade, angle), (self.x, self.y))
+            screen_x, screen_y = camera.to_screen(self.x, self.y)
+            if culler.visible(screen_x, screen_y, 50, 50):
+                dirty.blit(rotation_cache.rotate(grenade, angle), (screen_x, screen_y))
 
         self.death_radius = pygame.Rect(self.x - 50, self.y - 50, 100, 100)
         self.damage_radius = pygame.Rect(self.x - 100, self.y - 100, 200, 200)
 
-        self.hitbox = pygame.Rect(self.x - display_scroll[0], self.y - display_scroll[1], 50, 50)
-
 
 class C4:
     def __init__(self, x, y):
@@ -581,82 +722,42 @@ class C4:
         self.x = x
         self.y = y
 
-        self.death_radius = pygame.Rect(self.x - 50 - display_scroll[0], self.y - 50 - display_scroll[1], 100, 100)
-        self.damage_radius = pygame.Rect(self.x - 100 - display_scroll[0], self.y - 100 - display_scroll[1], 200, 200)
+        self.death_radius = pygame.Rect(self.x - 50, self.y - 50, 100, 100)
+        self.damage_radius = pygame.Rect(self.x - 100, self.y - 100, 200, 200)
 
         self.exploding = False
         self.explosion_countdown = round(FPS)
+        self.removed = False  # True once the explosion is over, and the C4 should be taken out of list_of_c4
 
     def main(self):
         """ (C4) -> None
             Draw the C4 onto the screen. If it is exploding, it will draw an explosion for a second before removing
             itself.
         """
+        screen_x, screen_y = camera.to_screen(self.x, self.y)
         if self.exploding:
             if self.explosion_countdown > 0:
-                display.blit(explosion, (self.x - display_scroll[0], self.y - display_scroll[1]))
+                if culler.visible(screen_x, screen_y, 100, 100):
+                    dirty.blit(explosion, (screen_x, screen_y))
                 self.explosion_countdown -= 1
 
             else:
-                list_of_c4.remove(self)
-        else:
-            display.blit(pygame.image.load(r"weapons\c4.png"), (self.x - display_scroll[0], self.y - display_scroll[1]))
+                self.removed = True
+        elif culler.visible(screen_x, screen_y, 50, 33):
+            dirty.blit(c4_image, (screen_x, screen_y))
 
-        self.death_radius = pygame.Rect(self.x - 50 - display_scroll[0], self.y - 50 - display_scroll[1], 100, 100)
-        self.damage_radius = pygame.Rect(self.x - 100 - display_scroll[0], self.y - 100 - display_scroll[1], 200, 200)
+        self.death_radius = pygame.Rect(self.x - 50, self.y - 50, 100, 100)
+        self.damage_radius = pygame.Rect(self.x - 100, self.y - 100, 200, 200)
 
     def explode(self):
         """ (C4) -> None
-            Blow up the C4. Since enemies can't use C4, I don't have to account for that.
+            Blow up the C4. Since enemies can't use C4, I don't have to account for that. Like rockets, the damage is
+            done once by resolve_explosions, even if the player presses the button again while it is exploding.
         """
-        for enemy in enemies:
-            if pygame.Rect.colliderect(enemy.hitbox, self.death_radius):
-                if not enemy.dead:
-                    try:  # Will result in error for dogs
-                        if enemy.primary_weapon == ithaca37:
-                            player.money += 100
-                        elif enemy.primary_weapon == m3:
-                            player.money += 125
-                        elif enemy.primary_weapon == springfield:
-                            player.money += 150
-                        elif enemy.primary_weapon == bazooka:
-                            player.money += 200
-                        elif enemy.primary_weapon == m1carbine:
-                            player.money += 275
-                        elif enemy.primary_weapon == tank_turret:
-                            player.money += 500
-                    except AttributeError:
-                        player.money += 150
-                    player.hitmarker_chain = FPS
-                    enemy.health = 0
-                    player.kills += 1
-                    enemy.dead = True
-            elif pygame.Rect.colliderect(enemy.hitbox, self.damage_radius):
-                enemy.health -= 95
-                if not enemy.dead:
-                    if enemy.health <= 0:
-                        try:  # Will result in error for dogs
-                            if enemy.primary_weapon == ithaca37:
-                                player.money += 100
-                            elif enemy.primary_weapon == m3:
-                                player.money += 125
-                            elif enemy.primary_weapon == springfield:
-                                player.money += 150
-                            elif enemy.primary_weapon == bazooka:
-                                player.money += 200
-                            elif enemy.primary_weapon == m1carbine:
-                                player.money += 275
-                            elif enemy.primary_weapon == tank_turret:
-                                player.money += 500
-                        except AttributeError:
-                            player.money += 150
-                        enemy.dead = True
-                        player.kills += 1
-                        player.hitmarker_chain = FPS
-        if pygame.Rect.colliderect(player.hitbox, self.death_radius):
-            player.health = 0
-        elif pygame.Rect.colliderect(player.hitbox, self.damage_radius):
-            player.health -= 95
+        if self.exploding:
+            return
+
+        explosions.append((self.death_radius, self.damage_radius, "Player"))
 
         self.exploding = True
         if sound_fx:
@@ -673,214 +774,142 @@ class American:
         self.x = x
         self.y = y
         # Slightly modify the American's starting position so they don't all spawn on top of each other
-        self.x += randint(-50, 50)
-        self.y += randint(-50, 50)
+        self.x += randomness.spawning.randint(-50, 50)
+        self.y += randomness.spawning.randint(-50, 50)
 
         self.animation_count = 0
         self.reset_offset = 0
-        self.offset_x = randrange(-500, 500)
-        self.offset_y = randrange(-500, 500)
+        self.offset_x = randomness.ai.randrange(-500, 500)
+        self.offset_y = randomness.ai.randrange(-500, 500)
 
         self.primary_weapon = primary_weapon
         self.secondary_weapon = secondary_weapon
 
         self.health = health
 
-        self.target_x, self.target_y = player.x + randrange(-50, 50), player.y + randrange(-50, 50)
+        self.target_x = player.x + randomness.ai.randrange(-50, 50)
+        self.target_y = player.y + randomness.ai.randrange(-50, 50)
 
-        self.fire_delay = round(self.primary_weapon.fire_delay * FPS / randint(8, 12))  # Delay between shots fired
+        # Delay between shots fired
+        self.fire_delay = round(self.primary_weapon.fire_delay * FPS / randomness.ai.randint(8, 12))
         self.hitbox = pygame.Rect(self.x, self.y, 30, 45)
         self.dead = False
-        self.angle = None
+        # Which way the gun points. It is set again whenever the enemy takes a turn, but a far away enemy can be killed
+        # before its first turn, and its gun still has to be left lying somewhere
+        self.angle = self.aim_angle()
+        self.on_screen = True  # Whether the enemy is drawn this frame
+        self.walking = False  # Set by move_ground_enemies each frame, and used to pick the image to draw
+        self.flipped = False
+        self.escape_time = 0  # Frames left walking off to the side to get unstuck, see move_ground_enemies
+        self.escape_x = 0
+        self.escape_y = 0
+        self.escapes = 0  # How many times it got stuck, so it can try a different side each time
+        self.lod_phase = ai_lod.next_phase()
+        self.ticks = 1  # How many frames the enemy does this frame, set by ai_lod. 0 means it skips this frame
+        self.removed = False  # True when the enemy should be taken out of enemies at the end of the frame
         self.type = "Human"
         self.sub_type = "Normal"
 
+    walk_size = (32, 42)  # Size of the hitbox that is checked for collisions when the enemy takes a step
+
+    def new_target(self):
+        """ (American) -> None
+            Picks a new spot near the player to walk towards, and how many frames to keep walking there. This is done
+            by thinker, so the enemy keeps walking to its old spot until it gets a turn.
+        """
+        self.offset_x = randomness.ai.randrange(-500, 500)
+        self.offset_y = randomness.ai.randrange(-500, 500)
+        self.reset_offset = randomness.ai.randrange(120, 150)
+
+    def new_fire_delay(self):
+        """ (American) -> None
+            Picks how long to wait before shooting again. This is done by thinker too, and the enemy doesn't shoot
+            until it has.
+        """
+        self.fire_delay = round(self.primary_weapon.fire_delay * FPS / randomness.ai.randint(8, 12))
+
+    def aim_angle(self):
+        """ (American) -> float
+            Returns the angle, in degrees, the gun has to point at to face the player
+        """
+        rel_x, rel_y = player.x - self.x, player.y - self.y
+        return -((180 / math.pi) * math.atan2(rel_y, rel_x))
+
     def handle_weapons(self):
         """ (American) --> None
             Display the weapon, pointed towards the player.
         """
-        rel_x, rel_y = player.x + display_scroll[0] - self.x, player.y + display_scroll[1] - self.y
-        self.angle = -((180 / math.pi) * math.atan2(rel_y, rel_x))
+        self.angle = self.aim_angle()
 
-        display.blit(pygame.transform.rotate(self.primary_weapon.image, self.angle),
-                     (self.x + self.primary_weapon.x_offset - int(
-                         self.primary_weapon.image.get_width() / 2 + display_scroll[0]),
-                      self.y + self.primary_weapon.y_offset - int(self.primary_weapon.image.get_height() / 2) -
-                      display_scroll[1]))
+        if not self.on_screen:
+            return
 
-    def handle_weapon_dead(self):
-        """ (American) -> None
-            Draws the gun on screen if the enemy is dead
+        gun_x = self.x + self.primary_weapon.x_offset - int(self.primary_weapon.image.get_width() / 2)
+        gun_y = self.y + self.primary_weapon.y_offset - int(self.primary_weapon.image.get_height() / 2)
+        dirty.blit(rotation_cache.rotate(self.primary_weapon.image, self.angle), camera.to_screen(gun_x, gun_y))
+
+    def die(self, corpse_image):
+        """ (American, pygame.Surface) -> None
+            Leaves the enemy's body and gun lying on the ground, and takes the enemy out of the enemies list. Both are
+            drawn onto the ground layer for good, and only what is needed to pick up the gun is kept, in corpses.
         """
-        display.blit(pygame.transform.rotate(self.primary_weapon.image, self.angle),
-                     (self.x - display_scroll[0], self.y - display_scroll[1]))
+        self.dead = True
+        self.removed = True
+
+        bury(corpse_image, self.x, self.y)
+        gun = bury(rotation_cache.rotate(self.primary_weapon.image, self.angle), self.x, self.y)
+        corpses.add(Corpse(self.x, self.y, self.primary_weapon, self.angle, gun))
 
     def shoot(self):
         """ (American) -> None
             Creates a bullet that flies out toward the player, with a small margin of error (30 pixels)
         """
-        enemy_bullets.append(Bullet(self.x - display_scroll[0], self.y + 22 - display_scroll[1],
-                                    player.x + randrange(-30, 30), player.y + randrange(-30, 30),
-                                    self.primary_weapon, self.primary_weapon.damage))
+        aim_x = player.x + randomness.combat.randrange(-30, 30)
+        aim_y = player.y + randomness.combat.randrange(-30, 30)
+        enemy_bullets.append(Bullet(self.x, self.y + 22, aim_x, aim_y, self.primary_weapon, self.primary_weapon.damage))
         if sound_fx:
             if not pygame.mixer.Channel(1).get_busy():
                 pygame.mixer.Channel(1).play(enemy_gunfire)
 
     def main(self):
         """ (American) -> None
-            Draws the enemy onto the screen, and moves it towards the player. Dead enemies are drawn flipped over
+            Draws the enemy onto the screen where move_ground_enemies moved it, and shoots at the player. Dead enemies
+            are left flipped over on the ground
         """
         if self.sub_type == "Normal":
-            enemy_walk_images = american_walk_images
+            enemy_sprites = american_sprites
         else:
-            enemy_walk_images = sniper_images
+            enemy_sprites = sniper_sprites
+
+        screen_x, screen_y = camera.to_screen(self.x, self.y)
+        self.on_screen = culler.visible(screen_x, screen_y, 32, 42)
 
         if self.health <= 0:
-            display.blit(pygame.transform.rotate(pygame.transform.scale(enemy_walk_images[0], (32, 42)), 270),
-                         (self.x - display_scroll[0], self.y - display_scroll[1]))
-            self.dead = True
-            self.handle_weapon_dead()
-        else:
+            self.die(enemy_sprites.corpse)
+        elif self.ticks > 0:  # Far away enemies skip most frames, and catch up on their turn
             self.handle_weapons()
 
             if self.animation_count > 14:
                 self.animation_count = 0
             else:
                 self.animation_count += 1
+            frame = self.animation_count // 4
 
-            if self.reset_offset == 0:  # If it is time to find a new target location to move towards
-                self.offset_x = randrange(-500, 500)
-                self.offset_y = randrange(-500, 500)
-                self.reset_offset = randrange(120, 150)  # Frames left until a new target location is chosen again
-            else:
-                self.reset_offset -= 1
-
-            # Check for collisions
-            collision = False
-            if player.y + self.offset_y > self.y - display_scroll[1] and player.x + self.offset_x > self.x - \
-                    display_scroll[0]:
-                self.hitbox = pygame.Rect(self.x + 1 - display_scroll[0], self.y + 1 - display_scroll[1], 32,
-                                          42)
-                for object in objects:
-                    if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                        collision = True
-                    else:
-                        collision = False
-
-                if not collision:
-                    self.y += 1
-                    self.x += 1
-                    if self.x - display_scroll[0] > player.x:
-                        display.blit(pygame.transform.scale(
-                            pygame.transform.flip(enemy_walk_images[self.animation_count // 4], True, False),
-                            (32, 42)),
-                            (self.x - display_scroll[0], self.y - display_scroll[1]))
-                    else:
-                        display.blit(pygame.transform.scale(enemy_walk_images[self.animation_count // 4], (32, 42)),
-                                     (self.x - display_scroll[0], self.y - display_scroll[1]))
-                if collision:
-                    display.blit(pygame.transform.scale(enemy_walk_images[self.animation_count // 4], (32, 42)),
-                                 (self.x - display_scroll[0], self.y - display_scroll[1]))
-                    self.offset_x = randrange(-500, 500)
-                    self.offset_y = randrange(-500, 500)
-                    self.reset_offset = randrange(120, 150)
-            elif player.y + self.offset_y > self.y - display_scroll[1] and player.x + self.offset_x < self.x - \
-                    display_scroll[0]:
-                self.hitbox = pygame.Rect(self.x - 1 - display_scroll[0], self.y + 1 - display_scroll[1], 32,
-                                          42)
-                for object in objects:
-                    if not object.pass_through:
-                        if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                            collision = True
-                        else:
-                            collision = False
-                if not collision:
-                    self.y += 1
-                    self.x -= 1
-                    if self.x - display_scroll[0] > player.x:
-                        display.blit(pygame.transform.scale(
-                            pygame.transform.flip(enemy_walk_images[self.animation_count // 4], True, False),
-                            (32, 42)),
-                            (self.x - display_scroll[0], self.y - display_scroll[1]))
-                    else:
-                        display.blit(pygame.transform.scale(enemy_walk_images[self.animation_count // 4], (32, 42)),
-                                     (self.x - display_scroll[0], self.y - display_scroll[1]))
-                if collision:
-                    display.blit(pygame.transform.scale(enemy_walk_images[self.animation_count // 4], (32, 42)),
-                                 (self.x - display_scroll[0], self.y - display_scroll[1]))
-                    self.offset_x = randrange(-500, 500)
-                    self.offset_y = randrange(-500, 500)
-                    self.reset_offset = randrange(120, 150)
-            elif player.y + self.offset_y < self.y - display_scroll[1] and player.x + self.offset_x > self.x - \
-                    display_scroll[0]:
-                self.hitbox = pygame.Rect(self.x + 1 - display_scroll[0], self.y - 1 - display_scroll[1], 32,
-                                          42)
-                for object in objects:
-                    if not object.pass_through:
-                        if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                            collision = True
-                        else:
-                            collision = False
-                if not collision:
-                    self.y -= 1
-                    self.x += 1
-                    if self.x - display_scroll[0] > player.x:
-                        display.blit(pygame.transform.scale(
-                            pygame.transform.flip(enemy_walk_images[self.animation_count // 4], True, False),
-                            (32, 42)),
-                            (self.x - display_scroll[0], self.y - display_scroll[1]))
-                    else:
-                        display.blit(pygame.transform.scale(enemy_walk_images[self.animation_count // 4], (32, 42)),
-                                     (self.x - display_scroll[0], self.y - display_scroll[1]))
-                if collision:
-                    display.blit(pygame.transform.scale(enemy_walk_images[self.animation_count // 4], (32, 42)),
-                                 (self.x - display_scroll[0], self.y - display_scroll[1]))
-                    self.offset_x = randrange(-500, 500)
-                    self.offset_y = randrange(-500, 500)
-                    self.reset_offset = randrange(120, 150)
-            elif player.y + self.offset_y < self.y - display_scroll[1] and player.x + self.offset_x < self.x - \
-                    display_scroll[0]:
-                self.hitbox = pygame.Rect(self.x - 1 - display_scroll[0], self.y - 1 - display_scroll[1], 32,
-                                          42)
-                for object in objects:
-                    if not object.pass_through:
-                        if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                            collision = True
-                        else:
-                            collision = False
-                if not collision:
-                    self.y -= 1
-                    self.x -= 1
-                    if self.x - display_scroll[0] > player.x:
-                        display.blit(pygame.transform.scale(
-                            pygame.transform.flip(enemy_walk_images[self.animation_count // 4], True, False),
-                            (32, 42)),
-                            (self.x - display_scroll[0], self.y - display_scroll[1]))
-                    else:
-                        display.blit(pygame.transform.scale(enemy_walk_images[self.animation_count // 4], (32, 42)),
-                                     (self.x - display_scroll[0], self.y - display_scroll[1]))
-                if collision:
-                    display.blit(pygame.transform.scale(enemy_walk_images[self.animation_count // 4], (32, 42)),
-                                 (self.x - display_scroll[0], self.y - display_scroll[1]))
-                    self.offset_x = randrange(-500, 500)
-                    self.offset_y = randrange(-500, 500)
-                    self.reset_offset = randrange(120, 150)
-            else:
-                if self.x - display_scroll[0] > player.x:
-                    display.blit(pygame.transform.scale(
-                        pygame.transform.flip(enemy_walk_images[0], True, False), (32, 42)),
-                        (self.x - display_scroll[0], self.y - display_scroll[1]))
-                else:
-                    display.blit(pygame.transform.scale(enemy_walk_images[0], (32, 42)),
-                                 (self.x - display_scroll[0], self.y - display_scroll[1]))
+            # The enemy was already moved by move_ground_enemies. Standing still shows the first frame, and the image
+            # is mirrored when the enemy is to the right of the player, except on the frame it bumps into something
+            if not self.walking:
+                frame = 0
+
+            if self.on_screen:
+                dirty.blit(enemy_sprites.facing(frame, self.flipped), camera.to_screen(self.x, self.y))
 
             # Shoot, if the fire delay has elapsed
-            self.fire_delay -= 1
-            if self.fire_delay <= 0:
-                self.fire_delay = round(self.primary_weapon.fire_delay * FPS / randint(8, 12))
+            self.fire_delay -= self.ticks
+            if self.fire_delay <= 0 and not thinker.is_waiting((self, "fire delay")):
                 self.shoot()
+                thinker.schedule((self, "fire delay"), self.new_fire_delay)
 
-            self.hitbox = pygame.Rect(self.x - display_scroll[0], self.y - display_scroll[1], 30, 45)
+            self.hitbox = pygame.Rect(self.x, self.y, 30, 45)
 
 
 class Dog:
@@ -896,294 +925,60 @@ class Dog:
         self.hitbox = pygame.Rect(self.x, self.y, 39, 21)
         self.health = 100
         self.dead = False
+        self.lod_phase = ai_lod.next_phase()
+        self.ticks = 1
+        self.removed = False
         self.type = "Dog"
         self.health = health
 
     def main(self):
         """ (Dog) -> None
-            Move towards the player
+            Move towards the player, following the flow field in paths
         """
+        screen_x, screen_y = camera.to_screen(self.x, self.y)
+        on_screen = culler.visible(screen_x, screen_y, 39, 21)
+
         if self.health <= 0:
-            display.blit(pygame.transform.rotate(dog_images[0], 270),
-                         (self.x - display_scroll[0], self.y - display_scroll[1]))
+            # Leave the body on the ground, and take the dog out of the enemies list. There's no gun to pick up
+            bury(dog_sprites.corpse, self.x, self.y)
             self.dead = True
-        else:
+            self.removed = True
+        elif self.ticks > 0:
             if self.animation_count + 1 >= 16:
                 self.animation_count = 0
 
             self.animation_count += 1
 
-            collision = False
-
-            if player.y > self.y - display_scroll[1] and player.x > self.x - display_scroll[0]:
-                self.hitbox = pygame.Rect(self.x + 2 - display_scroll[0], self.y + 2 - display_scroll[1], 39,
-                                          21)
-                for object in objects:
-                    if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                        collision = True
-                    else:
-                        collision = False
-
-                if not collision:
-                    self.y += 2
-                    self.x += 2
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_down = True
-                    self.can_move_right = True
-                if collision:
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_down = False
-                    self.can_move_right = False
-            elif player.y > self.y - display_scroll[1] and player.x < self.x - display_scroll[0]:
-                self.hitbox = pygame.Rect(self.x - 2 - display_scroll[0], self.y + 2 - display_scroll[1], 39,
-                                          21)
-                for object in objects:
-                    if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                        collision = True
-                    else:
-                        collision = False
-
-                if not collision:
-                    self.y += 2
-                    self.x -= 2
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        if self.x - display_scroll[0] < player.x:
-                            display.blit(
-                                pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                                (self.x - display_scroll[0],
-                                 self.y - display_scroll[1]))
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_down = True
-                    self.can_move_left = True
-                if collision:
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        if self.x - display_scroll[0] < player.x:
-                            display.blit(
-                                pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                                (self.x - display_scroll[0],
-                                 self.y - display_scroll[1]))
-                    self.can_move_down = False
-                    self.can_move_left = False
-            elif player.y < self.y - display_scroll[1] and player.x > self.x - display_scroll[0]:
-                self.hitbox = pygame.Rect(self.x + 2 - display_scroll[0], self.y - 2 - display_scroll[1], 39,
-                                          21)
-                for object in objects:
-                    if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                        collision = True
-                    else:
-                        collision = False
-
-                if not collision:
-                    self.y -= 2
-                    self.x += 2
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-
-                    self.can_move_up = True
-                    self.can_move_right = True
-                if collision:
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_up = False
-                    self.can_move_right = False
-            elif player.y < self.y - display_scroll[1] and player.x < self.x - display_scroll[0]:
-                self.hitbox = pygame.Rect(self.x - 2 - display_scroll[0], self.y - 2 - display_scroll[1], 39,
-                                          21)
-                for object in objects:
-                    if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                        collision = True
-                    else:
-                        collision = False
-
-                if not collision:
-                    self.y -= 2
-                    self.x -= 2
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_up = True
-                    self.can_move_left = True
-                if collision:
-                    self.y -= 2
-                    self.x -= 2
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_up = False
-                    self.can_move_left = False
-            elif player.y > self.y - display_scroll[1]:
-                self.hitbox = pygame.Rect(self.x - display_scroll[0], self.y + 2 - display_scroll[1], 39, 21)
-
-                for object in objects:
-                    if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                        collision = True
-                    else:
-                        collision = False
-
-                if not collision:
-                    self.y += 2
-
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_down = True
-                if collision:
-                    self.can_move_down = False
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-            elif player.y < self.y - display_scroll[1]:
-                self.hitbox = pygame.Rect(self.x - display_scroll[0], self.y - 2 - display_scroll[1], 39, 21)
-
-                for object in objects:
-                    if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                        collision = True
-                    else:
-                        collision = False
-
-                if not collision:
-                    self.y -= 2
-
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_up = True
-                if collision:
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_up = False
-            elif player.x < self.x - display_scroll[0]:
-                self.hitbox = pygame.Rect(self.x - 2 - display_scroll[0], self.y - display_scroll[1], 39, 21)
-
-                for object in objects:
-                    if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                        collision = True
-                    else:
-                        collision = False
-
-                if not collision:
-                    self.x -= 2
-
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_left = True
-                if collision:
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_left = False
-            elif player.x > self.x - display_scroll[0]:
-                self.hitbox = pygame.Rect(self.x + 2 - display_scroll[0], self.y - display_scroll[1], 39, 21)
-
-                for object in objects:
-                    if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                        collision = True
-                    else:
-                        collision = False
-
-                if not collision:
-                    self.x += 2
-
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_right = True
-                if collision:
-                    if self.x - display_scroll[0] < player.x:
-                        display.blit(
-                            pygame.transform.flip(dog_images[self.animation_count // 4], True, False),
-                            (self.x - display_scroll[0],
-                             self.y - display_scroll[1]))
-                    else:
-                        display.blit(dog_images[self.animation_count // 4], (self.x - display_scroll[0],
-                                                                             self.y - display_scroll[1]))
-                    self.can_move_right = False
-
-            self.hitbox = pygame.Rect(self.x - display_scroll[0], self.y - display_scroll[1], 39, 21)
+            # Follow the flow field around anything solid. If the dog is too far away for the field, or already next to
+            # the player, it runs straight at them
+            step = paths.direction(self.x, self.y)
+            if step is None:
+                step = (int(numpy.sign(player.x - self.x)), int(numpy.sign(player.y - self.y)))
+            step_x, step_y = step[0] * 2 * self.ticks, step[1] * 2 * self.ticks
+
+            if step_x or step_y:
+                if not obstacles.collides(pygame.Rect(self.x + step_x, self.y + step_y, 39, 21)):
+                    self.x += step_x
+                    self.y += step_y
+                elif step_x and step_y:
+                    self.slide(step_x, step_y)
+
+            # The dog images face left, so they are mirrored when the dog is to the left of the player
+            if on_screen:
+                dirty.blit(dog_sprites.facing(self.animation_count // 4, self.x < player.x),
+                           camera.to_screen(self.x, self.y))
+
+            self.hitbox = pygame.Rect(self.x, self.y, 39, 21)
+
+    def slide(self, step_x, step_y):
+        """ (Dog, int, int) -> None
+            Called when something solid is in the way of moving diagonally. The dog tries to move along just one axis
+            instead, so it slides along the side of the object rather than getting stuck on it.
+        """
+        if not obstacles.collides(pygame.Rect(self.x + step_x, self.y, 39, 21)):
+            self.x += step_x
+        elif not obstacles.collides(pygame.Rect(self.x, self.y + step_y, 39, 21)):
+            self.y += step_y
 
 
 class Sniper(American):
@@ -1209,8 +1004,8 @@ class Grenadier(American):
             Shoots a rocket instead of a bullet
         """
         enemy_bullets.append(
-            Rocket(self.x - display_scroll[0], self.y + 22 - display_scroll[1], player.x + randrange(-30, 30),
-                   player.y + randrange(-30, 30), self.primary_weapon, self.primary_weapon.damage))
+            Rocket(self.x, self.y + 22, player.x + randomness.combat.randrange(-30, 30),
+                   player.y + randomness.combat.randrange(-30, 30), self.primary_weapon, self.primary_weapon.damage))
         if sound_fx:
             pygame.mixer.Channel(6).play(rocket_launch)
 
@@ -1226,141 +1021,57 @@ class Tank(Grenadier):
         self.type = "Tank"
         self.health *= 20  # Tanks have 20x the health of normal enemies from the same wave.
 
+    walk_size = (200, 104)
+
     def main(self):
         """ (Tank) -> None
-            Make the tank move around towards the player
+            Draws the tank where move_ground_enemies moved it, and shoots at the player
         """
-        if self.reset_offset == 0:
-            self.offset_x = randrange(-500, 500)
-            self.offset_y = randrange(-500, 500)
-            self.reset_offset = randrange(120, 150)
-        else:
-            self.reset_offset -= 1
-
-        collision = False
-        if player.y + self.offset_y > self.y - display_scroll[1] and player.x + self.offset_x > self.x - \
-                display_scroll[0]:
-            self.hitbox = pygame.Rect(self.x + 1 - display_scroll[0], self.y + 1 - display_scroll[1], 200,
-                                      104)
-            for object in objects:
-                if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                    collision = True
-                else:
-                    collision = False
-
-            if not collision:
-                self.y += 1
-                self.x += 1
-                if self.x - display_scroll[0] > player.x:
-                    display.blit(
-                        pygame.transform.flip(tank_images[0], True, False),
-                        (self.x - display_scroll[0], self.y - display_scroll[1]))
-                else:
-                    display.blit(tank_images[0],
-                                 (self.x - display_scroll[0], self.y - display_scroll[1]))
-            if collision:
-                display.blit(tank_images[0],
-                             (self.x - display_scroll[0], self.y - display_scroll[1]))
-                self.offset_x = randrange(-500, 500)
-                self.offset_y = randrange(-500, 500)
-                self.reset_offset = randrange(120, 150)
-        elif player.y + self.offset_y > self.y - display_scroll[1] and player.x + self.offset_x < self.x - \
-                display_scroll[0]:
-            self.hitbox = pygame.Rect(self.x - 1 - display_scroll[0], self.y + 1 - display_scroll[1], 200,
-                                      104)
-            for object in objects:
-                if not object.pass_through:
-                    if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                        collision = True
-                    else:
-                        collision = False
-            if not collision:
-                self.y += 1
-                self.x -= 1
-                if self.x - display_scroll[0] > player.x:
-                    display.blit(
-                        pygame.transform.flip(tank_images[0], True, False),
-                        (self.x - display_scroll[0], self.y - display_scroll[1]))
-                else:
-                    display.blit(tank_images[0],
-                                 (self.x - display_scroll[0], self.y - display_scroll[1]))
-            if collision:
-                display.blit(tank_images[0],
-                             (self.x - display_scroll[0], self.y - display_scroll[1]))
-                self.offset_x = randrange(-500, 500)
-                self.offset_y = randrange(-500, 500)
-                self.reset_offset = randrange(120, 150)
-        elif player.y + self.offset_y < self.y - display_scroll[1] and player.x + self.offset_x > self.x - \
-                display_scroll[0]:
-            self.hitbox = pygame.Rect(self.x + 1 - display_scroll[0], self.y - 1 - display_scroll[1], 200,
-                                      104)
-            for object in objects:
-                if not object.pass_through:
-                    if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                        collision = True
-                    else:
-                        collision = False
-            if not collision:
-                self.y -= 1
-                self.x += 1
-                if self.x - display_scroll[0] > player.x:
-                    display.blit(
-                        pygame.transform.flip(tank_images[0], True, False),
-                        (self.x - display_scroll[0], self.y - display_scroll[1]))
-                else:
-                    display.blit(tank_images[0],
-                                 (self.x - display_scroll[0], self.y - display_scroll[1]))
-            if collision:
-                display.blit(tank_images[0],
-                             (self.x - display_scroll[0], self.y - display_scroll[1]))
-                self.offset_x = randrange(-500, 500)
-                self.offset_y = randrange(-500, 500)
-                self.reset_offset = randrange(120, 150)
-        elif player.y + self.offset_y < self.y - display_scroll[1] and player.x + self.offset_x < self.x - \
-                display_scroll[0]:
-            self.hitbox = pygame.Rect(self.x - 1 - display_scroll[0], self.y - 1 - display_scroll[1], 200,
-                                      104)
-            for object in objects:
-                if not object.pass_through:
-                    if pygame.Rect.colliderect(self.hitbox, object.hitbox):
-                        collision = True
-                    else:
-                        collision = False
-            if not collision:
-                self.y -= 1
-                self.x -= 1
-                if self.x - display_scroll[0] > player.x:
-                    display.blit(
-                        pygame.transform.flip(tank_images[0], True, False),
-                        (self.x - display_scroll[0], self.y - display_scroll[1]))
-                else:
-                    display.blit(tank_images[0],
-                                 (self.x - display_scroll[0], self.y - display_scroll[1]))
-            if collision:
-                display.blit(tank_images[0],
-                             (self.x - display_scroll[0], self.y - display_scroll[1]))
-                self.offset_x = randrange(-500, 500)
-                self.offset_y = randrange(-500, 500)
-                self.reset_offset = randrange(120, 150)
-        else:
-            if self.x - display_scroll[0] > player.x:
-                display.blit(
-                    pygame.transform.flip(tank_images[0], True, False),
-                    (self.x - display_scroll[0], self.y - display_scroll[1]))
-            else:
-                display.blit(tank_images[0],
-                             (self.x - display_scroll[0], self.y - display_scroll[1]))
+        if self.ticks == 0:  # Far away, and not its turn this frame
+            return
+
+        self.on_screen = culler.visible(*camera.to_screen(self.x, self.y), 200, 104)
+
+        if self.on_screen:
+            dirty.blit(tank_sprites.facing(0, self.flipped), camera.to_screen(self.x, self.y))
 
-        self.fire_delay -= 1
-        if self.fire_delay <= 0:
-            self.fire_delay = round(self.primary_weapon.fire_delay * FPS / randint(8, 12))
+        self.fire_delay -= self.ticks
+        if self.fire_delay <= 0 and not thinker.is_waiting((self, "fire delay")):
             self.shoot()
+            thinker.schedule((self, "fire delay"), self.new_fire_delay)
 
-        self.hitbox = pygame.Rect(self.x - display_scroll[0], self.y - display_scroll[1], 200, 104)
+        self.hitbox = pygame.Rect(self.x, self.y, 200, 104)
 
         self.handle_weapons()
 
 
+class Corpse:
+    def __init__(self, x, y, primary_weapon, angle, gun_decal):
+        """ (Corpse, int, int, Gun, float, Decal) -> None
+            What is left of a dead American. The body and gun are already drawn onto the ground layer, so this only
+            keeps what is needed for the player to swap weapons with it.
+        """
+        self.x = x
+        self.y = y
+        self.primary_weapon = primary_weapon
+        self.angle = angle  # How the gun is lying on the ground
+        self.gun_decal = gun_decal
+
+        self.hitbox = pygame.Rect(x - 50, y - 50, 100, 100)  # The player has to be in here to swap weapons
+
+    def swap_weapon(self):
+        """ (Corpse) -> None
+            Swaps the player's gun with the gun lying on the corpse, and puts the player's old gun on the ground
+        """
+        player.primary_weapon, self.primary_weapon = self.primary_weapon, player.primary_weapon
+
+        old_gun = self.gun_decal
+        ground_layer.remove(old_gun)
+        dirty.add(pygame.Rect(camera.to_screen(old_gun.x, old_gun.y), (old_gun.width, old_gun.height)).clip(
+            display.get_rect()))  # So the ground under the old gun is drawn again next frame
+        self.gun_decal = bury(rotation_cache.rotate(self.primary_weapon.image, self.angle), self.x, self.y)
+
+
 class Object:
     def __init__(self, position, image_string, colorkey, width, height, pass_through):
         """ (Object, int, int, str, tuple, int, int, boolean) -> None
@@ -1369,20 +1080,23 @@ class Object:
         """
         self.x = position[0]
         self.y = position[1]
-        self.image = pygame.image.load(image_string).convert()
-        self.image.set_colorkey(colorkey)
+        self.image = assets.load_image(image_string, image_string, colorkey)  # Shared between all identical objects
         self.width = width
         self.height = height
         self.hitbox = pygame.Rect(self.x, self.y, width, height)
         self.pass_through = pass_through
 
+        self.static = True  # Scenery that never changes can be pre-drawn onto the terrain layers
+        self.baked = False  # True once the object has been drawn onto a terrain layer
+
     def main(self):
         """ (Object) -> None
-            Draw the object onto the screen.
+            Draws the object onto the screen, if it isn't already part of a terrain layer.
         """
-        self.hitbox = pygame.Rect(self.x - display_scroll[0], self.y - display_scroll[1], self.width, self.height)
-        display.blit(pygame.transform.scale(self.image, (self.width, self.height)),
-                     (self.x - display_scroll[0], self.y - display_scroll[1]))
+        if not self.baked:
+            screen_x, screen_y = camera.to_screen(self.x, self.y)
+            if culler.visible(screen_x, screen_y, self.width, self.height):
+                dirty.blit(pygame.transform.scale(self.image, (self.width, self.height)), (screen_x, screen_y))
 
 
 class WeaponArmoury(Object):
@@ -1391,8 +1105,8 @@ class WeaponArmoury(Object):
             The weapon armoury is a special Object where the player can buy items throughout the game.
         """
         super().__init__(position, image_string, colorkey, width, height, pass_through)
-        self.access_rect = pygame.Rect(self.x - 50 - display_scroll[0], self.y - 50 - display_scroll[1],
-                                       self.width + 100, self.height + 100)
+        self.static = False  # The buy menu is drawn with the armoury, so it can't be pre-drawn
+        self.access_rect = pygame.Rect(self.x - 50, self.y - 50, self.width + 100, self.height + 100)
         self.accessing_weapon_armory = False
         self.access_menu = "Main Weapon Armory"
 
@@ -1401,101 +1115,97 @@ class WeaponArmoury(Object):
             Draws the weapon armoury onto the screen. If the player is accessing the armoury, it will display all the
             buy options on the screen
         """
-        self.hitbox = pygame.Rect(self.x - display_scroll[0], self.y - display_scroll[1], self.width,
-                                  self.height)
-        display.blit(self.image, (self.x - display_scroll[0], self.y - display_scroll[1]))
-        self.access_rect = pygame.Rect(self.x - 50 - display_scroll[0], self.y - 50 - display_scroll[1],
-                                       self.width + 100, self.height + 100)
+        dirty.blit(self.image, camera.to_screen(self.x, self.y))
         # access_rect is the area the player must be in to be able to buy access the store
 
         if self.accessing_weapon_armory:
             if self.access_menu == "Main Weapon Armory":
-                display.blit(pygame.image.load(r"options/weapon_armory_title.png").convert(), (600, 195))
+                dirty.blit(assets.get_image("options/weapon_armory_title"), (600, 195))
                 if player.money >= 750:
-                    display.blit(pygame.image.load(r"options/refill.png").convert(), (600, 245))
+                    dirty.blit(assets.get_image("options/refill"), (600, 245))
                 else:
-                    display.blit(pygame.image.load(r"options/refill_cant_afford.png").convert(), (600, 245))
-                display.blit(pygame.image.load(r"options/pistols.png").convert(), (600, 265))
-                display.blit(pygame.image.load(r"options/shotguns.png").convert(), (600, 285))
-                display.blit(pygame.image.load(r"options/snipers.png").convert(), (600, 305))
-                display.blit(pygame.image.load(r"options/submachineguns.png").convert(), (600, 325))
-                display.blit(pygame.image.load(r"options/assaultrifles.png").convert(), (600, 345))
-                display.blit(pygame.image.load(r"options/lightmachineguns.png").convert(), (600, 365))
-                display.blit(pygame.image.load(r"options/launchers.png").convert(), (600, 385))
+                    dirty.blit(assets.get_image("options/refill_cant_afford"), (600, 245))
+                dirty.blit(assets.get_image("options/pistols"), (600, 265))
+                dirty.blit(assets.get_image("options/shotguns"), (600, 285))
+                dirty.blit(assets.get_image("options/snipers"), (600, 305))
+                dirty.blit(assets.get_image("options/submachineguns"), (600, 325))
+                dirty.blit(assets.get_image("options/assaultrifles"), (600, 345))
+                dirty.blit(assets.get_image("options/lightmachineguns"), (600, 365))
+                dirty.blit(assets.get_image("options/launchers"), (600, 385))
                 if player.money >= 1000:
-                    display.blit(pygame.image.load(r"options/grenade_refill.png").convert(), (600, 405))
+                    dirty.blit(assets.get_image("options/grenade_refill"), (600, 405))
                 else:
-                    display.blit(pygame.image.load(r"options/grenade_refill_cant_afford.png").convert(), (600, 405))
+                    dirty.blit(assets.get_image("options/grenade_refill_cant_afford"), (600, 405))
                 if player.money >= 3000:
-                    display.blit(pygame.image.load(r"options/c4.png").convert(), (600, 425))
+                    dirty.blit(assets.get_image("options/c4"), (600, 425))
                 else:
-                    display.blit(pygame.image.load(r"options/c4_cant_afford.png").convert(), (600, 425))
+                    dirty.blit(assets.get_image("options/c4_cant_afford"), (600, 425))
                 if player.money >= 2000:
-                    display.blit(pygame.image.load(r"options/armour.png").convert(), (600, 445))
+                    dirty.blit(assets.get_image("options/armour"), (600, 445))
                 else:
-                    display.blit(pygame.image.load(r"options/armour_cant_afford.png").convert(), (600, 445))
-                display.blit(pygame.image.load(r"options/back.png").convert(), (600, 465))
+                    dirty.blit(assets.get_image("options/armour_cant_afford"), (600, 445))
+                dirty.blit(assets.get_image("options/back"), (600, 465))
             if self.access_menu == "Pistols":
-                display.blit(pygame.image.load(r"options/pistols_title.png").convert(), (600, 195))
+                dirty.blit(assets.get_image("options/pistols_title"), (600, 195))
                 if player.money >= 250:
-                    display.blit(pygame.image.load(r"options/mauserc96.png").convert(), (600, 245))
-                    display.blit(pygame.image.load(r"options/colt.png").convert(), (600, 265))
+                    dirty.blit(assets.get_image("options/mauserc96"), (600, 245))
+                    dirty.blit(assets.get_image("options/colt"), (600, 265))
                 else:
-                    display.blit(pygame.image.load(r"options/mauserc96_cant_afford.png").convert(), (600, 245))
-                    display.blit(pygame.image.load(r"options/colt_cant_afford.png").convert(), (600, 265))
-                display.blit(pygame.image.load(r"options/back.png").convert(), (600, 285))
+                    dirty.blit(assets.get_image("options/mauserc96_cant_afford"), (600, 245))
+                    dirty.blit(assets.get_image("options/colt_cant_afford"), (600, 265))
+                dirty.blit(assets.get_image("options/back"), (600, 285))
             if self.access_menu == "Shotguns":
-                display.blit(pygame.image.load(r"options/shotguns_title.png").convert(), (600, 195))
+                dirty.blit(assets.get_image("options/shotguns_title"), (600, 195))
                 if player.money >= 2000:
-                    display.blit(pygame.image.load(r"options/ithaca37.png").convert(), (600, 245))
+                    dirty.blit(assets.get_image("options/ithaca37"), (600, 245))
                 else:
-                    display.blit(pygame.image.load(r"options/ithaca37_cant_afford.png").convert(), (600, 245))
-                display.blit(pygame.image.load(r"options/back.png").convert(), (600, 265))
+                    dirty.blit(assets.get_image("options/ithaca37_cant_afford"), (600, 245))
+                dirty.blit(assets.get_image("options/back"), (600, 265))
             if self.access_menu == "Snipers":
-                display.blit(pygame.image.load(r"options/snipers_title.png").convert(), (600, 195))
+                dirty.blit(assets.get_image("options/snipers_title"), (600, 195))
                 if player.money >= 2000:
-                    display.blit(pygame.image.load(r"options/springfield.png").convert(), (600, 245))
-                    display.blit(pygame.image.load(r"options/mosin_nagant.png").convert(), (600, 265))
+                    dirty.blit(assets.get_image("options/springfield"), (600, 245))
+                    dirty.blit(assets.get_image("options/mosin_nagant"), (600, 265))
                 else:
-                    display.blit(pygame.image.load(r"options/springfield_cant_afford.png").convert(), (600, 245))
-                    display.blit(pygame.image.load(r"options/mosin_nagant_cant_afford.png").convert(), (600, 265))
-                display.blit(pygame.image.load(r"options/back.png").convert(), (600, 285))
+                    dirty.blit(assets.get_image("options/springfield_cant_afford"), (600, 245))
+                    dirty.blit(assets.get_image("options/mosin_nagant_cant_afford"), (600, 265))
+                dirty.blit(assets.get_image("options/back"), (600, 285))
             if self.access_menu == "SMGs":
-                display.blit(pygame.image.load(r"options/submachineguns_title.png").convert(), (600, 195))
+                dirty.blit(assets.get_image("options/submachineguns_title"), (600, 195))
                 if player.money >= 2000:
-                    display.blit(pygame.image.load(r"options/m3.png").convert(), (600, 245))
-                    display.blit(pygame.image.load(r"options/type50.png").convert(), (600, 265))
+                    dirty.blit(assets.get_image("options/m3"), (600, 245))
+                    dirty.blit(assets.get_image("options/type50"), (600, 265))
                 else:
-                    display.blit(pygame.image.load(r"options/m3_cant_afford.png").convert(), (600, 245))
-                    display.blit(pygame.image.load(r"options/type50_cant_afford.png").convert(), (600, 265))
-                display.blit(pygame.image.load(r"options/back.png").convert(), (600, 285))
+                    dirty.blit(assets.get_image("options/m3_cant_afford"), (600, 245))
+                    dirty.blit(assets.get_image("options/type50_cant_afford"), (600, 265))
+                dirty.blit(assets.get_image("options/back"), (600, 285))
             if self.access_menu == "Assault Rifles":
-                display.blit(pygame.image.load(r"options/assaultrifles_title.png").convert(), (600, 195))
+                dirty.blit(assets.get_image("options/assaultrifles_title"), (600, 195))
                 if player.money >= 3000:
-                    display.blit(pygame.image.load(r"options/m1carbine.png").convert(), (600, 245))
-                    display.blit(pygame.image.load(r"options/sks.png").convert(), (600, 265))
+                    dirty.blit(assets.get_image("options/m1carbine"), (600, 245))
+                    dirty.blit(assets.get_image("options/sks"), (600, 265))
                 else:
-                    display.blit(pygame.image.load(r"options/m1carbine_cant_afford.png").convert(), (600, 245))
-                    display.blit(pygame.image.load(r"options/sks_cant_afford.png").convert(), (600, 265))
-                display.blit(pygame.image.load(r"options/back.png").convert(), (600, 285))
+                    dirty.blit(assets.get_image("options/m1carbine_cant_afford"), (600, 245))
+                    dirty.blit(assets.get_image("options/sks_cant_afford"), (600, 265))
+                dirty.blit(assets.get_image("options/back"), (600, 285))
             if self.access_menu == "LMGs":
-                display.blit(pygame.image.load(r"options/lightmachineguns_title.png").convert(), (600, 195))
+                dirty.blit(assets.get_image("options/lightmachineguns_title"), (600, 195))
                 if player.money >= 7000:
-                    display.blit(pygame.image.load(r"options/bren.png").convert(), (600, 245))
-                    display.blit(pygame.image.load(r"options/dp27.png").convert(), (600, 265))
+                    dirty.blit(assets.get_image("options/bren"), (600, 245))
+                    dirty.blit(assets.get_image("options/dp27"), (600, 265))
                 else:
-                    display.blit(pygame.image.load(r"options/bren_cant_afford.png").convert(), (600, 245))
-                    display.blit(pygame.image.load(r"options/dp27_cant_afford.png").convert(), (600, 265))
-                display.blit(pygame.image.load(r"options/back.png").convert(), (600, 285))
+                    dirty.blit(assets.get_image("options/bren_cant_afford"), (600, 245))
+                    dirty.blit(assets.get_image("options/dp27_cant_afford"), (600, 265))
+                dirty.blit(assets.get_image("options/back"), (600, 285))
             if self.access_menu == "Launchers":
-                display.blit(pygame.image.load(r"options/launchers_title.png").convert(), (600, 195))
+                dirty.blit(assets.get_image("options/launchers_title"), (600, 195))
                 if player.money >= 7000:
-                    display.blit(pygame.image.load(r"options/bazooka.png").convert(), (600, 245))
-                    display.blit(pygame.image.load(r"options/rpg7.png").convert(), (600, 265))
+                    dirty.blit(assets.get_image("options/bazooka"), (600, 245))
+                    dirty.blit(assets.get_image("options/rpg7"), (600, 265))
                 else:
-                    display.blit(pygame.image.load(r"options/bazooka_cant_afford.png").convert(), (600, 245))
-                    display.blit(pygame.image.load(r"options/rpg7_cant_afford.png").convert(), (600, 265))
-                display.blit(pygame.image.load(r"options/back.png").convert(), (600, 285))
+                    dirty.blit(assets.get_image("options/bazooka_cant_afford"), (600, 245))
+                    dirty.blit(assets.get_image("options/rpg7_cant_afford"), (600, 265))
+                dirty.blit(assets.get_image("options/back"), (600, 285))
 
     def access(self):
         """ (WeaponArmoury) -> None
@@ -1511,28 +1221,28 @@ def show_campaign_hud():
         mechanics. I also got rid of campaign mode, so I don't really have a need for this function anymore.
     """
     current_weapon = bigger_hud_font.render(player.primary_weapon.name, True, (0, 0, 0))
-    display.blit(current_weapon, (10, 950))
+    dirty.blit(current_weapon, (10, 950))
 
     secondary_weapon = hud_font.render(player.secondary_weapon.name, True, (0, 0, 0))
-    display.blit(secondary_weapon, (10, 1000))
+    dirty.blit(secondary_weapon, (10, 1000))
 
     magazine_ammo = hud_font.render(
         (str(player.primary_weapon.magazine_ammo) + " | " + str(player.primary_weapon.reserve_ammo)), True, (0, 0, 0))
-    display.blit(magazine_ammo, (10, 925))
+    dirty.blit(magazine_ammo, (10, 925))
 
     health = hud_font.render(("Health: " + str(player.health)), True, (0, 0, 0))
-    display.blit(health, (1775, 1050))
+    dirty.blit(health, (1775, 1050))
 
     grenades = hud_font.render("Grenades: " + str(player.grenades), True, (0, 0, 0))
-    display.blit(grenades, (1775, 1000))
+    dirty.blit(grenades, (1775, 1000))
 
     c4 = hud_font.render("C4: " + str(player.c4_inventory), True, (0, 0, 0))
-    display.blit(c4, (1775, 975))
+    dirty.blit(c4, (1775, 975))
 
     if player.primary_weapon.reloading:
         reloading_text = hud_font.render(
             "Reloading . . . " + str(round(player.primary_weapon.frames_remaining / 60, 1)), True, BLACK)
-        display.blit(reloading_text, (80, 925))
+        dirty.blit(reloading_text, (80, 925))
 
 
 def show_survival_hud(wave, live_enemies):
@@ -1540,40 +1250,234 @@ def show_survival_hud(wave, live_enemies):
     Shows the HUD for the player in Survival mode
     """
     current_weapon = bigger_hud_font.render(player.primary_weapon.name, True, (0, 0, 0))
-    display.blit(current_weapon, (10, 950))
+    dirty.blit(current_weapon, (10, 950))
 
     secondary_weapon = hud_font.render(player.secondary_weapon.name, True, (0, 0, 0))
-    display.blit(secondary_weapon, (10, 1000))
+    dirty.blit(secondary_weapon, (10, 1000))
 
     magazine_ammo = hud_font.render(
         (str(player.primary_weapon.magazine_ammo) + " | " + str(player.primary_weapon.reserve_ammo)), True, (0, 0, 0))
-    display.blit(magazine_ammo, (10, 925))
+    dirty.blit(magazine_ammo, (10, 925))
 
     wave_text = hud_font.render(("Wave: " + str(wave)), True, (0, 0, 0))
-    display.blit(wave_text, (10, 10))
+    dirty.blit(wave_text, (10, 10))
 
     health = hud_font.render(("Health: " + str(player.health)), True, (0, 0, 0))
-    display.blit(health, (1775, 1050))
+    dirty.blit(health, (1775, 1050))
 
     armour = hud_font.render(("Body Armour: " + str(player.armour)), True, (0, 0, 0))
-    display.blit(armour, (1775, 1025))
+    dirty.blit(armour, (1775, 1025))
 
     money = hud_font.render(("Money: $" + str(player.money)), True, (0, 0, 0))
-    display.blit(money, (10, 900))
+    dirty.blit(money, (10, 900))
 
     enemies_left = hud_font.render(("Enemies Left: " + str(len(live_enemies))), True, (0, 0, 0))
-    display.blit(enemies_left, (10, 25))
+    dirty.blit(enemies_left, (10, 25))
 
     grenades = hud_font.render("Grenades: " + str(player.grenades), True, (0, 0, 0))
-    display.blit(grenades, (1775, 1000))
+    dirty.blit(grenades, (1775, 1000))
 
     c4 = hud_font.render("C4: " + str(player.c4_inventory), True, (0, 0, 0))
-    display.blit(c4, (1775, 975))
+    dirty.blit(c4, (1775, 975))
 
     if player.primary_weapon.reloading:
         reloading_text = hud_font.render(
             "Reloading . . . " + str(round(player.primary_weapon.frames_remaining / 60, 1)), True, BLACK)
-        display.blit(reloading_text, (80, 925))
+        dirty.blit(reloading_text, (80, 925))
+
+
+def show_profiler(objects, live_enemies):
+    """ (List, List) -> None
+    Shows how long each part of game_engine has been taking, in milliseconds, how many things are in the game, and how
+    many were drawn or skipped for being off screen
+    """
+    x = 1540
+    y = 10
+    columns = (("", 0), ("mean", 130), ("p95", 200), ("max", 270))
+    for title, offset in columns:
+        dirty.blit(small_hud_font.render(title, True, BLACK, WHITE), (x + offset, y))
+    y += 14
+
+    for phase, times in profiler.stats().items():
+        for text, offset in ((phase, 0), ("{:.2f}".format(times["mean"]), 130), ("{:.2f}".format(times["p95"]), 200),
+                             ("{:.2f}".format(times["max"]), 270)):
+            dirty.blit(small_hud_font.render(text, True, BLACK, WHITE), (x + offset, y))
+        y += 14
+
+    counts = (("Enemies", len(live_enemies)), ("Player bullets", len(player_bullets)),
+              ("Enemy bullets", len(enemy_bullets)), ("Grenades", len(grenades)), ("C4", len(list_of_c4)),
+              ("Objects", len(objects)), ("Drawn last frame", culler.last_drawn),
+              ("Skipped off screen", culler.last_culled))
+    y += 6
+    for name, count in counts:
+        dirty.blit(small_hud_font.render(name + ": " + str(count), True, BLACK, WHITE), (x, y))
+        y += 14
+
+
+def build_terrain(objects):
+    """ (List) -> None
+        Pre-draws all the scenery in objects onto the terrain layers. Solid objects go on the ground layer, and objects
+        that can be walked through go on the canopy layer, which is drawn on top of everything else. Solid objects are
+        also put in the obstacle hash, which is what everything checks for collisions against. Bodies from the last
+        game are cleared away too, and so are the paths worked out around the last game's rocks.
+    """
+    ground_layer.clear()
+    canopy_layer.clear()
+    obstacles.clear()
+    obstacle_grid.clear()
+    corpses.clear()
+    paths.reset()
+    tank_paths.reset()
+
+    for object in objects:
+        if not object.pass_through:
+            obstacles.add(object)
+            obstacle_grid.add(object)
+
+        if object.static:
+            if object.pass_through:
+                canopy_layer.add(object)
+            else:
+                ground_layer.add(object)
+
+
+def bury(image, x, y):
+    """ (pygame.Surface, int, int) -> Decal
+        Leaves image lying on the ground at (x, y) in the game world for good, like a body. It is drawn onto the ground
+        layer, so it doesn't cost anything to draw after this. Returns the decal, in case it has to be removed later.
+    """
+    decal = terrain.Decal(image, x, y)
+    ground_layer.add(decal)
+
+    # The ground was already drawn this frame, so draw it by hand once. It is part of the ground from next frame on
+    screen_x, screen_y = camera.to_screen(x, y)
+    if culler.visible(screen_x, screen_y, decal.width, decal.height):
+        dirty.blit(image, (screen_x, screen_y))
+
+    return decal
+
+
+def move_ground_enemies():
+    """ (None) -> None
+        Moves every live American, Sniper, Grenadier and Tank towards the spot near the player they are heading for,
+        all at once. Each one moves one pixel for every frame it does this frame (see ai_lod). If something solid is in
+        the way, the enemy follows the flow field towards the player instead, which takes it around the object, or
+        slides along the object if it is out of the field. If that is blocked too, it is stuck in a corner, so it asks
+        thinker for a new spot and walks off to one side for a while first. Drawing is left to each enemy's main.
+    """
+    walkers = [enemy for enemy in enemies if enemy.ticks > 0 and (enemy.type == "Tank" or
+                                                                  (enemy.type == "Human" and enemy.health > 0))]
+    if not walkers:
+        return
+
+    x = numpy.array([enemy.x for enemy in walkers])
+    y = numpy.array([enemy.y for enemy in walkers])
+    offset_x = numpy.array([enemy.offset_x for enemy in walkers])
+    offset_y = numpy.array([enemy.offset_y for enemy in walkers])
+    reset_offset = numpy.array([enemy.reset_offset for enemy in walkers])
+    width, height = numpy.array([enemy.walk_size for enemy in walkers]).T
+    ticks = numpy.array([enemy.ticks for enemy in walkers])
+    escape_time = numpy.array([enemy.escape_time for enemy in walkers])
+    escape_x = numpy.array([enemy.escape_x for enemy in walkers])
+    escape_y = numpy.array([enemy.escape_y for enemy in walkers])
+
+    # Count down until it is time for each enemy to pick a new spot. The countdown stops at 0 until thinker gets to it
+    due = reset_offset < ticks
+    reset_offset = numpy.where(due, 0, reset_offset - ticks)
+
+    # Enemies getting unstuck head off to the side instead of to their spot
+    escaping = escape_time > 0
+    escape_time = numpy.maximum(escape_time - ticks, 0)
+    goal_x = numpy.where(escaping, x + escape_x * ticks, player.x + offset_x)
+    goal_y = numpy.where(escaping, y + escape_y * ticks, player.y + offset_y)
+
+    new_x, new_y, walking, blocked = movement.step(x, y, goal_x, goal_y, ticks, width, height, obstacle_grid)
+    if blocked.any():
+        field_x, field_y, known = paths.directions(x, y)
+        tanks = numpy.array([enemy.type == "Tank" for enemy in walkers])
+        if tanks.any():
+            tank_x, tank_y, tank_known = tank_paths.directions(x, y)
+            field_x, field_y, known = (numpy.where(tanks, tank_x, field_x), numpy.where(tanks, tank_y, field_y),
+                                       numpy.where(tanks, tank_known, known))
+
+        field_x, field_y = field_x * ticks, field_y * ticks
+        detour = blocked & known & ~obstacle_grid.collides(x + field_x, y + field_y, width, height)
+        new_x = numpy.where(detour, x + field_x, new_x)
+        new_y = numpy.where(detour, y + field_y, new_y)
+        blocked &= ~detour
+
+    if blocked.any():
+        # Too far away for the flow field, so just slide along whatever is in the way
+        step_x = numpy.minimum(numpy.maximum(goal_x - x, -ticks), ticks)
+        step_y = numpy.minimum(numpy.maximum(goal_y - y, -ticks), ticks)
+        slide_x, slide_y, stuck = movement.slide(x, y, step_x, step_y, width, height, obstacle_grid)
+        new_x = numpy.where(blocked, slide_x, new_x)
+        new_y = numpy.where(blocked, slide_y, new_y)
+        blocked &= stuck
+    flipped = ~blocked & (new_x > player.x)
+
+    for i, enemy in enumerate(walkers):
+        enemy.x = int(new_x[i])
+        enemy.y = int(new_y[i])
+        enemy.reset_offset = int(reset_offset[i])
+        enemy.walking = bool(walking[i])
+        enemy.flipped = bool(flipped[i])
+        enemy.escape_time = int(escape_time[i])
+        if blocked[i]:
+            # Walk away from the corner along one side of it, turning back on the other axis each time
+            direction = (int(numpy.sign(goal_x[i] - x[i])), int(numpy.sign(goal_y[i] - y[i])))
+            enemy.escapes += 1
+            if enemy.escapes % 2:
+                enemy.escape_x, enemy.escape_y = -direction[0], direction[1]
+            else:
+                enemy.escape_x, enemy.escape_y = direction[0], -direction[1]
+            enemy.escape_time = ESCAPE_TIME
+        if due[i] or blocked[i]:
+            thinker.schedule((enemy, "target"), enemy.new_target)
+
+
+def resolve_explosions():
+    """ (None) -> None
+        Does the damage for every explosion that went off this frame, once each. Enemies inside an explosion's death
+        radius are killed, and the ones in its damage radius lose 95 health. Only the enemies near the explosion are
+        looked at, using targets. Enemy explosions don't hurt other enemies, but every explosion can hurt the player.
+    """
+    for death_radius, damage_radius, mode in explosions:
+        if mode != "Enemy":
+            for enemy in targets.query(damage_radius):
+                if enemy.health <= 0:
+                    continue  # Already killed by something else this frame
+
+                if death_radius.colliderect(enemy.hitbox):
+                    enemy.health = 0
+                else:
+                    enemy.health -= 95
+                player.hitmarker_chain = FPS
+
+                if enemy.health <= 0 and not enemy.dead:
+                    try:  # Will result in error for dogs
+                        if enemy.primary_weapon == ithaca37:  # Different weapons mean harder enemies, so the player
+                            player.money += 100  # gets more money
+                        elif enemy.primary_weapon == m3:
+                            player.money += 125
+                        elif enemy.primary_weapon == springfield:
+                            player.money += 150
+                        elif enemy.primary_weapon == bazooka:
+                            player.money += 200
+                        elif enemy.primary_weapon == m1carbine:
+                            player.money += 275
+                        elif enemy.primary_weapon == tank_turret:
+                            player.money += 500
+                    except AttributeError:
+                        player.money += 150
+                    player.kills += 1
+
+        if death_radius.colliderect(player.hitbox):
+            player.health = 0
+        elif damage_radius.colliderect(player.hitbox):
+            player.health -= 95
+
+    explosions.clear()
 
 
 def random_game_area(player_hitbox):
@@ -1582,8 +1486,8 @@ def random_game_area(player_hitbox):
         don't generate on top of the player
     """
     while True:
-        seed = randint(-1920, 1920 * 2), randint(-1020, 1020 * 2)
-        generated_rect = pygame.Rect(seed[0] - display_scroll[0] - 100, seed[1] - display_scroll[1] - 100, 200, 200)
+        seed = randomness.terrain.randint(-1920, 1920 * 2), randomness.terrain.randint(-1020, 1020 * 2)
+        generated_rect = pygame.Rect(seed[0] - 100, seed[1] - 100, 200, 200)
         if pygame.Rect.colliderect(generated_rect, player_hitbox):
             continue
         else:
@@ -1593,7 +1497,7 @@ def random_game_area(player_hitbox):
 
 
 # Create all the pre-determined objects on screen
-display_scroll = [100, 100]  # This determines the offset of everything onscreen so the player looks like they're moving
+camera = render.Camera()  # Follows the player around the game world, so the player looks like they're moving
 weapon_armory = WeaponArmoury((500, 40), "objects/weaponarmory.png", (71, 112, 76), 100, 88, False)
 weapon_armory_icon = Object((510, 25), "weapons/sks.png", (71, 112, 76), 64, 11, True)
 survival_sam_launcher = Object((400, 500), "objects/sam.png", (71, 112, 76), 150, 99, False)
@@ -1601,34 +1505,60 @@ boot_camp_npc = Object((800, 500), r"animations\player\player_walk_0.png", WHITE
 
 player_bullets = []  # List of projectiles shot by the player
 enemy_bullets = []  # List of projectiles shot by the enemies
+projectile_pool = projectiles.ProjectilePool()  # Where every bullet, rocket and grenade keeps its position and speed
 
 grenades = []  # List of grenades thrown by the player
-player = Player(720, 450, 32, 32, mauserc96, m1911)  # Create the player object
+player = Player(*PLAYER_START, 32, 32, mauserc96, m1911)  # Create the player object
+player.move_to(*PLAYER_START)
 objects = []
 list_of_c4 = []
+explosions = []  # (death radius, damage radius, who set it off) for every explosion this frame, see resolve_explosions
+
+ground_layer = terrain.TerrainLayer(GREEN)  # The grass and everything solid lying on it
+canopy_layer = terrain.TerrainLayer()  # Trees, which are drawn over the characters
+obstacles = spatial.SpatialHash()  # Every solid object, so collisions only have to check the ones nearby
+obstacle_grid = spatial.ObstacleGrid()  # The same solid objects, for checking lots of enemies against them at once
+paths = navigation.FlowField(obstacle_grid, 39, 42)  # Which way Americans and dogs should go to reach the player
+tank_paths = navigation.FlowField(obstacle_grid, 200, 104)  # Same for tanks, which need wider gaps
+targets = spatial.SpatialHash()  # Every live enemy, sorted again each frame after they move
+corpses = spatial.SpatialHash()  # Every dead American, so the player can pick up the gun lying next to them
 
 paused = False
 
 
-def game_engine(objects, game_mode, wave, message=None):
-    """ (List, str, int, str) -> str
+def game_engine(objects, game_mode, wave, message=None, draw=True):
+    """ (List, str, int, str, bool) -> str
         This function is executed every frame. All the game's mechanics happen here. A string is returned that says
-        the status of what happened during that frame.
+        the status of what happened during that frame. If draw is False, the frame is run without drawing anything,
+        to catch up when the game is running behind.
     """
     # 1. Global variables needed
     global enemies
     global paused
 
-    # 2. Background of screen
-    display.fill(GREEN)
+    culler.new_frame(draw)
+    profiler.start_frame()
 
-    # 3. Check for events
-    mouse_x, mouse_y = pygame.mouse.get_pos()
-    for event in pygame.event.get():
+    # 2. Background of screen. The ground layer (grass, with the solid scenery already drawn on it) is drawn after the
+    # player moves, so that it lines up with everything else drawn this frame. If the player didn't move, only the
+    # places where something was drawn last frame are erased, instead of the whole screen
+
+    # 3. Check for events. Events are read first, since that is when recorded or scripted input moves on to this frame
+    events = player_input.events()
+    mouse_x, mouse_y = player_input.mouse_position()
+    aim_x, aim_y = camera.to_world(mouse_x, mouse_y)  # Where the mouse is pointing in the game world
+    for event in events:
         # 3.1. Exit game
         if event.type == pygame.QUIT:
             exit()
             pygame.quit()
+        if event.type == pygame.VIDEOEXPOSE:  # The window was covered up, so all of it has to be sent to the screen
+            dirty.full_update()
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:  # Show or hide the times of each part of a frame
+            profiler.shown = not profiler.shown
+            profiler.enabled = profiler.shown
+            profiler.reset()
+            dirty.full_update()
         # 3.2 Shoot
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:
@@ -1639,13 +1569,13 @@ def game_engine(objects, game_mode, wave, message=None):
                         if (player.primary_weapon.name == "M20 Super Bazooka") or (
                                 "RPG-7" in player.primary_weapon.name):  # Fire a rocket instead
                             player_bullets.append(
-                                Rocket(player.x, player.y + 22, mouse_x, mouse_y, player.primary_weapon,
+                                Rocket(player.x, player.y + 22, aim_x, aim_y, player.primary_weapon,
                                        player.primary_weapon.damage))
                             if sound_fx:
                                 pygame.mixer.Channel(3).play(rocket_launch)
                         else:  # Otherwise, shoot a regular bullet
                             player_bullets.append(
-                                Bullet(player.x, player.y + 22, mouse_x, mouse_y, player.primary_weapon,
+                                Bullet(player.x, player.y + 22, aim_x, aim_y, player.primary_weapon,
                                        player.primary_weapon.damage))
                             if sound_fx:
                                 pygame.mixer.Channel(0).play(gunfire)
@@ -1844,7 +1774,7 @@ def game_engine(objects, game_mode, wave, message=None):
                 weapon_armory.accessing_weapon_armory = False
 
         if event.type == pygame.KEYDOWN:  # Check for key presses. These keys are for those that are only meant to be
-            key = pygame.key.get_pressed()  # pressed once, as otherwise, the game thinks you are holding these keys
+            key = player_input.keys()  # pressed once, as otherwise, the game thinks you are holding these keys
 
             # Leave the menu
             if key[pygame.K_ESCAPE] and game_mode == "Survival" and weapon_armory.accessing_weapon_armory:
@@ -1870,7 +1800,7 @@ def game_engine(objects, game_mode, wave, message=None):
             if key[pygame.K_n]:
                 if player.c4_inventory > 0:
                     if player.c4_cooldown == 0:
-                        list_of_c4.append(C4(player.x + display_scroll[0], player.y + display_scroll[1]))
+                        list_of_c4.append(C4(player.x, player.y))
                         player.c4_inventory -= 1
 
                         player.c4_cooldown = FPS * 2
@@ -1881,20 +1811,9 @@ def game_engine(objects, game_mode, wave, message=None):
                     explosive.explode()
 
             # If the player can swap weapons with a dead enemy
-            for enemy in enemies:
-                if enemy.dead:
-                    try:
-                        if enemy.x - display_scroll[0] - 50 <= player.x <= enemy.x - display_scroll[
-                            0] + 50 and enemy.y - display_scroll[1] - 50 <= player.y <= enemy.y - display_scroll[
-                            1] + 50:
-                            if key[pygame.K_f]:
-                                player_current_weapon = player.primary_weapon
-                                enemy_current_weapon = enemy.primary_weapon
-
-                                player.primary_weapon = enemy_current_weapon
-                                enemy.primary_weapon = player_current_weapon
-                    except AttributeError:
-                        pass  # If  the player walks over a dead attack dog
+            if key[pygame.K_f]:
+                for corpse in corpses.query_point(player.x, player.y):
+                    corpse.swap_weapon()
 
             # Pause game
             if key[pygame.K_h]:
@@ -1903,83 +1822,61 @@ def game_engine(objects, game_mode, wave, message=None):
                 else:
                     paused = True
 
+    profiler.mark("events")
     if not paused:
         # 4. Movement
-        key = pygame.key.get_pressed()
+        key = player_input.keys()
         can_move_left = True
         can_move_right = True
         can_move_up = True
         can_move_down = True
         if key[pygame.K_a]:
-            for object in objects:
-                player_would_be_hitbox = pygame.Rect(player.x - 5, player.y, 27, 42)
-                if not object.pass_through:
-                    if pygame.Rect.colliderect(object.hitbox, player_would_be_hitbox):
-                        can_move_left = False
-                        break
+            player_would_be_hitbox = pygame.Rect(player.x - 5, player.y, 27, 42)
+            if obstacles.collides(player_would_be_hitbox):
+                can_move_left = False
         if key[pygame.K_d]:
-            for object in objects:
-                player_would_be_hitbox = pygame.Rect(player.x + 5, player.y, 27, 42)
-                if not object.pass_through:
-                    if pygame.Rect.colliderect(object.hitbox, player_would_be_hitbox):
-                        can_move_right = False
-                        break
+            player_would_be_hitbox = pygame.Rect(player.x + 5, player.y, 27, 42)
+            if obstacles.collides(player_would_be_hitbox):
+                can_move_right = False
         if key[pygame.K_w]:
-            for object in objects:
-                player_would_be_hitbox = pygame.Rect(player.x, player.y - 5, 27, 42)
-                if not object.pass_through:
-                    if pygame.Rect.colliderect(object.hitbox, player_would_be_hitbox):
-                        can_move_up = False
-                        break
+            player_would_be_hitbox = pygame.Rect(player.x, player.y - 5, 27, 42)
+            if obstacles.collides(player_would_be_hitbox):
+                can_move_up = False
         if key[pygame.K_s]:
-            for object in objects:
-                player_would_be_hitbox = pygame.Rect(player.x, player.y + 5, 27, 42)
-                if not object.pass_through:
-                    if pygame.Rect.colliderect(object.hitbox, player_would_be_hitbox):
-                        can_move_down = False
-                        break
+            player_would_be_hitbox = pygame.Rect(player.x, player.y + 5, 27, 42)
+            if obstacles.collides(player_would_be_hitbox):
+                can_move_down = False
 
+        # Only the player moves. Everything else is already in world coordinates, so the camera just follows the player
         if key[pygame.K_a] and can_move_left:
-            display_scroll[0] -= 5
+            player.x -= 5
             player.moving_right = False
             player.moving_left = True
-            for bullet in player_bullets:
-                bullet.x += 5
-            for grenade in grenades:
-                grenade.x += 5
-            for bullet in enemy_bullets:
-                bullet.x += 5
 
         if key[pygame.K_d] and can_move_right:
-            display_scroll[0] += 5
+            player.x += 5
             player.moving_left = False
             player.moving_right = True
-            for bullet in player_bullets:
-                bullet.x -= 5
-            for grenade in grenades:
-                grenade.x -= 5
-            for bullet in enemy_bullets:
-                bullet.x -= 5
         if key[pygame.K_w] and can_move_up:
-            display_scroll[1] -= 5
-            for bullet in player_bullets:
-                bullet.y += 5
-            for grenade in grenades:
-                grenade.y += 5
-            for bullet in enemy_bullets:
-                bullet.y += 5
+            player.y -= 5
 
         if key[pygame.K_s] and can_move_down:
-            display_scroll[1] += 5
-            for bullet in player_bullets:
-                bullet.y -= 5
-            for grenade in grenades:
-                grenade.y -= 5
-            for bullet in enemy_bullets:
-                bullet.y -= 5
+            player.y += 5
+
+        camera.look_at(player.x, player.y, *PLAYER_SCREEN_POSITION)
+        profiler.mark("movement")
+
+        dirty.begin_frame(camera, draw)
+        if draw:
+            if dirty.full:
+                ground_layer.draw(display, camera)
+            else:
+                for rect in dirty.previous:
+                    ground_layer.draw(display, camera, rect)
+        profiler.mark("drawing")
 
         # 5. Shooting automatic weapons
-        if pygame.mouse.get_pressed()[0]:
+        if player_input.mouse_buttons()[0]:
             if not player.primary_weapon.reloading:
                 if player.primary_weapon.fire_mode == "automatic":
                     player.primary_weapon.fire_delay_ticker -= 1
@@ -1990,23 +1887,17 @@ def game_engine(objects, game_mode, wave, message=None):
                             pass
                         else:
                             player_bullets.append(
-                                Bullet(player.x, player.y + 22, mouse_x, mouse_y, player.primary_weapon,
+                                Bullet(player.x, player.y + 22, aim_x, aim_y, player.primary_weapon,
                                        player.primary_weapon.damage))
                             if sound_fx:
                                 pygame.mixer.Channel(0).play(gunfire)
                             player.primary_weapon.magazine_ammo -= 1
+        profiler.mark("automatic fire")
 
         # 6. Display text for weapon swapping
-        for enemy in enemies:
-            if enemy.dead:
-                try:
-                    if enemy.x - display_scroll[0] - 50 <= player.x <= enemy.x - display_scroll[0] + 50 and enemy.y - \
-                            display_scroll[1] - 50 <= player.y <= enemy.y - display_scroll[1] + 50:
-                        swap_weapon = hud_font.render("Press F to swap for " + enemy.primary_weapon.name, True,
-                                                      (0, 0, 0))
-                        display.blit(swap_weapon, (720, 495))
-                except AttributeError:
-                    pass  # If  the player walks over a dead attack dog
+        for corpse in corpses.query_point(player.x, player.y):
+            swap_weapon = hud_font.render("Press F to swap for " + corpse.primary_weapon.name, True, (0, 0, 0))
+            dirty.blit(swap_weapon, (720, 495))
 
         # 7. Call the main function for all the objects
 
@@ -2020,12 +1911,40 @@ def game_engine(objects, game_mode, wave, message=None):
         else:
             player.main()
 
-        for object in objects:
+        for object in objects if draw else ():  # Objects only draw themselves, so they are skipped when nothing is drawn
             if not object.pass_through:
                 object.main()
+        profiler.mark("objects")
+
+        # Far away enemies only take a turn every few frames, so work out whose turn it is
+        ai_lod.new_frame(camera)
+        for enemy in enemies:
+            enemy.ticks = ai_lod.ticks(enemy.hitbox, enemy.lod_phase)
+
+        # Point the flow fields at where the player is now. They are only worked out again once the player has moved
+        # a few cells, and only if an enemy needs them
+        paths.update(player.x, player.y)
+        tank_paths.update(player.x, player.y)
+        move_ground_enemies()
         for enemy in enemies:
             enemy.main()
+        profiler.mark("enemies")
+
+        # Work out the paths that enemies asked for, and do the rest of their thinking, as far as this frame's budget
+        # goes
+        for field in (paths, tank_paths):
+            if field.wanted:
+                thinker.schedule((field, "solve"), field.solve, scheduling.THINK_BUDGET)
+        thinker.run()
+        profiler.mark("thinking")
+
+        # Sort the live enemies into cells by where they are now, so each bullet only has to check the enemies near it
+        targets.clear()
+        for enemy in enemies:
+            if not enemy.dead:
+                targets.add(enemy)
 
+        projectile_pool.update()  # Move every bullet and rocket at once, then draw them one by one
         for bullet in player_bullets:
             bullet.main()
 
@@ -2034,163 +1953,148 @@ def game_engine(objects, game_mode, wave, message=None):
 
         for grenade in grenades:
             grenade.main()
+        profiler.mark("bullets")
 
         if game_mode == "Survival":
             weapon_armory.main()
+        profiler.mark("armory")
 
         #  Hit detection for bullets
+        # First rule out, all at once, every bullet that didn't come near any enemy or the player this frame. Only the
+        # ones left have to be checked one at a time
+        live_hitboxes = [enemy.hitbox for enemy in enemies if not enemy.dead]
+        enemy_area = live_hitboxes[0].unionall(live_hitboxes) if live_hitboxes else (0, 0, 0, 0)
+        near_enemies = projectile_pool.touching(enemy_area)
+        near_player = projectile_pool.touching(player.hitbox)
+
         for bullet in player_bullets:
             if bullet.range < 0:  # If the bullet's range has been reached:
                 if bullet.type != "Rocket":
-                    player_bullets.remove(bullet)
+                    bullet.removed = True
                 else:
                     if bullet.exploding_timer < 1:
-                        player_bullets.remove(bullet)
+                        bullet.removed = True
                     else:
                         bullet.explode("Normal")
 
             else:
                 if bullet.type == "Bullet":
-                    for enemy in enemies:
-                        if not enemy.dead:
-                            if pygame.Rect.colliderect(
-                                    pygame.Rect(enemy.hitbox[0], enemy.hitbox[1], enemy.hitbox[2], enemy.hitbox[3]),
-                                    bullet.hitbox):
-                                try:
-                                    player_bullets.remove(bullet)
-                                except ValueError:  # For some reason this causes errors, so I included a try statement
-                                    pass
-                                enemy.health -= bullet.damage
-                                if enemy.health <= 0:
-                                    try:  # Will result in error for dogs
-                                        if enemy.primary_weapon == ithaca37:
-                                            player.money += 100
-                                        elif enemy.primary_weapon == m3:
-                                            player.money += 125
-                                        elif enemy.primary_weapon == springfield:
-                                            player.money += 150
-                                        elif enemy.primary_weapon == bazooka:
-                                            player.money += 200
-                                        elif enemy.primary_weapon == m1carbine:
-                                            player.money += 275
-                                        elif enemy.primary_weapon == tank_turret:
-                                            player.money += 500
-                                    except AttributeError:
-                                        player.money += 150
-                                    player.kills += 1
-                                    player.hitmarker_chain = FPS
-                                else:
-                                    player.hitmarker_chain = FPS
-                                    if sound_fx:
-                                        pygame.mixer.Channel(2).play(hitmarker_sound)
-
-                    for object in objects:
-                        if not object.pass_through:
-                            if object.hitbox[0] - display_scroll[0] <= bullet.x - display_scroll[0] <= object.hitbox[
-                                0] + \
-                                    object.hitbox[2] - display_scroll[0] and object.hitbox[1] - display_scroll[
-                                1] <= bullet.y - \
-                                    display_scroll[1] <= object.hitbox[1] + object.hitbox[3] - display_scroll[1]:
-                                try:
-                                    player_bullets.remove(bullet)
-                                except ValueError:  # For some reason this causes errors, so I included a try statement
-                                    pass
+                    # The bullet hits the first live enemy along its path, unless a solid object is in the way first
+                    blocked_at = bullet.distance_to_obstacle()
+                    target = None
+                    target_at = None
+                    for enemy in targets.query(bullet.path()) if near_enemies[bullet.slot] else ():
+                        if not enemy.dead:  # Only the enemies near the bullet
+                            distance = bullet.distance_to(enemy.hitbox, 8)
+                            if distance is not None and (target_at is None or distance < target_at) and (
+                                    blocked_at is None or distance <= blocked_at):
+                                target = enemy
+                                target_at = distance
+
+                    if target is not None:
+                        bullet.removed = True
+                        target.health -= bullet.damage
+                        if target.health <= 0:
+                            try:  # Will result in error for dogs
+                                if target.primary_weapon == ithaca37:
+                                    player.money += 100
+                                elif target.primary_weapon == m3:
+                                    player.money += 125
+                                elif target.primary_weapon == springfield:
+                                    player.money += 150
+                                elif target.primary_weapon == bazooka:
+                                    player.money += 200
+                                elif target.primary_weapon == m1carbine:
+                                    player.money += 275
+                                elif target.primary_weapon == tank_turret:
+                                    player.money += 500
+                            except AttributeError:
+                                player.money += 150
+                            player.kills += 1
+                            player.hitmarker_chain = FPS
+                        else:
+                            player.hitmarker_chain = FPS
+                            if sound_fx:
+                                pygame.mixer.Channel(2).play(hitmarker_sound)
+
+                    if blocked_at is not None:
+                        bullet.removed = True
                 elif bullet.type == "Rocket":
-                    for enemy in enemies:
+                    for enemy in targets.query(bullet.hitbox):  # Only the enemies near the bullet
                         if not enemy.dead:
-                            if pygame.Rect.colliderect(
-                                    pygame.Rect(enemy.hitbox[0], enemy.hitbox[1], enemy.hitbox[2], enemy.hitbox[3]),
-                                    bullet.hitbox):
-                                enemy.health -= bullet.damage
-                                try:
-                                    bullet.explode("Normal")
-                                except ValueError:  # For some reason this causes errors, so I included a try statement
-                                    pass
-                    for object in objects:
-                        if object.pass_through == False:
-                            if object.hitbox[0] - display_scroll[0] <= bullet.x - display_scroll[0] <= object.hitbox[
-                                0] + \
-                                    object.hitbox[2] - display_scroll[0] and object.hitbox[1] - display_scroll[
-                                1] <= bullet.y - \
-                                    display_scroll[1] <= object.hitbox[1] + object.hitbox[3] - display_scroll[1]:
-                                try:
-                                    bullet.explode("Normal")
-                                except ValueError:  # For some reason this causes errors, so I included a try statement
-                                    pass
+                            enemy.health -= bullet.damage
+                            bullet.explode("Normal")
+                    for object in obstacles.query_point(bullet.x, bullet.y):
+                        bullet.explode("Normal")
 
         for bullet in enemy_bullets:
             if bullet.range < 0:  # If the bullet's range has been reached:
                 if bullet.type != "Rocket":
-                    enemy_bullets.remove(bullet)
+                    bullet.removed = True
                 if bullet.type == "Rocket":
                     if bullet.exploding_timer < 1:
-                        enemy_bullets.remove(bullet)
+                        bullet.removed = True
                     else:
                         bullet.explode("Enemy")
+            if bullet.removed:
+                continue  # Bullets that already hit something or ran out of range can't hit anything else
             if bullet.type == "Bullet":
-                if player.hitbox[0] - display_scroll[0] <= bullet.x - display_scroll[0] <= player.hitbox[
-                    0] + player.hitbox[
-                    2] - display_scroll[0] and player.hitbox[1] - display_scroll[1] <= bullet.y - display_scroll[
-                    1] <= \
-                        player.hitbox[1] + player.hitbox[3] - display_scroll[1]:
+                # The player is only hit if the bullet reached them before any solid object in the way
+                blocked_at = bullet.distance_to_obstacle()
+                hit_at = bullet.distance_to(player.hitbox, 1) if near_player[bullet.slot] else None
+                if hit_at is not None and (blocked_at is None or hit_at <= blocked_at):
                     player.health -= bullet.damage
-                    try:
-                        enemy_bullets.remove(bullet)
-                    except ValueError:  # For some reason this sometimes causes errors, so I included a try statement
-                        pass
-                for object in objects:
-                    if not object.pass_through:
-                        if object.hitbox[0] - display_scroll[0] <= bullet.x - display_scroll[0] <= object.hitbox[0] + \
-                                object.hitbox[2] - display_scroll[0] and object.hitbox[1] - display_scroll[
-                            1] <= bullet.y - \
-                                display_scroll[1] <= object.hitbox[1] + object.hitbox[3] - display_scroll[1]:
-                            try:
-                                enemy_bullets.remove(bullet)
-                            except ValueError:  # For some reason this causes errors, so I included a try statement
-                                pass
+                    bullet.removed = True
+                if blocked_at is not None:
+                    bullet.removed = True
             elif bullet.type == "Rocket":
-                if player.hitbox[0] - display_scroll[0] <= bullet.x - display_scroll[0] <= player.hitbox[
-                    0] + player.hitbox[
-                    2] - display_scroll[0] and player.hitbox[1] - display_scroll[1] <= bullet.y - display_scroll[
-                    1] <= \
-                        player.hitbox[1] + player.hitbox[3] - display_scroll[1]:
+                if player.hitbox[0] <= bullet.x <= player.hitbox[0] + player.hitbox[2] and \
+                        player.hitbox[1] <= bullet.y <= player.hitbox[1] + player.hitbox[3]:
                     if bullet.exploding_timer < 1:
-                        enemy_bullets.remove(bullet)
+                        bullet.removed = True
                     else:
                         bullet.explode("Enemy")
-                    try:
-                        pass
-                    except ValueError:  # For some reason this sometimes causes errors, so I included a try statement
-                        pass
-                for object in objects:
-                    if not object.pass_through:
-                        if object.hitbox[0] - display_scroll[0] <= bullet.x - display_scroll[0] <= object.hitbox[0] + \
-                                object.hitbox[2] - display_scroll[0] and object.hitbox[1] - display_scroll[
-                            1] <= bullet.y - \
-                                display_scroll[1] <= object.hitbox[1] + object.hitbox[3] - display_scroll[1]:
-                            try:
-                                if bullet.exploding_timer < 1:
-                                    enemy_bullets.remove(bullet)
-                                else:
-                                    bullet.explode("Enemy")
-                            except ValueError:  # For some reason this causes errors, so I included a try statement
-                                pass
+                for object in obstacles.query_point(bullet.x, bullet.y):
+                    if bullet.exploding_timer < 1:
+                        bullet.removed = True
+                    else:
+                        bullet.explode("Enemy")
+
+        resolve_explosions()  # Everything that blew up this frame does its damage now, once
+        profiler.mark("hit detection")
 
         # Remove dead tanks and put a solid object in their place
         for enemy in enemies:
             if enemy.type == "Tank" and enemy.health <= 0:
-                objects.append(
-                    Object((enemy.x, enemy.y), r"animations\enemy\tank\tank.png", (0, 0, 0), 200, 104, False))
-                enemies.remove(enemy)
+                wreck = Object((enemy.x, enemy.y), r"animations\enemy\tank\tank.PNG", (0, 0, 0), 200, 104, False)
+                objects.append(wreck)
+                ground_layer.add(wreck)  # Only the chunks under the wreck are drawn again
+                obstacles.add(wreck)
+                obstacle_grid.add(wreck)
+                dirty.full_update()
+                enemy.removed = True
+
+        # Take everything that was removed this frame out of its list. This is done once at the end, since removing
+        # things from a list while going through it makes the loop skip over the next thing in the list
+        for bullet in player_bullets + enemy_bullets + grenades:
+            if bullet.removed:
+                bullet.release()  # Its slot in projectile_pool can be used by a new bullet
+        player_bullets[:] = [bullet for bullet in player_bullets if not bullet.removed]
+        enemy_bullets[:] = [bullet for bullet in enemy_bullets if not bullet.removed]
+        grenades[:] = [grenade for grenade in grenades if not grenade.removed]
+        list_of_c4[:] = [explosive for explosive in list_of_c4 if not explosive.removed]
+        enemies[:] = [enemy for enemy in enemies if not enemy.removed]
+        profiler.mark("cleanup")
 
         # If player can access armories
         if pygame.Rect.colliderect(weapon_armory.access_rect, player.hitbox):
             access_weapon_armory = hud_font.render("Press F to access weapon armory", True, BLACK)
-            display.blit(access_weapon_armory, (720, 495))
+            dirty.blit(access_weapon_armory, (720, 495))
             if key[pygame.K_f]:
                 weapon_armory.access()
         else:
             weapon_armory.accessing_weapon_armory = False
+        profiler.mark("armory")
 
         for enemy in enemies:
             if not enemy.dead and enemy.type == "Dog":
@@ -2202,34 +2106,84 @@ def game_engine(objects, game_mode, wave, message=None):
             if enemy.type == "Tank":
                 if pygame.Rect.colliderect(enemy.hitbox, player.hitbox):
                     player.health = 0
+        profiler.mark("hit detection")
 
-        for object in objects:
+        for object in objects if draw else ():
             if object.pass_through:
                 object.main()
+        if draw:
+            if dirty.full:
+                canopy_layer.draw(display, camera)
+            else:
+                for rect in dirty.previous + dirty.rects:
+                    canopy_layer.draw(display, camera, rect)
 
         # Draw hitmarkers
         if player.hitmarker_chain > 0:
-            display.blit(hitmarker, (mouse_x - 16, mouse_y - 16))
+            dirty.blit(hitmarker, (mouse_x - 16, mouse_y - 16))
+        profiler.mark("drawing")
 
         live_enemies = []
         for enemy in enemies:
             if not enemy.dead:
                 live_enemies.append(enemy)
 
-        if game_mode == "Campaign":
+        if not draw:
+            pass  # Writing out the HUD takes a while, so it is skipped when nothing is drawn
+        elif game_mode == "Campaign":
             show_campaign_hud()
         elif game_mode == "Survival":
             show_survival_hud(wave, live_enemies)
             if message is not None:
                 text_y = 800
                 for line in message:
-                    display.blit(hud_font.render(line, True, BLACK), (700, text_y))
+                    dirty.blit(hud_font.render(line, True, BLACK), (700, text_y))
                     text_y += 15
+        profiler.mark("hud")
+        if profiler.shown and draw:
+            show_profiler(objects, live_enemies)
+            profiler.skip()
 
         if len(live_enemies) == 0:
             return "Next Wave"
-    else:
-        pass
+    elif draw:
+        ground_layer.draw(display, camera)
+        dirty.full_update()
+
+
+def reset_game(seed=None):
+    """ (int) -> int
+        Gets rid of everything left over from the last game, so that a game started from the same seed with the same
+        input always plays out the same way, however many games were played before it in the same run. The random
+        numbers start from seed, or from a new seed if it is None. Returns the seed.
+    """
+    global enemies
+    global live_enemies
+    global paused
+    seed = randomness.start(seed)
+    enemies = []
+    live_enemies = []
+    paused = False
+
+    # Get rid of anything still flying around from the last game
+    for bullet in player_bullets + enemy_bullets + grenades:
+        bullet.release()
+    player_bullets.clear()
+    enemy_bullets.clear()
+    grenades.clear()
+    list_of_c4.clear()
+    projectile_pool.clear()
+    explosions.clear()  # A C4 set off on the frame the player died never got to do its damage
+    thinker.clear()  # Decisions left over for enemies from the last game
+    ai_lod.reset()
+
+    for gun in guns:
+        gun.reset()
+    player.reset()
+    weapon_armory.accessing_weapon_armory = False
+    weapon_armory.access_menu = "Main Weapon Armory"
+
+    return seed
 
 
 def campaign():
@@ -2237,16 +2191,23 @@ def campaign():
         Campaign game mode, which I never actually used.
     """
     global enemies
+    reset_game()
     objects = []
+    build_terrain(objects)
     enemies = [Tank(500, 500, tank_turret, m1911, 100), Grenadier(500, 500, bazooka, m1911, 100)]
+    dirty.reset()
+    timestep.reset(clock)
+    frame_times.start("Campaign")
 
     while True:
-        game_status = game_engine(objects, "Campaign", None)
+        draw = timestep.next_step(clock)
+        game_status = game_engine(objects, "Campaign", None, draw=draw)
         if game_status == "Dead":
             break
 
-        clock.tick(FPS)
-        pygame.display.update()  # Update the game
+        if draw:
+            dirty.present()  # Update the parts of the screen that changed
+            frame_times.record(None, timestep.frame_time)
 
     death_screen()
 
@@ -2282,8 +2243,8 @@ def tutorial():
         'equipment from the Weapons Armoury. You can replenish your grenades, C4 and body armour supply, refill your ',
         'ammunition, or buy better guns. Spend your money wisely, as it will get tight. ',
         '',
-        'In combat, use the money rocks around the area for cover to hide from bullets. Bullets can not pass through, but',
-        'enemies can climb over them to reach you. Good luck. HQ out.',
+        'In combat, use the many rocks around the area for cover to hide from bullets. Bullets can not pass through, and',
+        'enemies can not either, so they have to go around them to reach you. Good luck. HQ out.',
         '',
         'Controls:',
         'Move: W - Up, A - Left, S - Down, D - Right',
@@ -2300,168 +2261,187 @@ def tutorial():
 
     reading = True
 
-    while reading:
-        display.fill(WHITE)
-        text_y = 10
-        for line in tutorial_text:
-            display.blit(hud_font.render(line, True, BLACK), (0, text_y))
-            text_y += 15
+    # The text never changes, so it only has to be drawn once
+    display.fill(WHITE)
+    text_y = 10
+    for line in tutorial_text:
+        display.blit(hud_font.render(line, True, BLACK), (0, text_y))
+        text_y += 15
+    pygame.display.update()
 
+    while reading:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
+            if event.type == pygame.VIDEOEXPOSE:  # The window was covered up, so it has to be sent to the screen again
+                pygame.display.update()
 
         key = pygame.key.get_pressed()
         if key[pygame.K_ESCAPE]:
             reading = False
 
         clock.tick(FPS)
-        pygame.display.update()
 
     start_menu()
 
 
+def setup_survival(seed=None):
+    """ (int) -> List
+        Gets everything ready for a new game of Survival: resets the player, and builds new terrain around them.
+        The random numbers start from seed, or from a new seed if it is None. Returns the list of objects in the game
+        world.
+    """
+    global objects
+    player_input.new_game("Survival", reset_game(seed))
+    objects = [weapon_armory, weapon_armory_icon, survival_sam_launcher]
+
+    for i in range(1, 100):
+        objects.append(Object(random_game_area(player.hitbox), "objects/tree1.png", (71, 112, 76), 106, 128, True))
+        objects.append(Object(random_game_area(player.hitbox), "objects/rock1.png", BLACK, 100, 91, False))
+    build_terrain(objects)
+
+    return objects
+
+
+def spawn_wave(wave):
+    """ (int) -> None
+        Sends in the enemies for this wave of Survival
+    """
+    global live_enemies
+    spawn = randomness.spawning
+    if wave == 1:
+        for i in range(1, 6):
+            enemies.append(American(0, 0, ithaca37, m1911,
+                                    100 + (wave - 1) * 10))  # Plus 10 HP for every round after round 1
+            enemies.append(
+                American(3000, 3000, ithaca37, m1911, 100 + (wave - 1) * 10))
+        live_enemies = enemies
+    elif wave == 2:
+        for i in range(1, 5):
+            enemies.append(American(0, 0, ithaca37, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(0, 2000, ithaca37, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(3000, 0, ithaca37, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(3000, 2000, ithaca37, m1911, 100 + (wave - 1) * 10))
+        live_enemies = enemies
+    elif wave == 3:
+        for i in range(1, 6):
+            enemies.append(
+                American(spawn.randrange(-50, 50), spawn.randrange(-50, 50), ithaca37, m1911, 100 + (wave - 1) * 10))
+            enemies.append(
+                American(spawn.randrange(2950, 3050), spawn.randrange(1950, 2050), ithaca37, m1911,
+                         100 + (wave - 1) * 10))
+        enemies.append(Dog(0, 0, 50 + (wave - 1) * 10))
+        enemies.append(Dog(3000, 3000, 50 + (wave - 1) * 10))
+        live_enemies = enemies
+    elif wave == 4:
+        for i in range(1, 6):
+            enemies.append(
+                American(spawn.randrange(-50, 50), spawn.randrange(-50, 50), m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(
+                American(spawn.randrange(2950, 3050), spawn.randrange(1950, 2050), m3, m1911, 100 + (wave - 1) * 10))
+        live_enemies = enemies
+    elif wave == 5:
+        for i in range(1, 4):
+            enemies.append(American(0, 0, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(0, 2000, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(3000, 0, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(3000, 2000, m3, m1911, 100 + (wave - 1) * 10))
+        live_enemies = enemies
+    elif wave == 6:
+        enemies.append(Sniper(0, 0, springfield, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Sniper(0, 2000, springfield, m1911, 100 + (wave - 1) * 10))
+        live_enemies = enemies
+    elif wave == 7:
+        for i in range(1, 4):
+            enemies.append(American(0, 0, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(0, 2000, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(3000, 0, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(3000, 2000, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(2000, 2000, m3, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(0, 0, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(2000, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(3000, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
+    elif wave == 8:
+        for i in range(1, 4):
+            enemies.append(American(0, 0, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(0, 2000, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(3000, 0, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(3000, 2000, m3, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(0, 0, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(0, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(3000, 0, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(3000, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
+    elif wave == 9:
+        for i in range(1, 4):
+            enemies.append(American(0, 0, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(0, 2000, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(3000, 0, m3, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(3000, 2000, m3, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(0, 0, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(0, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(3000, 0, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(3000, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(-1000, -1000, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Dog(0, 0, 50 + (wave - 1) * 10))
+        enemies.append(Dog(3000, 3000, 50 + (wave - 1) * 10))
+    elif wave == 10:
+        enemies.append(Tank(0, 0, tank_turret, tank_turret, 100 + (wave - 1) * 10))
+    else:
+        for i in range(1, 4):
+            enemies.append(American(0, 0, m1carbine, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(0, 2000, m1carbine, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(3000, 0, m1carbine, m1911, 100 + (wave - 1) * 10))
+            enemies.append(American(3000, 2000, m1carbine, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(0, 0, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(0, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(3000, 0, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(3000, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Grenadier(-1000, -1000, bazooka, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Dog(0, 0, 50 + (wave - 1) * 10))
+        enemies.append(Dog(3000, 3000, 50 + (wave - 1) * 10))
+        enemies.append(Tank(0, 0, tank_turret, tank_turret, 100 + (wave - 1) * 10))
+        enemies.append(Sniper(0, 0, springfield, m1911, 100 + (wave - 1) * 10))
+        enemies.append(Sniper(0, 2000, springfield, m1911, 100 + (wave - 1) * 10))
+
+
 def survival():
     """ (None) -> None
         The Survival game mode.
     """
-    global enemies
-    global live_enemies
-    global objects
-    global display_scroll
     # Survival game mode. Hold off endless waves of enemies that get progressively harder. Get money for kills and
     # challenges, and use it to buy equipment, guns and ammo.
     wave = 0
-    enemies = []
-    live_enemies = []
-    objects = [weapon_armory, weapon_armory_icon, survival_sam_launcher]
-
-    player.health = 100
-    player.in_tutorial = False
-    player.armour = 200
-    player.primary_weapon = mauserc96
-    player.secondary_weapon = m1911
-    player.hitmarker_chain = 0
-    player.money = 0
-    player.kills = 0
-    display_scroll = [100, 100]
+    objects = setup_survival()
 
     if music:
         pygame.mixer.Channel(5).play(game_music, -1)
         pygame.mixer.Channel(5).set_volume(0.7)
 
-    for i in range(1, 100):
-        objects.append(Object(random_game_area(player.hitbox), "objects/tree1.png", (71, 112, 76), 106, 128, True))
-        objects.append(Object(random_game_area(player.hitbox), "objects/rock1.png", BLACK, 100, 91, False))
+    dirty.reset()
+    timestep.reset(clock)
+    frame_times.start("Survival")
 
     while True:
+        draw = timestep.next_step(clock)
         if wave == 1:
             game_status = game_engine(objects, "Survival", wave, message=[
                 'The enemy is launching an all-out attack on our only surface-to-air missile site in the area. If it is ',
                 "destroyed, enemy air support will be able to fly past and turn the war in the enemy's favour. Reinforcements are",
-                'on their way, but you are on your own for now.', ])
+                'on their way, but you are on your own for now.', ], draw=draw)
         else:
-            game_status = game_engine(objects, "Survival", wave)
+            game_status = game_engine(objects, "Survival", wave, draw=draw)
         if game_status == "Dead":
             break
         elif game_status == "Next Wave":
             wave += 1
-            if wave == 1:
-                for i in range(1, 6):
-                    enemies.append(American(0, 0, ithaca37, m1911,
-                                            100 + (wave - 1) * 10))  # Plus 10 HP for every round after round 1
-                    enemies.append(
-                        American(3000, 3000, ithaca37, m1911, 100 + (wave - 1) * 10))
-                live_enemies = enemies
-            elif wave == 2:
-                for i in range(1, 5):
-                    enemies.append(American(0, 0, ithaca37, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(0, 2000, ithaca37, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(3000, 0, ithaca37, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(3000, 2000, ithaca37, m1911, 100 + (wave - 1) * 10))
-                live_enemies = enemies
-            elif wave == 3:
-                for i in range(1, 6):
-                    enemies.append(
-                        American(randrange(-50, 50), randrange(-50, 50), ithaca37, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(
-                        American(randrange(2950, 3050), randrange(1950, 2050), ithaca37, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Dog(0, 0, 50 + (wave - 1) * 10))
-                enemies.append(Dog(3000, 3000, 50 + (wave - 1) * 10))
-                live_enemies = enemies
-            elif wave == 4:
-                for i in range(1, 6):
-                    enemies.append(American(randrange(-50, 50), randrange(-50, 50), m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(
-                        American(randrange(2950, 3050), randrange(1950, 2050), m3, m1911, 100 + (wave - 1) * 10))
-                live_enemies = enemies
-            elif wave == 5:
-                for i in range(1, 4):
-                    enemies.append(American(0, 0, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(0, 2000, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(3000, 0, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(3000, 2000, m3, m1911, 100 + (wave - 1) * 10))
-                live_enemies = enemies
-            elif wave == 6:
-                enemies.append(Sniper(0, 0, springfield, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Sniper(0, 2000, springfield, m1911, 100 + (wave - 1) * 10))
-                live_enemies = enemies
-            elif wave == 7:
-                for i in range(1, 4):
-                    enemies.append(American(0, 0, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(0, 2000, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(3000, 0, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(3000, 2000, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(2000, 2000, m3, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(0, 0, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(2000, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(3000, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
-            elif wave == 8:
-                for i in range(1, 4):
-                    enemies.append(American(0, 0, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(0, 2000, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(3000, 0, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(3000, 2000, m3, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(0, 0, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(0, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(3000, 0, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(3000, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
-            elif wave == 9:
-                for i in range(1, 4):
-                    enemies.append(American(0, 0, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(0, 2000, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(3000, 0, m3, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(3000, 2000, m3, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(0, 0, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(0, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(3000, 0, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(3000, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(-1000, -1000, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Dog(0, 0, 50 + (wave - 1) * 10))
-                enemies.append(Dog(3000, 3000, 50 + (wave - 1) * 10))
-            elif wave == 10:
-                enemies.append(Tank(0, 0, tank_turret, tank_turret, 100 + (wave - 1) * 10))
-            else:
-                for i in range(1, 4):
-                    enemies.append(American(0, 0, m1carbine, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(0, 2000, m1carbine, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(3000, 0, m1carbine, m1911, 100 + (wave - 1) * 10))
-                    enemies.append(American(3000, 2000, m1carbine, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(0, 0, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(0, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(3000, 0, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(3000, 2000, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Grenadier(-1000, -1000, bazooka, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Dog(0, 0, 50 + (wave - 1) * 10))
-                enemies.append(Dog(3000, 3000, 50 + (wave - 1) * 10))
-                enemies.append(Tank(0, 0, tank_turret, tank_turret, 100 + (wave - 1) * 10))
-                enemies.append(Sniper(0, 0, springfield, m1911, 100 + (wave - 1) * 10))
-                enemies.append(Sniper(0, 2000, springfield, m1911, 100 + (wave - 1) * 10))
+            spawn_wave(wave)
 
-        clock.tick(FPS)
-        pygame.display.update()  # Update the game
+        if draw:
+            dirty.present()  # Update the parts of the screen that changed
+            frame_times.record(wave, timestep.frame_time)
 
+    player_input.end_game()
     death_screen(wave, player.kills)
 
 
@@ -2470,27 +2450,16 @@ def bootcamp():
         An interactive tutorial for the player. Each wave, the player will be introduced to a new important feature
         in the game. Only one enemy will come each time, so the player will have plenty of time to understand.
     """
-    global enemies
-    global live_enemies
     global objects
-    global display_scroll
 
     wave = 0
-    enemies = []
-    live_enemies = []
+    reset_game()
     objects = [boot_camp_npc, weapon_armory, weapon_armory_icon]
 
     if music:
         pygame.mixer.Channel(5).play(game_music, -1)
         pygame.mixer.Channel(5).set_volume(0.7)
 
-    player.in_tutorial = False
-    player.primary_weapon = mauserc96
-    player.secondary_weapon = m1911
-    player.hitmarker_chain = 0
-    player.kills = 0
-    display_scroll = [100, 100]
-
     player.money = 100000
     player.health = 1000
     player.armour = 0
@@ -2500,11 +2469,16 @@ def bootcamp():
     for i in range(1, 100):
         objects.append(Object(random_game_area(player.hitbox), "objects/tree1.png", (71, 112, 76), 106, 128, True))
         objects.append(Object(random_game_area(player.hitbox), "objects/rock1.png", BLACK, 100, 91, False))
+    build_terrain(objects)
+    dirty.reset()
+    timestep.reset(clock)
+    frame_times.start("Bootcamp")
 
     message = [""]
 
     while True:
-        game_status = game_engine(objects, "Survival", wave, message)
+        draw = timestep.next_step(clock)
+        game_status = game_engine(objects, "Survival", wave, message, draw)
         if game_status == "Dead":
             break
         elif game_status == "Next Wave":
@@ -2538,8 +2512,8 @@ def bootcamp():
                     "more target.",
                     "",
                     "Here's a tip: you can hide from bullets by taking cover on the other side of a solid object, ",
-                    "like a rock. It will stop bullets, but not the enemy. They can climb over them, or crawl ",
-                    "underneath. But that won't work for you, since you're carrying a lot more stuff."
+                    "like a rock. It will stop bullets, and the enemy too. Nobody can get through rocks, so the ",
+                    "enemy has to go around them to reach you, and you can use that to keep them away."
                 ]
                 enemies.append(American(2000, 2000, m1911, m1911, 100))
             if wave == 4:
@@ -2696,8 +2670,9 @@ def bootcamp():
             if wave == 21:
                 start_menu()
 
-        clock.tick(FPS)
-        pygame.display.update()  # Update the game
+        if draw:
+            dirty.present()  # Update the parts of the screen that changed
+            frame_times.record(wave, timestep.frame_time)
 
     death_screen(wave, player.kills)
 
@@ -2706,6 +2681,8 @@ def death_screen(wave=None, kills=None):
     """ (None) -> None
         The death screen displayed at the end of the game.
     """
+    frame_times.save()
+
     game_over = hud_font.render("YOU DIED", True, RED)
     display.blit(game_over, (900, 300))
 
@@ -2726,18 +2703,21 @@ def death_screen(wave=None, kills=None):
     if music:
         pygame.mixer.Channel(5).play(defeat_music)
 
+    pygame.display.update()  # Nothing changes on the death screen, so the screen is only updated once
+
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
+            if event.type == pygame.VIDEOEXPOSE:  # The window was covered up, so it has to be sent to the screen again
+                pygame.display.update()
 
         key = pygame.key.get_pressed()
         if key[pygame.K_ESCAPE]:
             start_menu()
 
         clock.tick(FPS)
-        pygame.display.update()
 
 
 def settings():
@@ -2750,23 +2730,30 @@ def settings():
     if music:
         pygame.mixer.Channel(5).play(menu_music, -1)
 
+    redraw = True  # The screen is only drawn again when a setting changes
+
     while True:
-        display.fill(GREEN)
-        if music:
-            if sound_fx:
-                display.blit(settings_on_on, (0, 0))
-            else:
-                display.blit(settings_on_off, (0, 0))
-        else:
-            if sound_fx:
-                display.blit(settings_off_on, (0, 0))
+        if redraw:
+            display.fill(GREEN)
+            if music:
+                if sound_fx:
+                    display.blit(settings_on_on, (0, 0))
+                else:
+                    display.blit(settings_on_off, (0, 0))
             else:
-                display.blit(settings_off_off, (0, 0))
+                if sound_fx:
+                    display.blit(settings_off_on, (0, 0))
+                else:
+                    display.blit(settings_off_off, (0, 0))
+            pygame.display.update()
+            redraw = False
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
+            if event.type == pygame.VIDEOEXPOSE:  # The window was covered up, so it has to be sent to the screen again
+                pygame.display.update()
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_x, mouse_y = pygame.mouse.get_pos()
                 mouse_rect = pygame.Rect(mouse_x, mouse_y, 1, 1)
@@ -2777,16 +2764,17 @@ def settings():
                     else:
                         music = True
                         pygame.mixer.Channel(5).set_volume(1)
+                    redraw = True
                 if pygame.Rect.colliderect(mouse_rect, pygame.Rect(94, 280, 253, 49)):
                     if sound_fx:
                         sound_fx = False
                     else:
                         sound_fx = True
+                    redraw = True
                 if pygame.Rect.colliderect(mouse_rect, pygame.Rect(94, 344, 253, 49)):
                     start_menu()
 
         clock.tick(FPS)
-        pygame.display.update()
 
 
 #  Main Menu
@@ -2797,13 +2785,17 @@ def start_menu():
     if music:
         pygame.mixer.Channel(5).play(menu_music, -1)
 
-    while True:
-        display.blit(main_menu_image, (0, 0))
+    # The main menu is a single image, so it only has to be drawn once
+    display.blit(main_menu_image, (0, 0))
+    pygame.display.update()
 
+    while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
+            if event.type == pygame.VIDEOEXPOSE:  # The window was covered up, so it has to be sent to the screen again
+                pygame.display.update()
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_x, mouse_y = pygame.mouse.get_pos()
                 mouse_rect = pygame.rect.Rect(mouse_x, mouse_y, 1, 1)
@@ -2814,8 +2806,16 @@ def start_menu():
                 if pygame.Rect.colliderect(mouse_rect, pygame.Rect(1280, 400, 640, 450)):
                     settings()
 
-        pygame.display.update()
+        clock.tick(FPS)
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Call of Duty: Korean War")
+    parser.add_argument("--record", metavar="FOLDER", help="save every game of Survival to this folder, to replay later")
+    parser.add_argument("--telemetry", metavar="FOLDER", help="save how long the frames of each game took to this folder")
+    arguments = parser.parse_args()
+    if arguments.record:
+        player_input = replay.Recorder(player_input, arguments.record)
+    frame_times.folder = arguments.telemetry
+
     start_menu()
@@ -0,0 +1,40 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Moves a whole group of enemies one step at once. Their positions and where they are heading are passed in as NumPy
+#  arrays, so the work is done by a few array operations instead of once per enemy.
+
+import numpy
+
+
+def step(x, y, goal_x, goal_y, speed, width, height, grid):
+    """ (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray,
+        ObstacleGrid) -> tuple
+        Moves every enemy at (x, y) up to speed pixels diagonally toward (goal_x, goal_y), without going past it.
+        speed can be one number for everyone or an array. Enemies only ever walk diagonally, so one that is level with
+        its goal on either axis stands still. An enemy whose width by height hitbox would run into something solid in
+        grid stays where it is, unless it is already inside something (like an enemy that spawned on top of a rock),
+        so it can walk back out. Returns the new x and y, and arrays saying which enemies were walking and which of
+        those were blocked.
+    """
+    step_x = numpy.minimum(numpy.maximum(goal_x - x, -speed), speed)  # Faster than numpy.clip for small arrays
+    step_y = numpy.minimum(numpy.maximum(goal_y - y, -speed), speed)
+
+    walking = (step_x != 0) & (step_y != 0)
+    blocked = walking & grid.collides(x + step_x, y + step_y, width, height)
+    if blocked.any():
+        blocked &= ~grid.collides(x, y, width, height)
+    moved = walking & ~blocked
+
+    return x + numpy.where(moved, step_x, 0), y + numpy.where(moved, step_y, 0), walking, blocked
+
+
+def slide(x, y, step_x, step_y, width, height, grid):
+    """ (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, ObstacleGrid) ->
+        tuple
+        For enemies whose diagonal step of (step_x, step_y) ran into something, tries stepping along just the x axis,
+        then just the y axis, so they slide along the side of the object instead of getting stuck on it. Returns the
+        new x and y, and an array saying which enemies couldn't move either way.
+    """
+    along_x = ~grid.collides(x + step_x, y, width, height)
+    along_y = ~along_x & ~grid.collides(x, y + step_y, width, height)
+
+    return x + numpy.where(along_x, step_x, 0), y + numpy.where(along_y, step_y, 0), ~along_x & ~along_y
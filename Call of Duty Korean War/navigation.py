@@ -0,0 +1,154 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Flow field pathfinding. The area around the player is split into a grid, and one search from the player's cell
+#  works out which way to step from every other cell to reach the player the quickest way around solid objects. Every
+#  enemy then just looks up the cell it is in, instead of searching for its own path.
+
+import numpy
+
+NAV_CELL_SIZE = 32  # Width and height of a cell, in pixels of the game world
+NAV_RADIUS = 32  # How many cells the grid reaches out from the player in each direction, a bit more than half a screen
+NAV_SLACK = 2  # How many cells the player can move before the field is worked out again
+
+# The 8 directions to a neighbouring cell, as (x, y)
+DIRECTIONS = ((1, 1), (-1, 1), (1, -1), (-1, -1), (0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+def overlap(size, x, y):
+    """ (int, int, int) -> tuple
+        For a size by size grid, returns the part of the grid that has a neighbour (x, y) away from it, and the part
+        that those neighbours are in, as two pairs of slices
+    """
+    here = (slice(max(-y, 0), size - max(y, 0)), slice(max(-x, 0), size - max(x, 0)))
+    there = (slice(max(y, 0), size - max(-y, 0)), slice(max(x, 0), size - max(-x, 0)))
+    return here, there
+
+
+def neighbour(array, x, y, fill):
+    """ (numpy.ndarray, int, int, object) -> numpy.ndarray
+        Returns an array where each cell holds the value of the cell (x, y) away from it in array. Cells whose
+        neighbour would be off the edge get fill.
+    """
+    here, there = overlap(len(array), x, y)
+    shifted = numpy.full_like(array, fill)
+    shifted[here] = array[there]
+    return shifted
+
+
+class FlowField:
+    def __init__(self, grid, width, height, cell_size=NAV_CELL_SIZE, radius=NAV_RADIUS, slack=NAV_SLACK):
+        """ (FlowField, ObstacleGrid, int, int, int, int, int) -> None
+            A flow field for enemies with a width by height hitbox, avoiding the solid objects in grid. A cell counts as
+            open if an enemy can stand anywhere in it without colliding with anything, so big enemies like tanks need
+            their own field. The field only has to be worked out again after the player moved more than slack cells
+            away from where it was last worked out for. Until then, the old field is used, and wanted is set to say
+            that solve should be called.
+        """
+        self.grid = grid
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.radius = radius
+        self.slack = slack
+        self.reset()
+
+    def reset(self):
+        """ (FlowField) -> None
+            Forgets the goal and the field worked out for it, for when the terrain is built again. The next enemy to
+            look up a direction makes it work the field out from scratch, instead of using one made for the old rocks.
+        """
+        self.goal = None  # Cell the player was in when the field was last moved
+        self.solved_for = None  # (goal, grid version) the field was last worked out for
+        self.left = 0  # Cell in the top-left corner of the field
+        self.top = 0
+        self.step_x = None  # step_x[row, column] and step_y are which way to go from each cell, -1, 0 or 1
+        self.step_y = None
+        self.wanted = False  # True when the field is out of date and an enemy used it
+
+    def update(self, goal_x, goal_y):
+        """ (FlowField, int, int) -> None
+            Sets the point everything heads towards, normally the player's position. Small moves are ignored, since
+            enemies close to the goal walk straight at the player anyway.
+        """
+        goal = (goal_x // self.cell_size, goal_y // self.cell_size)
+        if self.goal is None or max(abs(goal[0] - self.goal[0]), abs(goal[1] - self.goal[1])) > self.slack:
+            self.goal = goal
+
+    def solve(self):
+        """ (FlowField) -> None
+            Works out the distance from every cell to the goal with a breadth-first search, spreading out one ring of
+            cells at a time, then points every cell at its closest neighbour
+        """
+        size = self.radius * 2 + 1
+        self.left, self.top = self.goal[0] - self.radius, self.goal[1] - self.radius
+
+        columns, rows = numpy.meshgrid(numpy.arange(size), numpy.arange(size))
+        open_cells = ~self.grid.collides((self.left + columns) * self.cell_size, (self.top + rows) * self.cell_size,
+                                         self.cell_size - 1 + self.width, self.cell_size - 1 + self.height)
+
+        # A cell can be reached from a neighbour if it is open, and for diagonal steps, if both cells beside the step
+        # are open too, so enemies don't cut corners
+        allowed = [neighbour(open_cells, x, 0, False) & neighbour(open_cells, 0, y, False) if x and y else
+                   numpy.ones((size, size), bool) for x, y in DIRECTIONS]
+        enterable = [(overlap(size, x, y), ok & open_cells) for (x, y), ok in zip(DIRECTIONS, allowed)]
+
+        distance = numpy.full((size, size), -1, numpy.int32)
+        frontier = numpy.zeros((size, size), bool)
+        distance[self.radius, self.radius] = 0  # The goal is where the player is, even if it isn't open
+        frontier[self.radius, self.radius] = True
+        steps = 0
+        while frontier.any():
+            steps += 1
+            reached = numpy.zeros((size, size), bool)
+            for (here, there), ok in enterable:
+                reached[here] |= frontier[there] & ok[here]
+            frontier = reached & (distance < 0)
+            distance[frontier] = steps
+
+        # Step towards whichever neighbour is the fewest steps from the goal. Lots of neighbours are often tied, so
+        # the one closest to the goal in a straight line wins, which keeps enemies from zig-zagging in the open. Cells
+        # that can't reach the goal don't move
+        unreachable = size * size
+        distance[distance < 0] = unreachable
+        closest = numpy.array([numpy.where(ok, neighbour(distance, x, y, unreachable), unreachable)
+                               for (x, y), ok in zip(DIRECTIONS, allowed)])
+        straight_line = numpy.array([(columns + x - self.radius) ** 2 + (rows + y - self.radius) ** 2
+                                     for x, y in DIRECTIONS])
+        best = (closest.astype(numpy.int64) * (unreachable * 4) + straight_line).argmin(0)
+        downhill = closest.min(0) < distance
+
+        self.step_x = numpy.where(downhill, numpy.array([x for x, y in DIRECTIONS])[best], 0)
+        self.step_y = numpy.where(downhill, numpy.array([y for x, y in DIRECTIONS])[best], 0)
+        self.solved_for = (self.goal, self.grid.version)
+        self.wanted = False
+
+    def directions(self, x, y):
+        """ (FlowField, numpy.ndarray, numpy.ndarray) -> tuple
+            Takes arrays of positions and returns which way to step from each one, as arrays of -1, 0 or 1 for x and y,
+            and an array saying which positions the field knows about. Positions outside the field or cut off from
+            the goal aren't known, and get (0, 0).
+        """
+        if self.step_x is None:
+            self.solve()  # There's no old field to use yet
+        elif self.solved_for != (self.goal, self.grid.version):
+            self.wanted = True
+
+        column = numpy.floor_divide(x, self.cell_size) - self.left
+        row = numpy.floor_divide(y, self.cell_size) - self.top
+        size = self.radius * 2 + 1
+        inside = (column >= 0) & (column < size) & (row >= 0) & (row < size)
+
+        column = numpy.minimum(numpy.maximum(column, 0), size - 1)
+        row = numpy.minimum(numpy.maximum(row, 0), size - 1)
+        step_x = numpy.where(inside, self.step_x[row, column], 0)
+        step_y = numpy.where(inside, self.step_y[row, column], 0)
+
+        return step_x, step_y, inside & ((step_x != 0) | (step_y != 0))
+
+    def direction(self, x, y):
+        """ (FlowField, int, int) -> tuple
+            Same as directions, for a single position. Returns (step x, step y), or None if the field doesn't know.
+        """
+        step_x, step_y, known = self.directions(numpy.array([x]), numpy.array([y]))
+        if not known[0]:
+            return None
+        return int(step_x[0]), int(step_y[0])
@@ -0,0 +1,98 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Times each part of a frame. game_engine marks where each of its parts ends, and the times of the last few hundred
+#  frames are kept, so the average and worst times of each part can be shown in game or saved by a benchmark.
+
+from time import perf_counter_ns
+
+import numpy
+
+HISTORY = 300  # How many frames of times are kept
+
+# The parts of game_engine, in the order they happen
+PHASES = ("events", "movement", "drawing", "automatic fire", "objects", "enemies", "thinking", "bullets", "armory",
+          "hit detection", "cleanup", "hud")
+
+
+class FrameProfiler:
+    def __init__(self, phases=PHASES, history=HISTORY):
+        """ (FrameProfiler, tuple, int) -> None
+            Keeps how long each of phases took in each of the last history frames. Nothing is timed until enabled is
+            set, and until then every method returns straight away, so leaving the marks in game_engine costs almost
+            nothing. shown says whether the times are drawn on the screen.
+        """
+        self.phases = phases
+        self.history = history
+        self.enabled = False
+        self.shown = False
+
+        self.index = {phase: i for i, phase in enumerate(phases)}
+        self.times = numpy.zeros((len(phases), history), numpy.int64)  # Nanoseconds, one column per frame
+        self.column = 0  # The column the next frame goes in. Once every column is used, the oldest frame is replaced
+        self.frames = 0  # Frames kept so far, up to history
+
+        self.current = [0] * len(phases)  # Times of the frame being timed
+        self.timing = False  # Whether a frame is being timed
+        self.last = 0  # When the last phase ended
+
+    def start_frame(self):
+        """ (FrameProfiler) -> None
+            Starts timing a new frame, and keeps the times of the last one. The last frame is only finished here, so
+            it doesn't matter where game_engine returned from.
+        """
+        self.end_frame()
+        if self.enabled:
+            self.timing = True
+            self.last = perf_counter_ns()
+
+    def end_frame(self):
+        """ (FrameProfiler) -> None
+            Keeps the times of the frame being timed, if there is one
+        """
+        if not self.timing:
+            return
+        self.times[:, self.column] = self.current
+        self.column = (self.column + 1) % self.history
+        self.frames = min(self.frames + 1, self.history)
+        self.current = [0] * len(self.phases)
+        self.timing = False
+
+    def mark(self, phase):
+        """ (FrameProfiler, str) -> None
+            Ends phase. Everything since the last mark (or since the frame started) counts as part of it, and a phase
+            can be marked more than once in a frame.
+        """
+        if not self.timing:
+            return
+        now = perf_counter_ns()
+        self.current[self.index[phase]] += now - self.last
+        self.last = now
+
+    def skip(self):
+        """ (FrameProfiler) -> None
+            Leaves the time since the last mark out of every phase, like the time spent drawing this profiler
+        """
+        if self.timing:
+            self.last = perf_counter_ns()
+
+    def reset(self):
+        """ (FrameProfiler) -> None
+            Forgets every frame timed so far
+        """
+        self.column = 0
+        self.frames = 0
+        self.timing = False
+        self.current = [0] * len(self.phases)
+
+    def stats(self):
+        """ (FrameProfiler) -> dict
+            Returns the mean, 95th percentile and maximum time of each phase over the frames kept, in milliseconds,
+            as a dictionary of dictionaries. "total" is the time of the whole of game_engine.
+        """
+        times = self.times[:, :self.frames] / 1e6
+        if self.frames == 0:
+            times = numpy.zeros((len(self.phases), 1))
+
+        stats = {}
+        for name, row in list(zip(self.phases, times)) + [("total", times.sum(axis=0))]:
+            stats[name] = {"mean": float(row.mean()), "p95": float(numpy.percentile(row, 95)), "max": float(row.max())}
+        return stats
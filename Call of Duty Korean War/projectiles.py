@@ -0,0 +1,119 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Projectile pool. The positions, speeds and ranges of every bullet and rocket are kept together in NumPy arrays, so
+#  moving all of them each frame is a few array operations instead of a Python loop over every bullet.
+
+import numpy
+
+# Kinds of projectile. Bullets and rockets are moved by the pool, grenades move themselves because they bounce
+BULLET = 0
+ROCKET = 1
+GRENADE = 2
+
+
+class ProjectilePool:
+    def __init__(self, capacity=256):
+        """ (ProjectilePool, int) -> None
+            Creates room for capacity projectiles. If more than that are flying at once, the arrays are doubled in
+            size. Each projectile gets a slot, which is its index in every array.
+        """
+        self.capacity = capacity
+        self.used = 0  # Slots below this have been handed out at some point
+        self.free_slots = []  # Slots that were handed out and given back, to be used again first
+
+        self.x = numpy.zeros(capacity, numpy.int64)
+        self.y = numpy.zeros(capacity, numpy.int64)
+        self.last_x = numpy.zeros(capacity, numpy.int64)  # Where the projectile was at the start of this frame
+        self.last_y = numpy.zeros(capacity, numpy.int64)
+        self.step_x = numpy.zeros(capacity, numpy.int64)  # How far it moves each frame. It moves backwards, towards
+        self.step_y = numpy.zeros(capacity, numpy.int64)  # where it was aimed, so these are subtracted
+        self.range = numpy.zeros(capacity, numpy.int64)  # Frames left until it stops
+        self.damage = numpy.zeros(capacity, numpy.int64)
+        self.kind = numpy.zeros(capacity, numpy.int8)
+        self.exploding = numpy.zeros(capacity, bool)
+        self.active = numpy.zeros(capacity, bool)  # False for empty slots
+
+    def grow(self):
+        """ (ProjectilePool) -> None
+            Doubles the number of slots, keeping everything that is already in the arrays
+        """
+        extra = self.capacity
+        for name in ("x", "y", "last_x", "last_y", "step_x", "step_y", "range", "damage", "kind", "exploding",
+                     "active"):
+            array = getattr(self, name)
+            setattr(self, name, numpy.concatenate((array, numpy.zeros(extra, array.dtype))))
+        self.capacity += extra
+
+    def add(self, x, y, step_x, step_y, range, damage, kind):
+        """ (ProjectilePool, int, int, int, int, int, int, int) -> int
+            Puts a new projectile into the pool and returns its slot
+        """
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.used == self.capacity:
+                self.grow()
+            slot = self.used
+            self.used += 1
+
+        self.x[slot] = self.last_x[slot] = x
+        self.y[slot] = self.last_y[slot] = y
+        self.step_x[slot] = step_x
+        self.step_y[slot] = step_y
+        self.range[slot] = range
+        self.damage[slot] = damage
+        self.kind[slot] = kind
+        self.exploding[slot] = False
+        self.active[slot] = True
+
+        return slot
+
+    def release(self, slot):
+        """ (ProjectilePool, int) -> None
+            Empties slot so it can be used by another projectile
+        """
+        if self.active[slot]:
+            self.active[slot] = False
+            self.free_slots.append(slot)
+
+    def clear(self):
+        """ (ProjectilePool) -> None
+            Empties every slot, for when a new game starts
+        """
+        self.active[:] = False
+        self.used = 0
+        self.free_slots = []
+
+    def update(self):
+        """ (ProjectilePool) -> None
+            Moves every bullet and rocket one frame and counts down their range. Bullets keep flying until their
+            range is below 0, and rockets until it reaches 0 or they explode.
+        """
+        used = slice(0, self.used)
+        active = self.active[used]
+        kind = self.kind[used]
+        flying = active & (kind != GRENADE)
+
+        self.range[used][flying] -= 1
+        self.last_x[used] = self.x[used]
+        self.last_y[used] = self.y[used]
+
+        range = self.range[used]
+        moving = flying & (((kind == BULLET) & (range >= 0)) |
+                           ((kind == ROCKET) & (range > 0) & ~self.exploding[used]))
+        self.x[used][moving] -= self.step_x[used][moving]
+        self.y[used][moving] -= self.step_y[used][moving]
+
+    def touching(self, rect, size=8):
+        """ (ProjectilePool, pygame.Rect, int) -> numpy.ndarray
+            Returns an array with one True or False per slot: whether the box around everywhere that projectile went
+            this frame (as a size by size square) overlaps rect. Projectiles that are False can't have hit anything in
+            rect, so they can be skipped without checking them one at a time.
+        """
+        used = slice(0, self.used)
+        left = numpy.minimum(self.x[used], self.last_x[used])
+        right = numpy.maximum(self.x[used], self.last_x[used]) + size
+        top = numpy.minimum(self.y[used], self.last_y[used])
+        bottom = numpy.maximum(self.y[used], self.last_y[used]) + size
+
+        return self.active[used] & (left < rect[0] + rect[2]) & (right > rect[0]) & (top < rect[1] + rect[3]) & (
+                bottom > rect[1])
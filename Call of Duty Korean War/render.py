@@ -0,0 +1,149 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Helpers for drawing frames.
+
+import pygame
+
+
+class Camera:
+    def __init__(self, x=0, y=0):
+        """ (Camera, int, int) -> None
+            The camera decides which part of the game world is on screen. (x, y) is the point in the game world that is
+            drawn in the top-left corner of the screen. Everything in the game lives in world coordinates, and is only
+            moved into screen coordinates by the camera when it is drawn.
+        """
+        self.x = x
+        self.y = y
+
+    def look_at(self, x, y, screen_x, screen_y):
+        """ (Camera, int, int, int, int) -> None
+            Moves the camera so that the point (x, y) in the game world is drawn at (screen_x, screen_y) on the screen
+        """
+        self.x = x - screen_x
+        self.y = y - screen_y
+
+    def to_screen(self, x, y):
+        """ (Camera, int, int) -> tuple
+            Returns where the point (x, y) in the game world is on the screen
+        """
+        return x - self.x, y - self.y
+
+    def to_world(self, x, y):
+        """ (Camera, int, int) -> tuple
+            Returns which point in the game world is at (x, y) on the screen, like the mouse position
+        """
+        return x + self.x, y + self.y
+
+
+class Culler:
+    def __init__(self, width, height, margin=100):
+        """ (Culler, int, int, int) -> None
+            Decides which things are on screen and need to be drawn. Anything off screen is still moved and updated,
+            just not drawn. margin is how far off the edge something can be and still count as on screen, because
+            guns and explosions stick out past the hitbox of whatever they belong to.
+        """
+        self.view = pygame.Rect(-margin, -margin, width + margin * 2, height + margin * 2)
+
+        self.drawing = True  # False for frames that are run but not drawn, so everything counts as off screen
+        self.drawn = 0  # How many things were drawn and skipped so far this frame
+        self.culled = 0
+        self.last_drawn = 0  # Same, but for the whole of the last frame that was drawn
+        self.last_culled = 0
+
+    def new_frame(self, drawing=True):
+        """ (Culler, bool) -> None
+            Saves the last frame's counts, if it was drawn, and starts counting again. Call this at the start of every
+            frame. drawing is False if this frame won't be shown.
+        """
+        if self.drawing:  # Frames that weren't drawn didn't count anything
+            self.last_drawn = self.drawn
+            self.last_culled = self.culled
+        self.drawing = drawing
+        self.drawn = 0
+        self.culled = 0
+
+    def visible(self, x, y, width, height):
+        """ (Culler, int, int, int, int) -> bool
+            Returns True if the rectangle (x, y, width, height), in screen coordinates, is on screen
+        """
+        if not self.drawing:
+            return False
+
+        if self.view.colliderect((x, y, width, height)):
+            self.drawn += 1
+            return True
+
+        self.culled += 1
+        return False
+
+
+class DirtyRects:
+    def __init__(self, surface, max_rects=200):
+        """ (DirtyRects, pygame.Surface, int) -> None
+            Keeps track of which parts of surface (the display) were drawn on, so only those parts have to be sent to
+            the screen. If more than max_rects parts changed, it is faster to just send the whole screen.
+        """
+        self.surface = surface
+        self.max_rects = max_rects
+
+        self.rects = []  # Parts of the screen drawn on this frame
+        self.previous = []  # Parts of the screen drawn on last frame, which have to be erased this frame
+        self.full = True  # Whether the whole screen has to be drawn and sent this frame
+        self.last_scroll = None
+        self.drawing = True  # False for frames that are run but not drawn, so nothing is drawn on the surface
+
+    def reset(self):
+        """ (DirtyRects) -> None
+            Forgets everything, so the next frame is drawn in full. Call this when something else (like a menu) drew
+            over the screen.
+        """
+        self.rects = []
+        self.previous = []
+        self.full = True
+        self.last_scroll = None
+
+    def begin_frame(self, camera, drawing=True):
+        """ (DirtyRects, Camera, bool) -> None
+            Starts a new frame. If the camera moved, everything on screen moved with it, so the whole screen has to be
+            drawn again. drawing is False if this frame won't be shown, and then nothing is drawn until the next
+            frame that is.
+        """
+        self.drawing = drawing
+        if self.last_scroll != (camera.x, camera.y):
+            self.full = True
+        self.last_scroll = (camera.x, camera.y)
+
+    def full_update(self):
+        """ (DirtyRects) -> None
+            Sends the whole screen at the end of this frame
+        """
+        self.full = True
+
+    def add(self, rect):
+        """ (DirtyRects, pygame.Rect) -> pygame.Rect
+            Records that rect was drawn on this frame, and returns it
+        """
+        if rect.width > 0 and rect.height > 0:  # Things drawn completely off screen have an empty rectangle
+            self.rects.append(rect)
+        return rect
+
+    def blit(self, image, position, area=None):
+        """ (DirtyRects, pygame.Surface, tuple, pygame.Rect) -> pygame.Rect
+            Same as surface.blit, but records where it drew
+        """
+        if not self.drawing:
+            return pygame.Rect(position, (0, 0))
+        return self.add(self.surface.blit(image, position, area))
+
+    def present(self):
+        """ (DirtyRects) -> None
+            Sends everything that changed this frame to the screen: the parts drawn last frame (which were erased) and
+            the parts drawn this frame. This replaces pygame.display.update() at the end of the frame.
+        """
+        if self.full or len(self.previous) + len(self.rects) > self.max_rects:
+            pygame.display.update()
+        else:
+            pygame.display.update(self.previous + self.rects)
+
+        self.previous = self.rects
+        self.rects = []
+        self.full = False
@@ -0,0 +1,276 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Recording and replaying games. Everything the player pressed each frame is saved to a small file, and since the random
+#  numbers come from the seed saved with it, playing the file back through game_engine plays the exact same game again.
+
+import os
+import struct
+import time
+import zlib
+
+import pygame
+
+import controls
+
+MAGIC = b"CODKW"  # Every recording starts with this, so other files aren't mistaken for one
+VERSION = 1
+HEADER = "<BqB"  # The version, the seed (which can be negative, like any Python seed) and the length of the mode's name
+
+# The keys the game uses. Each one is a bit in the record of which keys are held
+KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_r, pygame.K_g, pygame.K_n, pygame.K_j, pygame.K_f,
+        pygame.K_h, pygame.K_1, pygame.K_2, pygame.K_ESCAPE)
+OTHER_KEY = 255  # Stands for any key not in KEYS. Pressing one still makes the game check which keys are held
+
+# Each frame is saved as a byte saying what changed since the frame before, followed by only the things that changed.
+# Frames where nothing changed are saved together, as a 0 and how many frames in a row it was the same
+SAME = 0
+KEYS_CHANGED = 1
+MOUSE_MOVED = 2
+BUTTONS_CHANGED = 4
+HAS_EVENTS = 8
+
+# Types of event that are saved. Key and mouse button events are followed by a byte saying which key or button
+QUIT = 1
+KEY_DOWN = 2
+BUTTON_DOWN = 3
+BUTTON_UP = 4
+EXPOSE = 5
+
+
+def key_bits(held):
+    """ (set) -> int
+        Packs a set of held keys into one number, with a bit for each key in KEYS
+    """
+    bits = 0
+    for i, key in enumerate(KEYS):
+        if key in held:
+            bits |= 1 << i
+    return bits
+
+
+def held_keys(bits):
+    """ (int) -> set
+        Unpacks a number made by key_bits back into a set of held keys
+    """
+    return {key for i, key in enumerate(KEYS) if bits & (1 << i)}
+
+
+def button_bits(buttons):
+    """ (tuple) -> int
+        Packs which mouse buttons are held into one number
+    """
+    return sum(1 << i for i, held in enumerate(buttons[:3]) if held)
+
+
+class Recorder(controls.Controls):
+    def __init__(self, source, folder):
+        """ (Recorder, Controls, str) -> None
+            Passes on the input from source, and saves every frame of it to a new file in folder for each game. The
+            game's input is read once a frame, when events is called at the start of game_engine, and the same input is
+            given back for the rest of the frame, so exactly what was saved is what the game saw.
+        """
+        super().__init__()
+        self.source = source
+        self.folder = folder
+        self.path = None  # The file being recorded to, if a game is being recorded
+        self.file = None
+        self.compressor = None
+
+        self.held = set()
+        self.position = (0, 0)
+        self.buttons = (False, False, False)
+        self.last = None  # (key bits, mouse position, button bits) of the last frame saved
+        self.same = 0  # How many frames in a row have been the same as self.last and not saved yet
+
+    def new_game(self, mode, seed):
+        """ (Recorder, str, int) -> None
+            Starts recording a new game of mode, which was started with seed. The file is named after the mode, the
+            time and the seed. Two games with the same seed can start in the same second, so a number is added to the
+            name if it's taken.
+        """
+        self.end_game()
+        os.makedirs(self.folder, exist_ok=True)
+        name = os.path.join(self.folder, "{}-{}-{}".format(mode.lower(), time.strftime("%Y%m%d-%H%M%S"), seed))
+        number = 1
+        while self.file is None:
+            self.path = name + ("-" + str(number) if number > 1 else "") + ".rec"
+            try:
+                self.file = open(self.path, "xb")
+            except FileExistsError:
+                number += 1
+        self.file.write(MAGIC + struct.pack(HEADER, VERSION, seed, len(mode)) + mode.encode())
+        self.compressor = zlib.compressobj(9)
+        self.last = None
+        self.same = 0
+
+    def end_game(self):
+        """ (Recorder) -> None
+            Finishes the file of the game being recorded, if there is one
+        """
+        if self.file is None:
+            return
+        self.write_same()
+        self.file.write(self.compressor.flush())
+        self.file.close()
+        self.file = None
+
+    def write(self, data):
+        self.file.write(self.compressor.compress(data))
+
+    def write_same(self):
+        """ (Recorder) -> None
+            Saves the frames that were the same as the last one
+        """
+        if self.same:
+            self.write(struct.pack("<BI", SAME, self.same))
+            self.same = 0
+
+    def events(self):
+        """ (Recorder) -> list
+            Starts a new frame: reads everything from source, saves it, and returns the events
+        """
+        events = self.source.events()
+        keys = self.source.keys()
+        self.held = {key for key in KEYS if keys[key]}
+        self.position = tuple(self.source.mouse_position())
+        self.buttons = tuple(self.source.mouse_buttons()[:3])
+
+        if self.file is not None:
+            self.save_frame(events)
+            if any(event.type == pygame.QUIT for event in events):
+                self.end_game()  # The game is about to close, so the file has to be finished now
+
+        return events
+
+    def keys(self):
+        return controls.HeldKeys(self.held)
+
+    def mouse_position(self):
+        return self.position
+
+    def mouse_buttons(self):
+        return self.buttons
+
+    def save_frame(self, events):
+        """ (Recorder, list) -> None
+            Saves one frame, or adds it to the count of frames that were the same
+        """
+        saved = []
+        for event in events:
+            if event.type == pygame.QUIT:
+                saved.append(struct.pack("<B", QUIT))
+            elif event.type == pygame.KEYDOWN:
+                saved.append(struct.pack("<BB", KEY_DOWN, KEYS.index(event.key) if event.key in KEYS else OTHER_KEY))
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                saved.append(struct.pack("<BB", BUTTON_DOWN, event.button))
+            elif event.type == pygame.MOUSEBUTTONUP:
+                saved.append(struct.pack("<BB", BUTTON_UP, event.button))
+            elif event.type == pygame.VIDEOEXPOSE:
+                saved.append(struct.pack("<B", EXPOSE))
+
+        frame = (key_bits(self.held), self.position, button_bits(self.buttons))
+        if frame == self.last and not saved:
+            self.same += 1
+            return
+
+        self.write_same()
+        last = self.last or (None, None, None)
+        changed = 0
+        data = b""
+        if frame[0] != last[0]:
+            changed |= KEYS_CHANGED
+            data += struct.pack("<H", frame[0])
+        if frame[1] != last[1]:
+            changed |= MOUSE_MOVED
+            data += struct.pack("<hh", *frame[1])
+        if frame[2] != last[2]:
+            changed |= BUTTONS_CHANGED
+            data += struct.pack("<B", frame[2])
+        if saved:
+            changed |= HAS_EVENTS
+            data += struct.pack("<B", len(saved)) + b"".join(saved)
+
+        self.write(struct.pack("<B", changed) + data)
+        self.last = frame
+
+
+class Playback(controls.VirtualControls):
+    def __init__(self, path):
+        """ (Playback, str) -> None
+            Plays back the input saved in the recording at path, one frame each time events is called. mode and seed
+            say how the recorded game was started, and finished is set once there is nothing left to play.
+        """
+        super().__init__()
+        with open(path, "rb") as file:
+            data = file.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(path + " is not a recording")
+
+        start = len(MAGIC)
+        version, self.seed, length = struct.unpack_from(HEADER, data, start)
+        if version != VERSION:
+            raise ValueError("{} was recorded with version {} of the format".format(path, version))
+        start += struct.calcsize(HEADER)
+        self.mode = data[start:start + length].decode()
+
+        self.data = zlib.decompress(data[start + length:])
+        self.offset = 0
+        self.same = 0  # Frames left to repeat the last frame for
+        self.frames = 0  # Frames played so far
+        self.finished = not self.data
+
+    def read(self, format):
+        values = struct.unpack_from(format, self.data, self.offset)
+        self.offset += struct.calcsize(format)
+        return values
+
+    def events(self):
+        """ (Playback) -> list
+            Moves on to the next recorded frame and returns its events. A recorded QUIT isn't passed on, since it would
+            close the game, so the recording just ends there.
+        """
+        pygame.event.clear()
+        if self.finished:
+            return []
+        self.frames += 1
+        events = self.next_frame()
+        self.finished = self.finished or (self.same == 0 and self.offset >= len(self.data))
+        return events
+
+    def next_frame(self):
+        """ (Playback) -> list
+            Reads the next frame, setting held, position and buttons, and returns its events
+        """
+        if self.same:
+            self.same -= 1
+            return []
+
+        changed, = self.read("<B")
+        if changed == SAME:
+            self.same, = self.read("<I")
+            self.same -= 1  # This frame is the first of them
+            return []
+
+        if changed & KEYS_CHANGED:
+            self.held = held_keys(self.read("<H")[0])
+        if changed & MOUSE_MOVED:
+            self.position = self.read("<hh")
+        if changed & BUTTONS_CHANGED:
+            bits, = self.read("<B")
+            self.buttons = tuple(bool(bits & (1 << i)) for i in range(3))
+
+        events = []
+        for i in range(self.read("<B")[0] if changed & HAS_EVENTS else 0):
+            event_type, = self.read("<B")
+            if event_type == QUIT:
+                self.finished = True
+            elif event_type == KEY_DOWN:
+                index, = self.read("<B")
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=KEYS[index] if index < len(KEYS) else 0))
+            elif event_type in (BUTTON_DOWN, BUTTON_UP):
+                button, = self.read("<B")
+                kind = pygame.MOUSEBUTTONDOWN if event_type == BUTTON_DOWN else pygame.MOUSEBUTTONUP
+                events.append(pygame.event.Event(kind, button=button, pos=self.position))
+            elif event_type == EXPOSE:
+                events.append(pygame.event.Event(pygame.VIDEOEXPOSE))
+
+        return events
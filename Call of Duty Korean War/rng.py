@@ -0,0 +1,37 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Random numbers for the game. Each part of the game gets its own stream of random numbers, all started from one seed,
+#  so playing a game again with the same seed and the same input plays out exactly the same way.
+
+import random
+
+# The parts of the game that use random numbers. Each gets its own stream, so for example adding a tree to the terrain
+# doesn't change where every enemy decides to walk
+STREAMS = ("terrain", "spawning", "ai", "combat")
+
+
+class RandomStreams:
+    def __init__(self, seed=None):
+        """ (RandomStreams, int) -> None
+            Creates a random.Random for each name in STREAMS, as an attribute with that name (like streams.ai). If seed
+            isn't None, every game uses that seed instead of a new one.
+        """
+        self.fixed_seed = seed
+        self.seed = None  # The seed the current game was started with
+        self.start()
+
+    def start(self, seed=None):
+        """ (RandomStreams, int) -> int
+            Starts every stream again from seed, for a new game. If seed is None, the fixed seed is used if there is
+            one, otherwise a new seed is picked. Returns the seed, so the game can be played again.
+        """
+        if seed is None:
+            seed = self.fixed_seed
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+
+        self.seed = seed
+        for name in STREAMS:
+            # Seeding with a string is the same on every computer, and the name makes each stream different
+            setattr(self, name, random.Random("{}/{}".format(seed, name)))
+
+        return seed
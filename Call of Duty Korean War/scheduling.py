@@ -0,0 +1,165 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Decides how often each enemy's AI runs. Enemies far off screen only need to be updated now and then, as long as
+#  they catch up on the frames they skipped when they do. Enemies' decisions are also spread out over several frames.
+#  The game itself runs a fixed number of steps every second, however fast frames can be drawn.
+
+from collections import deque
+
+import pygame
+
+LOD_INTERVAL = 4  # Far away enemies are updated once every this many frames
+LOD_MARGIN = 400  # How far off the edge of the screen an enemy can be and still be updated every frame
+# How much thinking enemies can do each frame, counted in jobs, not time. Picking a target costs 1, working out a path
+# costs the whole budget
+THINK_BUDGET = 8
+MAX_CATCH_UP = 5  # Most steps the game runs between two drawn frames before it gives up catching up and slows down
+
+
+class LevelOfDetail:
+    def __init__(self, width, height, interval=LOD_INTERVAL, margin=LOD_MARGIN):
+        """ (LevelOfDetail, int, int, int, int) -> None
+            Enemies within margin pixels of the width by height screen are updated every frame. The rest are updated
+            every interval frames, and do interval frames' worth of moving and counting down at once. Each enemy
+            gets a phase, so the far away enemies don't all take their turn on the same frame.
+        """
+        self.width = width
+        self.height = height
+        self.interval = interval
+        self.margin = margin
+
+        self.frame = 0
+        self.phases_given = 0
+        self.near = pygame.Rect(0, 0, 0, 0)  # The screen and the margin around it, in world coordinates
+
+    def reset(self):
+        """ (LevelOfDetail) -> None
+            Starts counting frames and phases from the beginning, for a new game. Otherwise which enemies take their
+            turn on which frame would depend on how long the games before it lasted.
+        """
+        self.frame = 0
+        self.phases_given = 0
+        self.near = pygame.Rect(0, 0, 0, 0)
+
+    def next_phase(self):
+        """ (LevelOfDetail) -> int
+            Returns the phase for a new enemy. Phases are handed out in turn, so they are spread out evenly.
+        """
+        self.phases_given += 1
+        return self.phases_given % self.interval
+
+    def new_frame(self, camera):
+        """ (LevelOfDetail, Camera) -> None
+            Starts a new frame. Call this once the camera is in place for this frame, before asking for any ticks.
+        """
+        self.frame += 1
+        self.near = pygame.Rect(camera.x - self.margin, camera.y - self.margin, self.width + self.margin * 2,
+                                self.height + self.margin * 2)
+
+    def ticks(self, hitbox, phase):
+        """ (LevelOfDetail, pygame.Rect, int) -> int
+            Returns how many frames an enemy with this hitbox and phase should do this frame: 1 if it is near the
+            screen, and for far away enemies, interval on their turn and 0 on every other frame
+        """
+        if self.near.colliderect(hitbox):
+            return 1
+        if (self.frame + phase) % self.interval == 0:
+            return self.interval
+        return 0
+
+
+class ThinkScheduler:
+    def __init__(self, budget=THINK_BUDGET):
+        """ (ThinkScheduler, float) -> None
+            Spreads the enemies' thinking (picking where to go next, how long to wait before shooting again, working
+            out paths) over several frames. Jobs wait in a queue and are done in the order they were asked for, until
+            the costs of the jobs done this frame add up to budget. The rest wait for the next frame, so lots of
+            enemies deciding things on the same frame (like when a wave starts) doesn't make that frame take longer.
+
+            The budget is a number of jobs (each weighted by the cost it was scheduled with), not a number of
+            milliseconds. It doesn't change when frames get slower or faster. Jobs are never timed, because then how
+            much got thought about would depend on how fast the computer is, and a game played again from the same
+            seed and input (see rng.py and replay.py) would play out differently.
+        """
+        self.budget = budget
+        self.jobs = deque()
+        self.waiting = set()  # Keys of the jobs in the queue
+
+    def schedule(self, key, job, cost=1):
+        """ (ThinkScheduler, tuple, function, int) -> None
+            Asks for job to be done soon. key says who the job is for and what it does, like (enemy, "target"), so
+            asking again before it was done doesn't do it twice.
+        """
+        if key not in self.waiting:
+            self.waiting.add(key)
+            self.jobs.append((key, job, cost))
+
+    def is_waiting(self, key):
+        """ (ThinkScheduler, tuple) -> bool
+            Returns True if the job for key was asked for and hasn't been done yet
+        """
+        return key in self.waiting
+
+    def run(self):
+        """ (ThinkScheduler) -> None
+            Does jobs until this frame's budget is used up. At least one job is done every frame, so the queue always
+            goes down.
+        """
+        spent = 0
+        while self.jobs and spent < self.budget:
+            key, job, cost = self.jobs.popleft()
+            self.waiting.discard(key)
+            job()
+            spent += cost
+
+    def clear(self):
+        """ (ThinkScheduler) -> None
+            Forgets every job, for when a new game starts
+        """
+        self.jobs.clear()
+        self.waiting = set()
+
+
+class FixedTimestep:
+    def __init__(self, rate, max_steps=MAX_CATCH_UP):
+        """ (FixedTimestep, int, int) -> None
+            Runs the game at rate steps per second of real time. Every timer in the game counts steps, so if a frame
+            takes too long to draw, the steps it missed are run straight after without being drawn, instead of the
+            whole game going into slow motion. If more than max_steps are missed, the game slows down instead, so it
+            never spends all its time catching up.
+
+            This only decides which steps get drawn. Drawing isn't separate from updating: every object draws itself
+            in its main, while it moves. So there is no drawing in between steps, and nothing is interpolated between
+            them. The screen never changes more than rate times a second, even on a 120 or 144 Hz display.
+        """
+        self.step_time = 1000 / rate  # In milliseconds
+        self.max_steps = max_steps
+        self.behind = 0  # Milliseconds of game time that are due but haven't been run yet
+        self.since_drawn = 0  # Milliseconds since the last step that was drawn
+        self.frame_time = 0  # Milliseconds between the last two steps that were drawn
+
+    def reset(self, clock):
+        """ (FixedTimestep, pygame.time.Clock) -> None
+            Starts counting from now, so time spent in menus isn't caught up on. Call this before the first step.
+        """
+        clock.tick()
+        self.behind = 0
+        self.since_drawn = 0
+
+    def next_step(self, clock):
+        """ (FixedTimestep, pygame.time.Clock) -> bool
+            Waits until the next step is due and counts it as done. Returns True if it is the last step due right
+            now, which is the one that should be drawn. The steps before it are only there to catch up.
+        """
+        waited = clock.tick()
+        while self.behind + waited < self.step_time:
+            pygame.time.wait(max(int(self.step_time - self.behind - waited), 1))
+            waited += clock.tick()
+        self.since_drawn += waited
+
+        self.behind = min(self.behind + waited, self.step_time * self.max_steps) - self.step_time
+        if self.behind >= self.step_time:
+            return False
+
+        self.frame_time = self.since_drawn
+        self.since_drawn = 0
+        return True
@@ -0,0 +1,176 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Spatial hash. The game world is split into a grid of square cells, and every solid object is listed in the cells it
+#  touches, so collision checks only have to look at the few objects near something instead of every object in the game.
+
+import numpy
+import pygame
+
+CELL_SIZE = 128  # Width and height of a cell, in pixels of the game world
+
+
+class SpatialHash:
+    def __init__(self, cell_size=CELL_SIZE):
+        """ (SpatialHash, int) -> None
+            Creates an empty spatial hash. Objects are added with add, and must have a hitbox (in world coordinates)
+            that doesn't move while they are in the hash.
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # (cell x, cell y) -> list of objects touching that cell, in the order added
+
+    def cells_touching(self, x, y, width, height):
+        """ (SpatialHash, int, int, int, int) -> list
+            Returns the coordinates of every cell that overlaps the rectangle (x, y, width, height)
+        """
+        first_x, last_x = x // self.cell_size, (x + width - 1) // self.cell_size
+        first_y, last_y = y // self.cell_size, (y + height - 1) // self.cell_size
+
+        return [(cell_x, cell_y) for cell_x in range(first_x, last_x + 1) for cell_y in range(first_y, last_y + 1)]
+
+    def add(self, object):
+        """ (SpatialHash, Object) -> None
+            Adds object to every cell its hitbox touches. The bottom and right edges of the hitbox count too, so that
+            points lying exactly on the edge are found by query_point.
+        """
+        hitbox = object.hitbox
+        for cell in self.cells_touching(hitbox[0], hitbox[1], hitbox[2] + 1, hitbox[3] + 1):
+            self.cells.setdefault(cell, []).append(object)
+
+    def remove(self, object):
+        """ (SpatialHash, Object) -> None
+            Removes object from the hash
+        """
+        hitbox = object.hitbox
+        for cell in self.cells_touching(hitbox[0], hitbox[1], hitbox[2] + 1, hitbox[3] + 1):
+            if object in self.cells.get(cell, []):
+                self.cells[cell].remove(object)
+
+    def clear(self):
+        """ (SpatialHash) -> None
+            Removes every object, for when a new game starts
+        """
+        self.cells = {}
+
+    def nearby(self, x, y, width, height):
+        """ (SpatialHash, int, int, int, int) -> list
+            Returns every object in the cells that the rectangle touches, each one only once. These are the only
+            objects that could possibly collide with the rectangle.
+        """
+        found = []
+        seen = set()
+        for cell in self.cells_touching(x, y, width, height):
+            for object in self.cells.get(cell, ()):
+                if id(object) not in seen:
+                    seen.add(id(object))
+                    found.append(object)
+
+        return found
+
+    def query(self, rect):
+        """ (SpatialHash, pygame.Rect) -> list
+            Returns every object whose hitbox collides with rect
+        """
+        rect = pygame.Rect(rect)
+        return [object for object in self.nearby(rect[0], rect[1], rect[2], rect[3])
+                if rect.colliderect(object.hitbox)]
+
+    def collides(self, rect):
+        """ (SpatialHash, pygame.Rect) -> bool
+            Returns True if any object's hitbox collides with rect
+        """
+        rect = pygame.Rect(rect)
+        for object in self.nearby(rect[0], rect[1], rect[2], rect[3]):
+            if rect.colliderect(object.hitbox):
+                return True
+
+        return False
+
+    def query_point(self, x, y):
+        """ (SpatialHash, int, int) -> list
+            Returns every object whose hitbox contains the point (x, y). Points on the edge of a hitbox count as
+            inside it, which is how bullets have always been checked against objects.
+        """
+        found = []
+        for object in self.cells.get((x // self.cell_size, y // self.cell_size), ()):
+            hitbox = object.hitbox
+            if hitbox[0] <= x <= hitbox[0] + hitbox[2] and hitbox[1] <= y <= hitbox[1] + hitbox[3]:
+                found.append(object)
+
+        return found
+
+
+class ObstacleGrid:
+    def __init__(self):
+        """ (ObstacleGrid) -> None
+            A grid made from the edges of every solid object's hitbox, so lots of rectangles can be checked against all
+            the objects at once with NumPy. The grid lines are only where hitboxes start and end, so each cell is either
+            completely inside an object or completely outside all of them, and the answers are exact. Objects are added
+            with add, and the grid is built again the next time it is used.
+        """
+        self.objects = []
+        self.stale = True
+        self.version = 0  # Goes up every time the objects change, so anything built from the grid knows to update
+
+        self.grid_x = None  # Sorted x and y positions of every grid line
+        self.grid_y = None
+        self.filled = None  # filled[row, column] is how many cells above and to the left of that corner are solid
+
+    def add(self, object):
+        """ (ObstacleGrid, Object) -> None
+            Adds object's hitbox to the grid
+        """
+        self.objects.append(object)
+        self.stale = True
+        self.version += 1
+
+    def clear(self):
+        """ (ObstacleGrid) -> None
+            Removes every object, for when a new game starts
+        """
+        self.objects = []
+        self.stale = True
+        self.version += 1
+
+    def build(self):
+        """ (ObstacleGrid) -> None
+            Works out the grid lines and which cells are solid
+        """
+        hitboxes = [object.hitbox for object in self.objects]
+        self.grid_x = numpy.unique([edge for hitbox in hitboxes for edge in (hitbox[0], hitbox[0] + hitbox[2])])
+        self.grid_y = numpy.unique([edge for hitbox in hitboxes for edge in (hitbox[1], hitbox[1] + hitbox[3])])
+
+        solid = numpy.zeros((max(len(self.grid_y) - 1, 0), max(len(self.grid_x) - 1, 0)), numpy.int32)
+        for hitbox in hitboxes:
+            left, right = numpy.searchsorted(self.grid_x, (hitbox[0], hitbox[0] + hitbox[2]))
+            top, bottom = numpy.searchsorted(self.grid_y, (hitbox[1], hitbox[1] + hitbox[3]))
+            solid[top:bottom, left:right] = 1
+
+        # Adding up the solid cells ahead of time means any rectangle of cells can be counted with four lookups
+        self.filled = numpy.zeros((solid.shape[0] + 1, solid.shape[1] + 1), numpy.int32)
+        self.filled[1:, 1:] = solid.cumsum(0).cumsum(1)
+        self.stale = False
+
+    def collides(self, x, y, width, height):
+        """ (ObstacleGrid, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray) -> numpy.ndarray
+            Takes arrays of rectangles and returns an array that is True for every rectangle that collides with a
+            solid object, the same way SpatialHash.collides would for each one
+        """
+        if self.stale:
+            self.build()
+
+        columns = len(self.grid_x) - 1
+        rows = len(self.grid_y) - 1
+        if columns <= 0 or rows <= 0:
+            return numpy.zeros(numpy.shape(x), bool)
+
+        # The cells overlapping each rectangle, from first to last (not including last)
+        # numpy.minimum and numpy.maximum are used instead of numpy.clip, which is a lot slower on small arrays
+        first_column = numpy.minimum(numpy.maximum(numpy.searchsorted(self.grid_x, x, "right") - 1, 0), columns)
+        last_column = numpy.minimum(numpy.maximum(numpy.searchsorted(self.grid_x, numpy.add(x, width), "left"),
+                                                  first_column), columns)
+        first_row = numpy.minimum(numpy.maximum(numpy.searchsorted(self.grid_y, y, "right") - 1, 0), rows)
+        last_row = numpy.minimum(numpy.maximum(numpy.searchsorted(self.grid_y, numpy.add(y, height), "left"),
+                                               first_row), rows)
+
+        solid_cells = (self.filled[last_row, last_column] - self.filled[first_row, last_column] -
+                       self.filled[last_row, first_column] + self.filled[first_row, first_column])
+        return solid_cells > 0
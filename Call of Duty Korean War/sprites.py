@@ -0,0 +1,59 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Sprite caches. Scaling, flipping and rotating surfaces is slow, so it is done once here instead of on every blit.
+
+from collections import OrderedDict
+
+import pygame
+
+
+class SpriteVariants:
+    def __init__(self, frames, size=None, corpse_angle=270):
+        """ (SpriteVariants, list, tuple, int) -> None
+            Pre-bakes every animation frame in all the ways a character gets drawn. frames is the list of walk
+            images, size is what to scale them to (None keeps their size), and corpse_angle is how far to rotate the
+            first frame to get the image of the character lying dead on the ground.
+        """
+        if size is not None:
+            frames = [pygame.transform.scale(frame, size) for frame in frames]
+
+        self.frames = frames  # Facing right
+        self.flipped = [pygame.transform.flip(frame, True, False) for frame in frames]  # Facing left
+        self.corpse = pygame.transform.rotate(frames[0], corpse_angle)
+
+    def facing(self, frame, flipped):
+        """ (SpriteVariants, int, bool) -> pygame.Surface
+            Returns animation frame number frame, mirrored if flipped is True
+        """
+        if flipped:
+            return self.flipped[frame]
+        return self.frames[frame]
+
+
+class RotationCache:
+    def __init__(self, step=2, max_size=1024):
+        """ (RotationCache, int, int) -> None
+            Creates a cache of rotated images. Angles are rounded to the nearest multiple of step degrees, so an image
+            only has 360 / step different rotations. Each rotation is made the first time it is needed, and once there
+            are more than max_size of them, the one that was used the longest time ago is thrown away.
+        """
+        self.step = step
+        self.max_size = max_size
+        self.rotations = OrderedDict()  # (image, angle) -> rotated image, with the most recently used at the end
+
+    def rotate(self, image, angle):
+        """ (RotationCache, pygame.Surface, float) -> pygame.Surface
+            Returns image rotated by angle degrees (counter-clockwise, like pygame.transform.rotate), rounded to the
+            nearest step.
+        """
+        key = (image, round(angle / self.step) * self.step % 360)
+
+        rotated = self.rotations.get(key)
+        if rotated is None:
+            rotated = pygame.transform.rotate(image, key[1])
+            self.rotations[key] = rotated
+            if len(self.rotations) > self.max_size:
+                self.rotations.popitem(last=False)  # Evict the least recently used rotation
+        else:
+            self.rotations.move_to_end(key)
+
+        return rotated
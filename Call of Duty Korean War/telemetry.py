@@ -0,0 +1,171 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Keeps how long every frame of a game took to show, to find out how often the game stutters on real computers. The
+#  times are counted in histograms for each wave of each game mode, and saved when the game ends.
+
+import csv
+import json
+import os
+import time
+
+SUB_BUCKETS = 8  # Each doubling of frame time is split into this many buckets, so every bucket is within 12.5%
+EXACT = 2 * SUB_BUCKETS  # Times shorter than this many milliseconds each get their own bucket
+PERCENTILES = (50, 95, 99)
+
+
+def bucket(value):
+    """ (int) -> int
+        Returns which bucket a time of value milliseconds goes in. Short times are counted exactly, and longer ones in
+        buckets that get wider the longer they are, like in an HDR histogram.
+    """
+    if value < EXACT:
+        return max(value, 0)
+    shift = value.bit_length() - SUB_BUCKETS.bit_length()  # Keeps the top bits of value, which pick the sub-bucket
+    return EXACT + (shift - 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+
+
+def bucket_range(index):
+    """ (int) -> tuple
+        Returns the shortest and longest times, in milliseconds, that go in the bucket index
+    """
+    if index < EXACT:
+        return index, index
+    shift = (index - EXACT) // SUB_BUCKETS + 1
+    lowest = (SUB_BUCKETS + (index - EXACT) % SUB_BUCKETS) << shift
+    return lowest, lowest + (1 << shift) - 1
+
+
+class FrameTimes:
+    def __init__(self):
+        """ (FrameTimes) -> None
+            A histogram of frame times, in whole milliseconds
+        """
+        self.counts = {}  # Bucket: how many frames were in it
+        self.count = 0
+        self.total = 0
+        self.longest = 0
+
+    def record(self, value):
+        """ (FrameTimes, int) -> None
+            Counts a frame that took value milliseconds
+        """
+        index = bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.longest:
+            self.longest = value
+
+    def merge(self, other):
+        """ (FrameTimes, FrameTimes) -> None
+            Adds the frames counted in other to this histogram
+        """
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.longest = max(self.longest, other.longest)
+
+    def percentile(self, percent):
+        """ (FrameTimes, float) -> int
+            Returns the time that percent of the frames were no longer than. This is the longest time in the bucket it
+            falls in, so it is never less than the real time.
+        """
+        needed = self.count * percent / 100
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= needed:
+                return min(bucket_range(index)[1], self.longest)
+        return self.longest
+
+    def summary(self):
+        """ (FrameTimes) -> dict
+            Returns the number of frames, the mean, the percentiles in PERCENTILES and the longest time
+        """
+        summary = {"frames": self.count, "mean": round(self.total / self.count, 2) if self.count else 0}
+        for percent in PERCENTILES:
+            summary["p" + str(percent)] = self.percentile(percent)
+        summary["max"] = self.longest
+        return summary
+
+
+class SessionTelemetry:
+    def __init__(self, folder=None):
+        """ (SessionTelemetry, str) -> None
+            Counts frame times for each wave of a game, and saves them to a JSON and a CSV file in folder when the
+            game ends. Nothing is saved if folder is None.
+        """
+        self.folder = folder
+        self.mode = None
+        self.started = None
+        self.waves = {}  # (mode, wave): FrameTimes
+
+    def start(self, mode):
+        """ (SessionTelemetry, str) -> None
+            Starts counting frame times for a new game of mode. Times from a game that was left without being saved
+            are saved first.
+        """
+        self.save()
+        self.mode = mode
+        self.started = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    def record(self, wave, value):
+        """ (SessionTelemetry, int, int) -> None
+            Counts a frame during wave that took value milliseconds
+        """
+        histogram = self.waves.get((self.mode, wave))
+        if histogram is None:
+            histogram = self.waves[(self.mode, wave)] = FrameTimes()
+        histogram.record(value)
+
+    def rows(self):
+        """ (SessionTelemetry) -> list
+            Returns a summary of each wave, followed by a summary of the whole game, as a list of dictionaries
+        """
+        rows = []
+        whole_game = FrameTimes()
+        for (mode, wave), histogram in sorted(self.waves.items(), key=lambda item: item[0][1] or 0):  # In wave order
+            rows.append(dict(mode=mode, wave=wave, **histogram.summary()))
+            whole_game.merge(histogram)
+        rows.append(dict(mode=self.mode, wave="all", **whole_game.summary()))
+        return rows
+
+    def save(self):
+        """ (SessionTelemetry) -> None
+            Saves the frame times of the game to the folder, and starts counting again from nothing
+        """
+        if self.folder is not None and self.waves:
+            os.makedirs(self.folder, exist_ok=True)
+            rows = self.rows()
+
+            with self.new_file() as file:
+                name = os.path.splitext(file.name)[0]
+                json.dump({
+                    "mode": self.mode,
+                    "started": self.started,
+                    "summary": rows,
+                    "histograms": [{"mode": mode, "wave": wave,
+                                    "buckets": [[*bucket_range(index), count]
+                                                for index, count in sorted(histogram.counts.items())]}
+                                   for (mode, wave), histogram in self.waves.items()],
+                }, file, indent=2)
+
+            with open(name + ".csv", "w", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
+
+        self.waves = {}
+
+    def new_file(self):
+        """ (SessionTelemetry) -> file
+            Opens a new JSON file to save to, named after the mode and the time. Two games can end in the same second,
+            like when a game is left and a new one started, so a number is added to the name if it's taken.
+        """
+        name = os.path.join(self.folder, "frames-{}-{}".format(str(self.mode).lower(), time.strftime("%Y%m%d-%H%M%S")))
+        number = 1
+        while True:
+            try:
+                return open(name + ("-" + str(number) if number > 1 else "") + ".json", "x")
+            except FileExistsError:
+                number += 1
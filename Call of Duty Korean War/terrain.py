@@ -0,0 +1,146 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Static scenery (trees, rocks, wrecks, bodies) is pre-drawn onto big square chunks of the map, so each frame only has
+#  to draw the few chunks that are on screen instead of every object one at a time.
+
+from collections import OrderedDict
+
+import pygame
+
+CHUNK_SIZE = 512  # Width and height of a chunk, in pixels of the game world
+TRANSPARENT = (255, 0, 255)  # Colour that chunks without a background are filled with, and that isn't drawn
+
+
+class Decal:
+    def __init__(self, image, x, y):
+        """ (Decal, pygame.Surface, int, int) -> None
+            An image left lying on the ground at (x, y) in the game world for good, like a body. It has the same
+            position, size and image as an Object, so it can be added to a layer the same way.
+        """
+        self.image = image
+        self.x = x
+        self.y = y
+        self.width, self.height = image.get_size()
+        self.baked = False
+
+
+class TerrainLayer:
+    def __init__(self, background=None, chunk_size=CHUNK_SIZE, max_chunks=64):
+        """ (TerrainLayer, tuple, int, int) -> None
+            Creates an empty layer of scenery. If background is a colour, every chunk is filled with it first, so the
+            layer can be drawn instead of filling the screen. Without a background, the layer is see-through and is
+            drawn on top of everything else. Only the max_chunks chunks that were drawn most recently are kept, the
+            rest are thrown away and drawn again if they come back on screen.
+        """
+        self.background = background
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+
+        self.objects_in_chunk = {}  # (chunk x, chunk y) -> list of objects touching that chunk, in the order added
+        self.chunks = OrderedDict()  # (chunk x, chunk y) -> finished chunk image, with the most recently used last
+        self.scaled_images = {}  # (image, width, height) -> scaled image, so identical objects are only scaled once
+
+        # Every chunk with nothing in it looks the same, so they all share one image
+        self.blank = None
+        if background is not None:
+            self.blank = pygame.Surface((chunk_size, chunk_size)).convert()
+            self.blank.fill(background)
+
+    def chunks_touching(self, x, y, width, height):
+        """ (TerrainLayer, int, int, int, int) -> list
+            Returns the coordinates of every chunk that overlaps the rectangle (x, y, width, height) in the game world
+        """
+        first_x, last_x = x // self.chunk_size, (x + width - 1) // self.chunk_size
+        first_y, last_y = y // self.chunk_size, (y + height - 1) // self.chunk_size
+
+        return [(chunk_x, chunk_y) for chunk_x in range(first_x, last_x + 1) for chunk_y in range(first_y, last_y + 1)]
+
+    def add(self, object):
+        """ (TerrainLayer, Object) -> None
+            Draws object into this layer from now on. Only the chunks the object touches have to be drawn again.
+        """
+        for chunk in self.chunks_touching(object.x, object.y, object.width, object.height):
+            self.objects_in_chunk.setdefault(chunk, []).append(object)
+            self.chunks.pop(chunk, None)  # Mark the chunk to be drawn again
+
+        object.baked = True  # The object doesn't have to draw itself anymore
+
+    def remove(self, object):
+        """ (TerrainLayer, Object) -> None
+            Stops drawing object into this layer. The chunks it touched are drawn again without it.
+        """
+        for chunk in self.chunks_touching(object.x, object.y, object.width, object.height):
+            objects = self.objects_in_chunk.get(chunk)
+            if objects is not None and object in objects:
+                objects.remove(object)
+            self.chunks.pop(chunk, None)
+
+        object.baked = False
+
+    def refresh(self, object):
+        """ (TerrainLayer, Object) -> None
+            Call this when an object in the layer changes, so the chunks it touches get drawn again
+        """
+        for chunk in self.chunks_touching(object.x, object.y, object.width, object.height):
+            self.chunks.pop(chunk, None)
+
+    def clear(self):
+        """ (TerrainLayer) -> None
+            Removes all objects from the layer, for when a new game starts
+        """
+        for objects in self.objects_in_chunk.values():
+            for object in objects:
+                object.baked = False
+
+        self.objects_in_chunk = {}
+        self.chunks.clear()
+
+    def build_chunk(self, chunk):
+        """ (TerrainLayer, tuple) -> pygame.Surface
+            Draws all the objects touching a chunk onto a new image. Returns None if there is nothing to draw.
+        """
+        objects = self.objects_in_chunk.get(chunk)
+        if not objects:
+            return self.blank
+
+        image = pygame.Surface((self.chunk_size, self.chunk_size)).convert()
+        if self.background is not None:
+            image.fill(self.background)
+        else:
+            image.fill(TRANSPARENT)
+            image.set_colorkey(TRANSPARENT, pygame.RLEACCEL)
+
+        chunk_x, chunk_y = chunk[0] * self.chunk_size, chunk[1] * self.chunk_size
+        for object in objects:
+            if object.image.get_size() == (object.width, object.height):
+                scaled_image = object.image  # Already the right size, like decals
+            else:
+                key = (object.image, object.width, object.height)
+                if key not in self.scaled_images:
+                    self.scaled_images[key] = pygame.transform.scale(object.image, (object.width, object.height))
+                scaled_image = self.scaled_images[key]
+            image.blit(scaled_image, (object.x - chunk_x, object.y - chunk_y))
+
+        return image
+
+    def draw(self, surface, camera, area=None):
+        """ (TerrainLayer, pygame.Surface, Camera, pygame.Rect) -> None
+            Draws every chunk that is on screen, building the ones that aren't ready yet. If area is given, only that
+            part of the screen is drawn, which is used to erase things drawn there last frame.
+        """
+        if area is None:
+            area = surface.get_rect()
+
+        for chunk in self.chunks_touching(camera.x + area[0], camera.y + area[1], area[2], area[3]):
+            if chunk in self.chunks:
+                self.chunks.move_to_end(chunk)
+            else:
+                self.chunks[chunk] = self.build_chunk(chunk)
+                if len(self.chunks) > self.max_chunks:
+                    self.chunks.popitem(last=False)  # Forget the chunk that was on screen the longest time ago
+
+            image = self.chunks[chunk]
+            if image is not None:
+                chunk_rect = pygame.Rect(camera.to_screen(chunk[0] * self.chunk_size, chunk[1] * self.chunk_size),
+                                         (self.chunk_size, self.chunk_size))
+                visible_part = chunk_rect.clip(area)
+                surface.blit(image, visible_part.topleft, visible_part.move(-chunk_rect[0], -chunk_rect[1]))
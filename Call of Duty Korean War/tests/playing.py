@@ -0,0 +1,39 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Shared setup for the tests that play the game. The whole game is loaded with no window or sound, and each test
+#  starts on a new game of Survival, with the player's input coming from code.
+
+import os
+import unittest
+
+# These have to be set before pygame starts up, which happens when the game is imported
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+
+import controls
+
+missing = ""
+try:
+    import main as game
+except (FileNotFoundError, pygame.error) as error:  # Some of the game's images aren't there
+    game = None
+    missing = str(error)
+
+
+@unittest.skipIf(game is None, "the game's files can't be loaded: " + missing)
+class GameTest(unittest.TestCase):
+    seed = 3  # Every test starts from the same game
+
+    def setUp(self):
+        game.music = False
+        game.sound_fx = False
+        self.pilot = controls.VirtualControls()
+        game.player_input = self.pilot
+        self.objects = game.setup_survival(self.seed)
+
+    def frame(self, wave=1):
+        """ (GameTest, int) -> str
+            Runs one frame of Survival during wave, and returns what game_engine returned
+        """
+        return game.game_engine(self.objects, "Survival", wave)
@@ -0,0 +1,74 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Tests for taking bullets and enemies out of their lists at the end of a frame, and for nothing being left over
+#  for the next game. These load the whole game:
+#      python -m unittest tests.test_cleanup
+
+import unittest
+
+import pygame
+
+from tests.playing import GameTest, game
+
+
+class CleanupTest(GameTest):
+    def test_bullets_next_to_each_other_all_go(self):
+        # Removing from the list while going through it used to skip the bullet after each one removed
+        bullets = [game.Bullet(game.player.x + 3000, game.player.y + 3000 + i * 50, game.player.x, game.player.y,
+                               game.m1911, 10) for i in range(6)]
+        for bullet in bullets:
+            bullet.range = 0  # Runs out this frame
+        game.player_bullets.extend(bullets)
+
+        self.frame()
+        self.assertEqual(game.player_bullets, [])
+        self.assertTrue(all(bullet.removed for bullet in bullets))
+        self.assertFalse(any(game.projectile_pool.active[bullet.slot] for bullet in bullets))
+
+        # Their slots are used again, instead of the pool growing
+        used = game.projectile_pool.used
+        game.player_bullets.extend(game.Bullet(game.player.x + 3000, game.player.y + 3000, game.player.x,
+                                               game.player.y, game.m1911, 10) for i in range(6))
+        self.assertEqual(game.projectile_pool.used, used)
+
+    def test_enemies_next_to_each_other_all_go(self):
+        for i in range(5):
+            enemy = game.American(game.player.x + 3000, game.player.y + 3000 + i * 100, game.m3, game.m1911, 100)
+            enemy.health = 0
+            game.enemies.append(enemy)
+
+        for i in range(3):
+            self.frame()
+        self.assertEqual(game.enemies, [])
+        self.assertEqual(len(game.corpses.query(pygame.Rect(game.player.x + 2900, game.player.y + 2900, 300, 700))), 5)
+
+    def test_spent_enemy_bullets_do_nothing(self):
+        bullet = game.Bullet(game.player.x + 3000, game.player.y, game.player.x, game.player.y, game.m1911, 10)
+        bullet.range = 0
+        bullet.x, bullet.y = game.player.hitbox.center  # Sitting on the player, but out of range
+        game.enemy_bullets.append(bullet)
+        health = game.player.health
+
+        self.frame()
+        self.assertEqual(game.enemy_bullets, [])
+        self.assertEqual(game.player.health, health)
+
+    def test_explosions_dont_last_into_the_next_game(self):
+        # Detonating C4 on the frame the player dies ends the game before the explosion does its damage
+        game.list_of_c4.append(game.C4(game.player.x, game.player.y))
+        self.pilot.press(pygame.K_j)
+        game.player.health = 0
+        game.player.armour = 0
+        self.assertEqual(game.game_engine(self.objects, "Survival", 1), "Dead")
+        self.assertNotEqual(game.explosions, [])
+
+        self.objects = game.setup_survival(self.seed)
+        enemy = game.American(game.player.x + 60, game.player.y, game.m3, game.m1911, 100)
+        game.enemies.append(enemy)
+        self.pilot.held = set()
+        self.frame()
+        self.assertEqual(enemy.health, 100)
+        self.assertEqual(game.player.health + game.player.armour, 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Tests for the enemies, and for how often far away ones are updated. These load the whole game:
+#      python -m unittest tests.test_enemies
+
+import unittest
+
+import pygame
+
+from tests.playing import GameTest, game
+
+
+class EarlyDeathTest(GameTest):
+    def test_killed_before_first_turn(self):
+        # Far away enemies only take a turn every few frames, and the gun angle used to be worked out on that turn
+        enemy = game.American(3000, 3000, game.m3, game.m1911, 100)
+        game.enemies.append(enemy)
+        enemy.ticks = 0
+        enemy.health = 0
+        enemy.main()
+
+        self.assertTrue(enemy.dead)
+        corpses = game.corpses.query_point(enemy.hitbox.centerx, enemy.hitbox.centery)
+        self.assertEqual(len(corpses), 1)
+        self.assertIsInstance(corpses[0].angle, float)
+        corpses[0].swap_weapon()  # Picking the gun up puts the player's gun down at the same angle
+
+    def test_c4_on_a_new_wave(self):
+        game.list_of_c4.append(game.C4(3000, 3000))
+        game.spawn_wave(1)
+        self.pilot.press(pygame.K_j)
+        for frame in range(5):
+            self.frame()
+            self.pilot.held = set()
+        self.assertGreater(game.player.kills, 0)
+
+
+class LevelOfDetailTest(GameTest):
+    def test_far_enemies_keep_up(self):
+        near = game.American(game.player.x + 300, game.player.y, game.m3, game.m1911, 100)
+        far = [game.American(game.player.x + 3000, game.player.y + 3000 + i * 200, game.m3, game.m1911, 100)
+               for i in range(4)]
+        game.enemies.extend([near] + far)
+
+        done = {enemy: 0 for enemy in game.enemies}
+        for frame in range(4 * game.ai_lod.interval):
+            self.frame()
+            self.assertEqual(near.ticks, 1)
+            for enemy in far:
+                self.assertIn(enemy.ticks, (0, game.ai_lod.interval))
+                done[enemy] += enemy.ticks
+        for enemy in far:
+            self.assertEqual(done[enemy], 4 * game.ai_lod.interval)  # Every frame that was skipped is caught up on
+
+    def test_same_turns_every_game(self):
+        def turns():
+            game.enemies.extend(game.American(3000, 3000 + i * 200, game.m3, game.m1911, 100) for i in range(3))
+            played = []
+            for frame in range(6):
+                self.frame()
+                played.append([enemy.ticks for enemy in game.enemies])
+            return played
+
+        first = turns()
+        for frame in range(5):  # A game that lasts a different number of frames
+            self.frame()
+        self.objects = game.setup_survival(self.seed)
+        self.assertEqual(turns(), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Tests that a seed or a recording always plays the same game, however many games were played before it. These load
+#  the whole game, and play a wave with the bot:
+#      python -m unittest tests.test_headless
+
+import os
+import tempfile
+import unittest
+
+from tests.playing import GameTest, game
+
+
+def outcome(reports):
+    """ (list) -> list
+        Returns the reports from headless.play without how long they took for real, which is never the same twice
+    """
+    return [{key: value for key, value in report.items() if key != "real_seconds"} for report in reports]
+
+
+class SameSeedTest(GameTest):
+    def test_same_seed_same_game(self):
+        import headless  # Only once it's known the game can be loaded
+
+        first = outcome(headless.play(1, seed=7))
+        headless.play(1, seed=4)  # A different game in between, that ends in a different state
+        second = outcome(headless.play(1, seed=7))
+
+        self.assertTrue(first)
+        self.assertEqual(first, second)
+
+    def test_every_recording_plays_back(self):
+        # Only the first game recorded in a run used to play back the same, since the others started with things left
+        # over from the game before
+        import headless
+
+        with tempfile.TemporaryDirectory() as folder:
+            recordings = []
+            for seed in (11, 11, 4):
+                reports = outcome(headless.play(1, seed=seed, record=folder))
+                recordings.append((game.player_input.path, reports))
+            self.assertEqual(len(os.listdir(folder)), 3)  # The two seed 11 games didn't write over each other
+
+            for path, reports in reversed(recordings):
+                self.assertEqual(outcome(headless.play_recording(path)), reports, path)
+
+
+if __name__ == '__main__':
+    unittest.main()
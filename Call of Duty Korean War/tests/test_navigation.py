@@ -0,0 +1,72 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Tests for the flow field enemies follow to the player. These don't need the game's images, so they can be run from
+#  anywhere:
+#      python -m unittest tests.test_navigation
+
+import unittest
+
+import pygame
+
+import navigation
+import spatial
+
+
+class Rock:
+    def __init__(self, x, y, width, height):
+        """ (Rock, int, int, int, int) -> None
+            Something solid, with only the hitbox the obstacle grid needs
+        """
+        self.hitbox = pygame.Rect(x, y, width, height)
+
+
+def walk(field, x, y, steps):
+    """ (FlowField, int, int, int) -> list
+        Follows the field from (x, y) one cell at a time, and returns every cell it went through
+    """
+    cells = [(x // field.cell_size, y // field.cell_size)]
+    for i in range(steps):
+        step = field.direction(x, y)
+        if step is None:
+            break
+        x += step[0] * field.cell_size
+        y += step[1] * field.cell_size
+        cells.append((x // field.cell_size, y // field.cell_size))
+    return cells
+
+
+class FlowFieldTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = spatial.ObstacleGrid()
+        self.field = navigation.FlowField(self.grid, 20, 20, radius=12)
+
+    def test_goes_around_a_wall(self):
+        wall = Rock(160, -200, 32, 400)  # Between the enemy and the goal, with gaps above and below it
+        self.grid.add(wall)
+        self.field.update(0, 0)
+
+        cells = walk(self.field, 320, 0, 40)
+        self.assertEqual(cells[-1], (0, 0))
+        for column, row in cells:
+            rect = pygame.Rect(column * 32, row * 32, 32 + 20 - 1, 32 + 20 - 1)
+            self.assertFalse(rect.colliderect(wall.hitbox), (column, row))
+
+    def test_new_terrain_is_worked_out_at_once(self):
+        self.grid.add(Rock(64, -400, 32, 800))
+        self.field.update(0, 0)
+        walk(self.field, 200, 0, 40)
+
+        # The rocks move, like when a new game is started
+        self.grid.clear()
+        self.grid.add(Rock(-128, -400, 32, 800))
+        self.field.reset()
+        self.field.update(0, 0)
+
+        fresh = navigation.FlowField(self.grid, 20, 20, radius=12)
+        fresh.update(0, 0)
+        self.assertEqual(walk(self.field, 200, 0, 40), walk(fresh, 200, 0, 40))
+        self.assertEqual(walk(self.field, -300, 0, 40), walk(fresh, -300, 0, 40))
+        self.assertFalse(self.field.wanted)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Tests for the projectile pool. These don't need the game's images, so they can be run from anywhere:
+#      python -m unittest tests.test_projectiles
+
+import unittest
+
+import pygame
+
+import projectiles
+
+
+class ProjectilePoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = projectiles.ProjectilePool(4)
+
+    def test_slots_are_used_again(self):
+        slots = [self.pool.add(i, 0, 1, 0, 10, 5, projectiles.BULLET) for i in range(4)]
+        self.assertEqual(slots, [0, 1, 2, 3])
+
+        self.pool.release(1)
+        self.pool.release(3)
+        self.pool.release(3)  # Giving a slot back twice can't hand it out twice
+        self.assertEqual(list(self.pool.active), [True, False, True, False])
+
+        self.assertEqual(self.pool.add(50, 60, 1, 1, 20, 7, projectiles.ROCKET), 3)
+        self.assertEqual(self.pool.add(70, 80, 1, 1, 20, 7, projectiles.ROCKET), 1)
+        self.assertEqual(self.pool.add(90, 90, 1, 1, 20, 7, projectiles.ROCKET), 4)  # Only once there are no gaps
+        self.assertEqual(self.pool.used, 5)
+
+        # A reused slot starts over, with nothing left from the projectile that had it before
+        self.assertEqual((self.pool.x[1], self.pool.y[1], self.pool.last_x[1], self.pool.range[1]), (70, 80, 70, 20))
+        self.assertEqual((self.pool.damage[1], self.pool.kind[1], self.pool.exploding[1]), (7, projectiles.ROCKET,
+                                                                                           False))
+
+    def test_growing_keeps_everything(self):
+        for i in range(9):
+            self.pool.add(i, -i, 2, 3, 100 + i, i, projectiles.BULLET if i % 2 else projectiles.ROCKET)
+        self.assertEqual(self.pool.capacity, 16)
+        self.assertEqual(list(self.pool.x[:9]), list(range(9)))
+        self.assertEqual(list(self.pool.y[:9]), [-i for i in range(9)])
+        self.assertEqual(list(self.pool.range[:9]), [100 + i for i in range(9)])
+        self.assertEqual(list(self.pool.kind[:9]), [i % 2 == 0 and projectiles.ROCKET or projectiles.BULLET
+                                                    for i in range(9)])
+        self.assertEqual(self.pool.active.sum(), 9)
+
+    def test_update(self):
+        bullet = self.pool.add(100, 100, 10, -5, 1, 5, projectiles.BULLET)
+        rocket = self.pool.add(100, 100, 10, -5, 2, 5, projectiles.ROCKET)
+        grenade = self.pool.add(100, 100, 10, -5, 2, 5, projectiles.GRENADE)
+        gone = self.pool.add(100, 100, 10, -5, 5, 5, projectiles.BULLET)
+        self.pool.release(gone)
+
+        self.pool.update()  # Projectiles move backwards by their step
+        self.assertEqual((self.pool.x[bullet], self.pool.y[bullet]), (90, 105))
+        self.assertEqual((self.pool.x[rocket], self.pool.y[rocket]), (90, 105))
+        self.assertEqual((self.pool.x[grenade], self.pool.y[grenade], self.pool.range[grenade]), (100, 100, 2))
+        self.assertEqual((self.pool.x[gone], self.pool.range[gone]), (100, 5))
+
+        # The bullet moved on the frame its range reached 0, but the rocket stops when it does
+        self.pool.update()
+        self.assertEqual((self.pool.x[bullet], self.pool.last_x[bullet], self.pool.range[bullet]), (90, 90, -1))
+        self.assertEqual((self.pool.x[rocket], self.pool.range[rocket]), (90, 0))
+
+    def test_exploding_rockets_stop(self):
+        rocket = self.pool.add(0, 0, -4, 0, 50, 5, projectiles.ROCKET)
+        self.pool.update()
+        self.pool.exploding[rocket] = True
+        self.pool.update()
+        self.assertEqual(self.pool.x[rocket], 4)
+
+    def test_touching(self):
+        fast = self.pool.add(0, 0, -100, 0, 10, 5, projectiles.BULLET)  # Goes right through the box in one frame
+        close = self.pool.add(25, 0, -1, 0, 10, 5, projectiles.BULLET)  # Only reaches the box if it's big enough
+        away = self.pool.add(45, 40, 0, -10, 10, 5, projectiles.BULLET)
+        self.pool.update()
+
+        box = pygame.Rect(40, -5, 10, 10)
+        self.assertEqual(list(self.pool.touching(box)), [True, False, False])
+        self.assertEqual(list(self.pool.touching(box, size=20)), [True, True, False])
+        self.pool.release(fast)
+        self.assertEqual(list(self.pool.touching(box, size=20)), [False, True, False])
+
+    def test_clear(self):
+        for i in range(6):
+            self.pool.add(i, i, 1, 1, 10, 5, projectiles.BULLET)
+        self.pool.release(2)
+        self.pool.clear()
+        self.assertEqual((self.pool.used, self.pool.free_slots, self.pool.active.sum()), (0, [], 0))
+        self.assertEqual(self.pool.add(1, 1, 1, 1, 10, 5, projectiles.BULLET), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Tests for recording and replaying games. These don't need the game's images, so they can be run from anywhere:
+#      python -m unittest tests.test_replay
+
+import os
+import tempfile
+import unittest
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+
+import controls
+import replay
+
+
+def setUpModule():
+    pygame.display.init()  # Both kinds of controls clear pygame's events every frame, which needs the display
+
+
+def seen(events):
+    """ (list) -> list
+        Returns the parts of events that get saved, so events from the recording and the playback can be compared.
+        Keys the game doesn't use are all saved as the same other key, which comes back as 0.
+    """
+    return [(event.type, (event.key if event.key in replay.KEYS else 0) if event.type == pygame.KEYDOWN else None,
+             getattr(event, "button", None)) for event in events]
+
+
+class RoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.source = controls.VirtualControls()
+        self.recorder = replay.Recorder(self.source, self.folder.name)
+
+    def tearDown(self):
+        self.recorder.end_game()
+        self.folder.cleanup()
+
+    def record(self, frames):
+        """ (RoundTripTest, list) -> list
+            Feeds each frame to the recorder, where a frame is a function that sets up the source's input. Returns
+            what the game would have seen each frame.
+        """
+        game_saw = []
+        for frame in frames:
+            frame(self.source)
+            events = self.recorder.events()
+            game_saw.append((seen(events), {key for key in replay.KEYS if self.recorder.keys()[key]},
+                             self.recorder.mouse_position(), self.recorder.mouse_buttons()))
+        self.recorder.end_game()
+        return game_saw
+
+    def play(self, count):
+        """ (RoundTripTest, int) -> (Playback, list)
+            Plays back count frames of the recording and returns what the game would have seen each frame
+        """
+        playback = replay.Playback(self.recorder.path)
+        game_saw = []
+        for i in range(count):
+            events = playback.events()
+            game_saw.append((seen(events), {key for key in replay.KEYS if playback.keys()[key]},
+                             playback.mouse_position(), playback.mouse_buttons()))
+        return playback, game_saw
+
+    def test_frames_come_back_the_same(self):
+        def nothing(source):
+            pass
+
+        def walk(source):
+            source.held = {pygame.K_w, pygame.K_d}
+            source.position = (400, 300)
+
+        def grenade(source):
+            source.press(pygame.K_g)
+            source.press(pygame.K_q)  # Not a key the game uses, so it comes back as some other key
+
+        def shoot(source):
+            source.held = set()
+            source.position = (-20, 710)
+            source.buttons = (True, False, False)
+            source.click()
+
+        def let_go(source):
+            source.buttons = (False, False, False)
+            source.click(3)
+
+        frames = [nothing] * 3 + [walk] + [nothing] * 500 + [grenade, shoot, shoot, let_go] + [nothing] * 2
+        self.recorder.new_game("Survival", -1950)
+        recorded = self.record(frames)
+
+        playback, played = self.play(len(frames))
+        self.assertEqual(playback.mode, "Survival")
+        self.assertEqual(playback.seed, -1950)
+        self.assertTrue(playback.finished)
+        self.assertEqual(playback.frames, len(frames))
+
+        for frame, (want, got) in enumerate(zip(recorded, played)):
+            self.assertEqual(want, got, "frame {} played back differently".format(frame))
+
+    def test_quit_ends_the_recording(self):
+        def leave(source):
+            source.queued.append(pygame.event.Event(pygame.QUIT))
+
+        def walk(source):
+            source.held = {pygame.K_s}
+
+        self.recorder.new_game("Survival", 7)
+        self.record([walk, leave])
+        self.assertIsNone(self.recorder.file)
+
+        playback, played = self.play(4)
+        self.assertTrue(playback.finished)
+        self.assertEqual(playback.frames, 2)
+        self.assertEqual(played[1][0], [])  # The QUIT itself isn't passed on, or it would close the game
+        self.assertEqual(played[3], ([], {pygame.K_s}, (0, 0), (False, False, False)))
+
+    def test_games_started_in_the_same_second(self):
+        paths = []
+        for seed in (11, 11, 11):
+            self.recorder.new_game("Survival", seed)
+            self.record([lambda source: source.press(pygame.K_g)] * seed)
+            paths.append(self.recorder.path)
+
+        self.assertEqual(len(set(paths)), 3)
+        self.assertEqual(len(os.listdir(self.folder.name)), 3)
+        for path in paths:
+            playback = replay.Playback(path)
+            while not playback.finished:
+                playback.events()
+            self.assertEqual(playback.frames, 11)  # None of them was written over by the next one
+
+    def test_not_a_recording(self):
+        path = os.path.join(self.folder.name, "notes.rec")
+        with open(path, "wb") as file:
+            file.write(b"hello")
+        with self.assertRaises(ValueError):
+            replay.Playback(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Tests for deciding how often each enemy's AI runs. These don't need the game's images, so they can be run from
+#  anywhere:
+#      python -m unittest tests.test_scheduling
+
+import unittest
+
+import pygame
+
+import render
+import scheduling
+
+
+def turns(lod, camera, phases, frames):
+    """ (LevelOfDetail, Camera, list, int) -> list
+        Returns the ticks a far away enemy with each phase in phases gets on each of the next frames frames
+    """
+    far = pygame.Rect(100000, 100000, 10, 10)
+    result = []
+    for frame in range(frames):
+        lod.new_frame(camera)
+        result.append([lod.ticks(far, phase) for phase in phases])
+    return result
+
+
+class LevelOfDetailTest(unittest.TestCase):
+    def setUp(self):
+        self.camera = render.Camera()
+        self.lod = scheduling.LevelOfDetail(1000, 800)
+
+    def test_near_enemies_every_frame(self):
+        self.lod.new_frame(self.camera)
+        for phase in range(self.lod.interval):
+            self.assertEqual(self.lod.ticks(pygame.Rect(500, 400, 10, 10), phase), 1)
+            self.assertEqual(self.lod.ticks(pygame.Rect(-self.lod.margin + 1, 0, 10, 10), phase), 1)
+
+    def test_far_enemies_catch_up(self):
+        phases = [self.lod.next_phase() for i in range(8)]
+        played = turns(self.lod, self.camera, phases, 40)
+        for column in range(len(phases)):
+            ticks = [frame[column] for frame in played]
+            self.assertEqual(sum(ticks), 40)  # Every frame is done, just not on the frame it happened
+            self.assertEqual(set(ticks), {0, self.lod.interval})
+        self.assertEqual(sorted(set(phases)), list(range(self.lod.interval)))  # Spread over every frame
+
+    def test_reset_starts_over(self):
+        phases = [self.lod.next_phase() for i in range(5)]
+        first = turns(self.lod, self.camera, phases, 12)
+
+        for i in range(3):  # A game that didn't last a whole number of turns, with an odd number of enemies
+            self.lod.next_phase()
+        turns(self.lod, self.camera, phases, 7)
+
+        self.lod.reset()
+        self.assertEqual([self.lod.next_phase() for i in range(5)], phases)
+        self.assertEqual(turns(self.lod, self.camera, phases, 12), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Tests for the spatial hash and the obstacle grid. These don't need the game's images, so they can be run from
+#  anywhere:
+#      python -m unittest tests.test_spatial
+
+import random
+import unittest
+
+import numpy
+import pygame
+
+import spatial
+
+
+class Box:
+    def __init__(self, x, y, width, height):
+        """ (Box, int, int, int, int) -> None
+            Something solid, with only the hitbox the spatial hash needs
+        """
+        self.hitbox = pygame.Rect(x, y, width, height)
+
+    def __repr__(self):
+        return "Box" + str(tuple(self.hitbox))
+
+
+def random_boxes(rng, count, size):
+    """ (random.Random, int, int) -> list
+        Returns count boxes of up to size pixels scattered around the origin, some of them touching or overlapping
+    """
+    return [Box(rng.randrange(-600, 600), rng.randrange(-600, 600), rng.randrange(1, size), rng.randrange(1, size))
+            for i in range(count)]
+
+
+class SpatialHashTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(38)
+        self.boxes = random_boxes(self.rng, 80, 300)
+        self.hash = spatial.SpatialHash(64)
+        for box in self.boxes:
+            self.hash.add(box)
+
+    def test_query_finds_what_a_full_search_finds(self):
+        for i in range(500):
+            rect = pygame.Rect(self.rng.randrange(-700, 700), self.rng.randrange(-700, 700), self.rng.randrange(0, 200),
+                               self.rng.randrange(0, 200))
+            expected = [box for box in self.boxes if rect.colliderect(box.hitbox)]
+            found = self.hash.query(rect)
+            self.assertEqual(sorted(map(id, found)), sorted(map(id, expected)), rect)
+            self.assertEqual(len(set(map(id, found))), len(found), "an object was found more than once")
+            self.assertEqual(self.hash.collides(rect), bool(expected), rect)
+
+    def test_points_on_the_edge_count(self):
+        box = Box(100, 100, 28, 28)  # The right and bottom edges are on the line between two cells
+        self.hash.clear()
+        self.hash.add(box)
+        for x, y in ((100, 100), (128, 128), (128, 100), (100, 128), (114, 114)):
+            self.assertEqual(self.hash.query_point(x, y), [box], (x, y))
+        for x, y in ((99, 114), (129, 114), (114, 129), (-100, -100)):
+            self.assertEqual(self.hash.query_point(x, y), [], (x, y))
+
+    def test_query_point_finds_what_a_full_search_finds(self):
+        for i in range(500):
+            x, y = self.rng.randrange(-700, 700), self.rng.randrange(-700, 700)
+            expected = [box for box in self.boxes if box.hitbox.left <= x <= box.hitbox.right and
+                        box.hitbox.top <= y <= box.hitbox.bottom]
+            self.assertEqual(sorted(map(id, self.hash.query_point(x, y))), sorted(map(id, expected)), (x, y))
+
+    def test_remove(self):
+        for box in self.boxes[::2]:
+            self.hash.remove(box)
+        kept = self.boxes[1::2]
+        everything = pygame.Rect(-1000, -1000, 2000, 2000)
+        self.assertEqual(sorted(map(id, self.hash.query(everything))), sorted(map(id, kept)))
+
+        self.hash.clear()
+        self.assertFalse(self.hash.collides(everything))
+
+
+class ObstacleGridTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(1950)
+        self.grid = spatial.ObstacleGrid()
+        self.hash = spatial.SpatialHash()
+
+    def add(self, boxes):
+        for box in boxes:
+            self.grid.add(box)
+            self.hash.add(box)
+
+    def check(self, rects):
+        """ (ObstacleGridTest, list) -> None
+            Checks that the grid finds the same collisions for every rectangle in rects as the spatial hash
+        """
+        x, y, width, height = (numpy.array(values) for values in zip(*rects))
+        found = self.grid.collides(x, y, width, height)
+        self.assertEqual(found.shape, (len(rects),))
+        for rect, collides in zip(rects, found):
+            self.assertEqual(bool(collides), self.hash.collides(rect), rect)
+
+    def random_rects(self, count):
+        return [(self.rng.randrange(-700, 700), self.rng.randrange(-700, 700), self.rng.randrange(1, 150),
+                 self.rng.randrange(1, 150)) for i in range(count)]
+
+    def test_same_as_the_spatial_hash(self):
+        self.add(random_boxes(self.rng, 60, 200))
+        self.check(self.random_rects(2000))
+
+    def test_rectangles_touching_an_edge(self):
+        # Sharing an edge isn't a collision, and overlapping by a pixel is
+        self.add([Box(0, 0, 100, 50), Box(100, 0, 20, 20)])
+        self.check([(100, 20, 10, 10), (120, 0, 10, 10), (-10, 0, 10, 50), (0, 50, 120, 10), (119, 19, 5, 5),
+                    (99, 49, 1, 1), (-10, -10, 11, 11), (110, 20, 5, 30), (-50, -50, 500, 500), (30, 10, 5, 5)])
+
+    def test_adding_rebuilds_the_sums(self):
+        self.assertFalse(self.grid.collides(numpy.array([0]), numpy.array([0]), numpy.array([10]),
+                                            numpy.array([10]))[0])
+        self.add([Box(0, 0, 10, 10)])
+        version = self.grid.version
+        self.add([Box(200, 200, 50, 50)])
+        self.assertGreater(self.grid.version, version)
+        self.check([(5, 5, 1, 1), (220, 220, 1, 1), (100, 100, 10, 10)])
+
+        self.grid.clear()
+        self.hash.clear()
+        self.check([(5, 5, 1, 1), (220, 220, 1, 1)])
+
+    def test_sums_count_solid_cells(self):
+        # The sum of all the cells is the number of grid cells covered, however the boxes overlap
+        self.add(random_boxes(self.rng, 30, 200))
+        self.grid.build()
+        covered = 0
+        for row in range(len(self.grid.grid_y) - 1):
+            for column in range(len(self.grid.grid_x) - 1):
+                middle = ((self.grid.grid_x[column] + self.grid.grid_x[column + 1]) / 2,
+                          (self.grid.grid_y[row] + self.grid.grid_y[row + 1]) / 2)
+                covered += any(box.hitbox.left < middle[0] < box.hitbox.right and
+                               box.hitbox.top < middle[1] < box.hitbox.bottom for box in self.grid.objects)
+        self.assertEqual(self.grid.filled[-1, -1], covered)
+
+
+if __name__ == '__main__':
+    unittest.main()
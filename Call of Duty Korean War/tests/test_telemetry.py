@@ -0,0 +1,113 @@
+#  Call of Duty: Korean War by Jerry Cui
+#  Tests for the frame time histograms. These don't need the game's images, so they can be run from anywhere:
+#      python -m unittest tests.test_telemetry
+
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+import telemetry
+
+
+class BucketTest(unittest.TestCase):
+    def test_short_times_are_exact(self):
+        for value in range(telemetry.EXACT):
+            self.assertEqual(telemetry.bucket(value), value)
+            self.assertEqual(telemetry.bucket_range(value), (value, value))
+        self.assertEqual(telemetry.bucket(-3), 0)  # A clock going backwards counts as no time
+
+    def test_buckets_cover_every_time_once(self):
+        # Each bucket starts right after the one before it ends, so every time goes in exactly one bucket
+        end = -1
+        for index in range(telemetry.bucket(100000) + 1):
+            lowest, highest = telemetry.bucket_range(index)
+            self.assertEqual(lowest, end + 1, "bucket {} doesn't start where the last one ended".format(index))
+            self.assertLessEqual(lowest, highest)
+            end = highest
+
+    def test_times_go_in_their_bucket(self):
+        for value in list(range(2000)) + [4095, 4096, 65535, 65536, 1000000]:
+            lowest, highest = telemetry.bucket_range(telemetry.bucket(value))
+            self.assertLessEqual(lowest, value)
+            self.assertLessEqual(value, highest)
+            self.assertLessEqual(highest - lowest, max(lowest // telemetry.SUB_BUCKETS, 0))  # Within 12.5%
+
+
+class FrameTimesTest(unittest.TestCase):
+    def test_percentiles(self):
+        times = telemetry.FrameTimes()
+        for value in [16] * 90 + [33] * 9 + [250]:
+            times.record(value)
+
+        summary = times.summary()
+        self.assertEqual(summary["frames"], 100)
+        self.assertEqual(summary["mean"], (16 * 90 + 33 * 9 + 250) / 100)
+        self.assertEqual(summary["max"], 250)
+        self.assertEqual(summary["p50"], telemetry.bucket_range(telemetry.bucket(16))[1])
+        self.assertEqual(summary["p95"], telemetry.bucket_range(telemetry.bucket(33))[1])
+        self.assertEqual(summary["p99"], telemetry.bucket_range(telemetry.bucket(33))[1])
+        self.assertEqual(times.percentile(100), 250)  # Never past the longest frame, even though its bucket goes on
+
+    def test_empty(self):
+        self.assertEqual(telemetry.FrameTimes().summary(), {"frames": 0, "mean": 0, "p50": 0, "p95": 0, "p99": 0,
+                                                            "max": 0})
+
+    def test_merge(self):
+        first, second, both = telemetry.FrameTimes(), telemetry.FrameTimes(), telemetry.FrameTimes()
+        for value in range(0, 300, 7):
+            first.record(value)
+            both.record(value)
+        for value in range(5, 900, 11):
+            second.record(value)
+            both.record(value)
+
+        first.merge(second)
+        self.assertEqual(first.counts, both.counts)
+        self.assertEqual(first.summary(), both.summary())
+
+
+class SessionTelemetryTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_nothing_saved_without_a_folder(self):
+        session = telemetry.SessionTelemetry()
+        session.start("Survival")
+        session.record(1, 16)
+        session.save()
+        self.assertEqual(session.waves, {})
+
+    def test_saves_in_the_same_second(self):
+        # Leaving a game and starting another saves twice, often in the same second, and neither save can be lost
+        session = telemetry.SessionTelemetry(self.folder.name)
+        for game in range(3):
+            session.start("Survival")
+            for wave in (1, 2):
+                for frame in range(10):
+                    session.record(wave, 16 + game)
+        session.save()
+
+        names = sorted(os.listdir(self.folder.name))
+        self.assertEqual(len(names), 6)
+        self.assertEqual(len([name for name in names if name.endswith(".json")]), 3)
+
+        means = []
+        for name in names:
+            if name.endswith(".json"):
+                with open(os.path.join(self.folder.name, name)) as file:
+                    saved = json.load(file)
+                self.assertEqual(saved["mode"], "Survival")
+                means.append(saved["summary"][-1]["mean"])
+                with open(os.path.join(self.folder.name, name[:-len(".json")] + ".csv"), newline="") as file:
+                    rows = list(csv.DictReader(file))
+                self.assertEqual([row["wave"] for row in rows], ["1", "2", "all"])
+        self.assertEqual(sorted(means), [16, 17, 18])
+
+
+if __name__ == '__main__':
+    unittest.main()